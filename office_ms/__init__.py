@@ -0,0 +1,11 @@
+"""
+Office Utility CLI Toolkit
+
+所有工具皆透過單一指令 office-ms 執行，例如：
+    office-ms daily <folder_path>
+    office-ms health <folder_path> | office-ms archive FolderHealth
+
+各子指令的模組只在被呼叫時才匯入（見 cli.py）。
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,7 @@
+"""
+python -m office_ms <command> ...，以及 zipapp（office-ms.pyz）的進入點。
+"""
+
+from office_ms.cli import main
+
+main()
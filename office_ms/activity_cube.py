@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Activity Cube
+==================================================
+
+- 月報掃描時可加上 --save-cube <dir>，將本次掃描的活動彙總成 cube 存入該資料夾：
+  日期 × 副檔名 × 第一層資料夾 -> 新增 / 修改的檔案數與大小
+- 只計入報告會列出的檔案（同一份設定檔與 is_relevant_file 規則）
+- 以事件計數：建立當天記一次新增，修改日與建立日不同時，修改當天另記一次修改；
+  因此同一期間內「建立後又修改」的檔案兩者皆計（月報只列為新增），
+  但任何期間的結果都不受掃描範圍影響，可跨掃描合併
+- 每次掃描存成一個檔案；查詢時合併資料夾中的所有 cube，不必重新掃描
+- 查詢可任意切片：期間、副檔名、資料夾篩選，依 日 / 週 / 月 / 副檔名 / 資料夾 分組
+
+使用方式：
+office-ms monthly <folder_path> 2026 1 --save-cube cubes
+office-ms cube cubes --from 2026-01-01 --to 2026-03-31 --ext .xlsx --by folder,week
+
+合併規則：
+- 每個 cube 只涵蓋到產生當天為止（尚未到來的日子不算涵蓋）
+- 同一資料夾的同一天，以該天結束後最早的一次掃描為準（之後的刪除、再次修改不會改變該天的計數）；
+  該天結束後沒有掃描時，以最後一次涵蓋該天的掃描為準；不重複累加
+- 不同資料夾的掃描相加（第一層資料夾名稱相同者合併）
+
+注意事項：
+- cube 只有彙總數字，沒有檔名；需要檔案清單時請看月報本身
+- 有資料夾逾時略過時，結果不完整，不寫入 cube
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import common, report_renderer, walker
+
+LOG_FILE = "activity_cube.log"
+
+CUBE_VERSION = 1
+CUBE_SUFFIX = ".cube.json"
+
+GROUPS = ("day", "week", "month", "ext", "folder")
+
+# 直接位於掃描資料夾（不在任何子資料夾中）的檔案
+ROOT_FOLDER = "(root)"
+NO_EXTENSION = "(none)"
+
+# (日期, 副檔名, 第一層資料夾)
+CellKey = Tuple[str, str, str]
+
+# [新增數, 新增大小, 修改數, 修改大小]
+Cell = List[int]
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def top_folder(rel_path: str) -> str:
+    head, sep, _ = rel_path.replace("\\", "/").partition("/")
+    return head if sep else ROOT_FOLDER
+
+
+def extension(rel_path: str) -> str:
+    # 與 is_relevant_file 相同的副檔名判斷
+    return os.path.splitext(os.path.basename(rel_path))[1].lower() or NO_EXTENSION
+
+
+class Cube:
+    """
+    一次掃描的活動彙總；start ~ end 為掃描涵蓋的期間（期間內沒有活動的日子也算涵蓋）。
+    generated 為資料的時間點（由快照產生時為快照建立的時間）；None 時為寫入的時間。
+    """
+
+    def __init__(self, folder: str, start: date, end: date, generated: Optional[datetime] = None) -> None:
+        self.folder = folder
+        self.start = start
+        self.end = end
+        self.generated = generated
+        self.cells: Dict[CellKey, Cell] = {}
+
+    def add_file(self, rel_path: str, created: date, modified: date, size: int) -> None:
+        """
+        以「事件」計入，結果與掃描期間無關，不同期間的 cube 才能合併：
+        建立日在期間內記一次新增；修改日與建立日不同且在期間內，另記一次修改。
+        """
+        if self.start <= created <= self.end:
+            self.add(created, rel_path, "new", size)
+        if modified != created and self.start <= modified <= self.end:
+            self.add(modified, rel_path, "modified", size)
+
+    def add(self, day: date, rel_path: str, kind: str, size: int) -> None:
+        key = (day.isoformat(), extension(rel_path), top_folder(rel_path))
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = [0, 0, 0, 0]
+        offset = 0 if kind == "new" else 2
+        cell[offset] += 1
+        cell[offset + 1] += size
+
+    def rows(self) -> List[list]:
+        return [[*key, *cell] for key, cell in sorted(self.cells.items())]
+
+    def load_rows(self, rows: Iterable[list]) -> None:
+        for day, ext, folder, *cell in rows:
+            self.cells[(day, ext, folder)] = list(cell)
+
+
+def save(cube: Cube, cube_dir: str, watchdog: Optional[walker.Watchdog] = None) -> Optional[str]:
+    """
+    寫入 <cube_dir>/<時間>_<pid>.cube.json，回傳路徑；有資料夾逾時略過時不寫入，回傳 None。
+    涵蓋期間截至產生當天：之後的日子尚未發生，不能記為「沒有活動」。
+    """
+    if watchdog is not None and watchdog.skipped:
+        log(f"Cube not written: {len(watchdog.skipped)} folder(s) skipped, cube would be incomplete")
+        return None
+
+    os.makedirs(cube_dir, exist_ok=True)
+    generated = cube.generated or datetime.now()
+    end = min(cube.end, generated.date())
+    path = os.path.join(cube_dir, f"{generated:%Y-%m-%d_%H-%M-%S_%f}_{os.getpid()}{CUBE_SUFFIX}")
+    data = {
+        "cube_version": CUBE_VERSION,
+        "folder": cube.folder,
+        "start": cube.start.isoformat(),
+        "end": end.isoformat(),
+        "generated": generated.isoformat(),
+        # 時間戳記在未來的檔案（時鐘錯誤）不列入
+        "cells": [row for row in cube.rows() if row[0] <= end.isoformat()],
+    }
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    log(f"Cube written: {path} ({len(data['cells'])} cells, {cube.start}~{end})")
+    return path
+
+
+def cube_files(sources: Sequence[str]) -> List[str]:
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            files.extend(
+                os.path.join(source, name) for name in sorted(os.listdir(source))
+                if name.endswith(CUBE_SUFFIX)
+            )
+        else:
+            files.append(source)
+    return files
+
+
+def load_runs(sources: Sequence[str]) -> List[dict]:
+    """
+    讀取所有 cube，依產生時間排列；版本不符或無法讀取者略過（寫入 log）。
+    """
+    runs = []
+    for path in cube_files(sources):
+        try:
+            with open(path, encoding="utf-8") as f:
+                run = json.load(f)
+        except (OSError, ValueError) as e:
+            log(f"Cannot read cube {path}: {e}")
+            continue
+        if run.get("cube_version") != CUBE_VERSION:
+            log(f"Unsupported cube format: {path}")
+            continue
+        runs.append(run)
+    runs.sort(key=lambda run: run["generated"])
+    return runs
+
+
+def run_end(run: dict) -> date:
+    """
+    cube 涵蓋的最後一天；較早版本寫入的 cube 可能超過產生當天，一律截至產生當天。
+    """
+    return min(date.fromisoformat(run["end"]), generated_day(run))
+
+
+def generated_day(run: dict) -> date:
+    return datetime.fromisoformat(run["generated"]).date()
+
+
+def days(start: date, end: date) -> Iterable[date]:
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def merge(runs: Sequence[dict], start: date, end: date) -> Tuple[Dict[CellKey, Cell], int]:
+    """
+    合併各次掃描中 start ~ end 的部分；回傳 (cells, 沒有任何掃描涵蓋的天數)。
+    同一資料夾的同一天只採用一次掃描（runs 依產生時間排列）：
+    該天結束後最早的一次；沒有時為最後一次涵蓋該天的掃描（當天執行的掃描）。
+    """
+    owner: Dict[Tuple[str, str], int] = {}
+    for i, run in enumerate(runs):
+        first = max(start, date.fromisoformat(run["start"]))
+        last = min(end, run_end(run))
+        for day in days(first, last) if first <= last else ():
+            key = (run["folder"], day.isoformat())
+            current = owner.get(key)
+            # 已有該天結束後的掃描時保留（較早者）；否則由較晚的掃描取代
+            if current is not None and generated_day(runs[current]) > day:
+                continue
+            owner[key] = i
+
+    cells: Dict[CellKey, Cell] = {}
+    for i, run in enumerate(runs):
+        for day, ext, folder, *values in run["cells"]:
+            if owner.get((run["folder"], day)) != i:
+                continue
+            cell = cells.setdefault((day, ext, folder), [0, 0, 0, 0])
+            for j, value in enumerate(values):
+                cell[j] += value
+
+    covered = {day for _, day in owner}
+    uncovered = sum(1 for day in days(start, end) if day.isoformat() not in covered)
+    return cells, uncovered
+
+
+def group_key(cell_key: CellKey, group: str) -> str:
+    day, ext, folder = cell_key
+    if group == "ext":
+        return ext
+    if group == "folder":
+        return folder
+
+    from .monthly_activity_report import bucket_key
+
+    return bucket_key(date.fromisoformat(day), group)
+
+
+def slice_cells(
+    cells: Dict[CellKey, Cell],
+    by: Sequence[str],
+    extensions: Optional[set] = None,
+    folders: Optional[set] = None,
+) -> Dict[Tuple[str, ...], Cell]:
+    result: Dict[Tuple[str, ...], Cell] = {}
+    for cell_key, values in cells.items():
+        _, ext, folder = cell_key
+        if extensions is not None and ext not in extensions:
+            continue
+        if folders is not None and folder.lower() not in folders:
+            continue
+        key = tuple(group_key(cell_key, group) for group in by)
+        total = result.setdefault(key, [0, 0, 0, 0])
+        for j, value in enumerate(values):
+            total[j] += value
+    return result
+
+
+def format_mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def print_report(
+    start: date,
+    end: date,
+    runs: int,
+    by: Sequence[str],
+    groups: Dict[Tuple[str, ...], Cell],
+    uncovered: int,
+    fmt: str = "text",
+) -> None:
+    columns = (*by, "new_files", "modified_files", "bytes")
+
+    with report_renderer.open_renderer(fmt, "activity_cube", columns) as out:
+        out.text("=" * 40)
+        out.text("Activity Cube")
+        out.field(f"Period : {start} ~ {end}", "period", f"{start}~{end}")
+        out.field(f"Runs   : {runs}", "runs", runs)
+        out.field(f"By     : {', '.join(by) or '-'}", "by", ",".join(by))
+        out.text("=" * 40)
+        out.text()
+
+        new = sum(cell[0] for cell in groups.values())
+        modified = sum(cell[2] for cell in groups.values())
+        size = sum(cell[1] + cell[3] for cell in groups.values())
+
+        out.text("[Summary]")
+        out.field(f"- New files created   : {new}", "new_files", new)
+        out.field(f"- Files modified      : {modified}", "modified_files", modified)
+        out.field(f"- Total activity      : {new + modified} files", "total_activity", new + modified)
+        out.field(f"- Total size          : {format_mb(size)}", "total_bytes", size)
+        out.text()
+
+        if by and groups:
+            out.text("[Breakdown]")
+            for key in sorted(groups):
+                cell = groups[key]
+                out.record(
+                    f"- {' / '.join(key)} : new {cell[0]}, modified {cell[2]} "
+                    f"({format_mb(cell[1] + cell[3])})",
+                    "cell",
+                    **dict(zip(by, key)),
+                    new_files=cell[0],
+                    modified_files=cell[2],
+                    bytes=cell[1] + cell[3],
+                )
+            out.text()
+
+        out.text("[Note]")
+        if uncovered:
+            out.text(f"- {uncovered} day(s) in this period are not covered by any saved cube.")
+        out.text("- Counts come from saved cubes; no folder was scanned.")
+        out.text()
+
+
+def parse_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def parse_day(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        print(f"[ERROR] Invalid date: {value} (expected YYYY-MM-DD)")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms cube <cube_dir_or_file> [...] [--from YYYY-MM-DD] [--to YYYY-MM-DD] "
+            "[--by day|week|month|ext|folder[,...]] [--ext .xlsx[,...]] [--folder <name>[,...]] "
+            "[--format text|jsonl|csv]"
+        )
+    )
+    parser.add_argument("sources", nargs="+", help="cube files or folders written by --save-cube")
+    parser.add_argument("--from", dest="date_from", help="period start (default: earliest cube)")
+    parser.add_argument("--to", dest="date_to", help="period end (default: latest cube)")
+    parser.add_argument("--by", default="", help=f"comma-separated groups: {', '.join(GROUPS)}")
+    parser.add_argument("--ext", help="only these extensions, e.g. .xlsx,.docx")
+    parser.add_argument("--folder", help="only these top-level folders")
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    args = parser.parse_args()
+
+    by = parse_list(args.by)
+    unknown = [group for group in by if group not in GROUPS]
+    if unknown:
+        print(f"[ERROR] Unknown group: {', '.join(unknown)} (expected {', '.join(GROUPS)})")
+        sys.exit(1)
+
+    for source in args.sources:
+        if not os.path.exists(source):
+            print(f"[ERROR] Cube not found: {source}")
+            sys.exit(1)
+
+    runs = load_runs(args.sources)
+    if not runs:
+        print("[ERROR] No cube found.")
+        sys.exit(1)
+
+    start = parse_day(args.date_from) if args.date_from else min(date.fromisoformat(r["start"]) for r in runs)
+    end = parse_day(args.date_to) if args.date_to else max(run_end(r) for r in runs)
+    if start > end:
+        print("[ERROR] --from must not be later than --to.")
+        sys.exit(1)
+
+    extensions = {
+        ext.lower() if ext.startswith(".") or ext == NO_EXTENSION else f".{ext.lower()}"
+        for ext in parse_list(args.ext)
+    } or None
+    folders = {folder.lower() for folder in parse_list(args.folder)} or None
+
+    cells, uncovered = merge(runs, start, end)
+    groups = slice_cells(cells, by, extensions, folders)
+    print_report(start, end, len(runs), by, groups, uncovered, args.format)
+
+    log(f"Query: {start}~{end}, by={','.join(by)}, runs={len(runs)}, cells={len(cells)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+==================================================
+Activity Partial
+==================================================
+
+- 每日活動快照的機器可讀版本（partial）：某一天、某個資料夾的新增 / 修改檔案清單
+- daily 加上 --archive-partial <report_name> 時，存於該報告類型的資料夾中：
+  reports/<report_name>/.partials/<日期>_<資料夾代碼>.json
+- weekly / monthly 加上 --compose <report_name> 時，直接合併期間內各天的 partial 產生報告，
+  時間只與活動量成正比；沒有 partial 的日子才走訪資料夾補上（一次走訪涵蓋所有缺少的日子）
+
+合併規則（與直接掃描的報告相同）：
+- 檔案在期間內任一天列為新增時，只列在新增那天
+- 否則列為修改，只列在最後一次修改的那天
+
+注意事項：
+- partial 記錄的是 daily 執行當下的狀態：當天稍晚的變動、之後被刪除或再次修改到期間外的檔案，
+  與重新掃描的結果可能不同
+- 有資料夾逾時略過時，daily 不寫入 partial（該天之後以走訪補上）
+- partial 為輔助資料，可隨時刪除；.partials 以 . 開頭，不會被當成報告列出
+"""
+
+import os
+import sys
+import json
+import hashlib
+from collections import defaultdict
+from datetime import datetime, date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import common, walker
+
+LOG_FILE = "activity_partial.log"
+BASE_REPORT_DIR = "reports"
+
+PARTIAL_DIR = ".partials"
+PARTIAL_VERSION = 1
+
+# date -> {"new": [...], "modified": [...]}，與 weekly / monthly 的 activity 相同
+Activity = Dict[date, Dict[str, List[str]]]
+
+# (新增, 修改)
+DayEntries = Tuple[List[str], List[str]]
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def partial_dir(report_name: str, base_dir: str = BASE_REPORT_DIR) -> str:
+    return os.path.join(base_dir, report_name, PARTIAL_DIR)
+
+
+def folder_key(folder: str) -> str:
+    return hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()[:12]
+
+
+def partial_path(directory: str, day: date, folder: str) -> str:
+    return os.path.join(directory, f"{day.isoformat()}_{folder_key(folder)}.json")
+
+
+def save(
+    report_name: str,
+    day: date,
+    folder: str,
+    new_files: Sequence[str],
+    modified_files: Sequence[str],
+    watchdog: Optional[walker.Watchdog] = None,
+) -> Optional[str]:
+    """
+    寫入一天的 partial，回傳路徑；同一天重新執行時覆寫（以最後一次為準）。
+    有資料夾逾時略過時不寫入，回傳 None。
+    """
+    if watchdog is not None and watchdog.skipped:
+        log(f"Partial not written: {len(watchdog.skipped)} folder(s) skipped, partial would be incomplete")
+        return None
+
+    directory = partial_dir(report_name)
+    os.makedirs(directory, exist_ok=True)
+    path = partial_path(directory, day, folder)
+    data = {
+        "partial_version": PARTIAL_VERSION,
+        "date": day.isoformat(),
+        "folder": os.path.abspath(folder),
+        "generated": datetime.now().isoformat(),
+        "new": sorted(new_files),
+        "modified": sorted(modified_files),
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    log(f"Partial written: {path} (new={len(new_files)}, modified={len(modified_files)})")
+    return path
+
+
+def load(report_name: str, folder: str, days: Iterable[date]) -> Dict[date, DayEntries]:
+    """
+    讀取 days 中各天的 partial；不存在、版本不符、資料夾不符或無法解析的日子不列入結果。
+    """
+    directory = partial_dir(report_name)
+    absolute = os.path.abspath(folder)
+    found: Dict[date, DayEntries] = {}
+
+    for day in days:
+        path = partial_path(directory, day, folder)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            log(f"Cannot read partial {path}: {e}")
+            continue
+
+        if (
+            not isinstance(data, dict)
+            or data.get("partial_version") != PARTIAL_VERSION
+            or data.get("folder") != absolute
+            or data.get("date") != day.isoformat()
+        ):
+            log(f"Ignored partial {path}: version, folder or date does not match")
+            continue
+
+        found[day] = (list(data.get("new", [])), list(data.get("modified", [])))
+
+    return found
+
+
+def scan_days(
+    base_dir: str,
+    days: Sequence[date],
+    watchdog: Optional[walker.Watchdog] = None,
+) -> Dict[date, DayEntries]:
+    """
+    以一次走訪補上多個缺少 partial 的日子；每天的分類方式與 daily 相同：
+    當天建立為新增，否則當天修改為修改。
+    """
+    wanted = set(days)
+    found: Dict[date, DayEntries] = {day: ([], []) for day in days}
+
+    allowed_ext, ignored_ext, ignored_names = common.load_config(log)
+
+    def relevant(name: str) -> bool:
+        return common.is_relevant_file(name, allowed_ext, ignored_ext, ignored_names)
+
+    scanned = 0
+    for path, stat in common.iter_files(base_dir, log, watchdog=watchdog, relevant=relevant):
+        scanned += 1
+        if stat is None or not relevant(path):
+            continue
+
+        created = datetime.fromtimestamp(stat.st_ctime).date()
+        modified = datetime.fromtimestamp(stat.st_mtime).date()
+
+        if created in wanted:
+            found[created][0].append(os.path.relpath(path, base_dir))
+        if modified in wanted and modified != created:
+            found[modified][1].append(os.path.relpath(path, base_dir))
+
+    log(f"Scanned={scanned}, Days={len(days)} (no partial)")
+    return found
+
+
+def compose(entries: Dict[date, DayEntries]) -> Activity:
+    """
+    合併各天的清單：新增優先，修改只保留最後一天。與直接掃描期間的分類相同。
+    """
+    new_day: Dict[str, date] = {}
+    modified_day: Dict[str, date] = {}
+
+    for day in sorted(entries):
+        new_files, modified_files = entries[day]
+        for path in new_files:
+            new_day[path] = day
+        for path in modified_files:
+            modified_day[path] = day
+
+    activity: Activity = defaultdict(lambda: {"new": [], "modified": []})
+    for path, day in new_day.items():
+        activity[day]["new"].append(path)
+    for path, day in modified_day.items():
+        if path not in new_day:
+            activity[day]["modified"].append(path)
+    return activity
+
+
+class Composed(NamedTuple):
+    """
+    compose 模式的來源：哪些天來自 partial、哪些天重新走訪。
+    """
+    report_name: str
+    from_partials: List[date]
+    scanned: List[date]
+
+
+def compose_activity(
+    report_name: str,
+    base_dir: str,
+    days: Sequence[date],
+    watchdog: Optional[walker.Watchdog] = None,
+) -> Tuple[Activity, Composed]:
+    """
+    days 中有 partial 的日子直接讀取，其餘日子以一次走訪補上，合併後回傳 activity。
+    """
+    entries = load(report_name, base_dir, days)
+    from_partials = [day for day in days if day in entries]
+    missing = [day for day in days if day not in entries]
+    if missing:
+        entries.update(scan_days(base_dir, missing, watchdog))
+
+    log(
+        f"Composed {base_dir}: {len(from_partials)} day(s) from partials, "
+        f"{len(missing)} day(s) scanned"
+    )
+    return compose(entries), Composed(report_name, from_partials, missing)
+
+
+def format_days(days: Sequence[date]) -> str:
+    """
+    連續的日子合併為區間：2026-01-01 ~ 2026-01-05, 2026-01-09
+    """
+    runs: List[List[date]] = []
+    for day in sorted(days):
+        if runs and (day - runs[-1][1]).days == 1:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return ", ".join(
+        str(first) if first == last else f"{first} ~ {last}" for first, last in runs
+    )
+
+
+def print_sources(out, composed: Optional[Composed]) -> None:
+    """
+    報告共用的 [Sources] 區段；非 compose 模式時不輸出。
+    """
+    if composed is None:
+        return
+
+    days = len(composed.from_partials) + len(composed.scanned)
+    scanned = format_days(composed.scanned) or "none"
+
+    out.text("[Sources]")
+    out.field(
+        f"- Daily partials      : {len(composed.from_partials)} of {days} days ({composed.report_name})",
+        "partial_days", len(composed.from_partials),
+    )
+    out.field(f"- Scanned days        : {scanned}", "scanned_days", len(composed.scanned))
+    out.text()
+
+
+def report_name_from_args(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    if not value.strip():
+        print("[ERROR] Report name cannot be empty.")
+        sys.exit(1)
+    return value.strip()
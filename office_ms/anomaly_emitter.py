@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Anomaly Signal Emitter (A-Level)
+==================================================
+
+- 唯讀、被動式異常偵測
+- 僅產生「異常訊號」與證據
+- 不修復、不重跑、不決策
+
+設計原則：
+- 人類判斷，系統提醒
+- 所有輸出皆可回溯
+"""
+
+import os
+import sys
+import json
+from statistics import median
+from datetime import datetime, date, timedelta
+
+from . import common, log_writer, report_bundle, report_summary
+
+# 以目前工作資料夾為基準（與 report_archiver 寫入 reports/ 的位置一致）；
+# 安裝為套件或打包成 zipapp 後，程式所在位置不再是可寫入的資料夾
+BASE_DIR = os.getcwd()
+
+REPORT_DIR = os.path.join(BASE_DIR, "reports")
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+
+ANOMALY_LOG = os.path.join(BASE_DIR, "anomaly.log")
+ANOMALY_REPORT = os.path.join(BASE_DIR, "anomaly_report.txt")
+
+# 各報告 [Summary] 數值的滾動快取；只保留基準線需要的最近幾份
+BASELINE_CACHE = os.path.join(BASE_DIR, "anomaly_baseline.json")
+BASELINE_VERSION = 1
+
+# 以最近 30 份同類報告為基準線；少於 7 份時不判斷
+BASELINE_WINDOW = 30
+BASELINE_MIN_HISTORY = 7
+
+# robust z（以 median / MAD 計算）超過此值視為異常
+OUTLIER_THRESHOLD = 3.5
+
+
+def log(msg: str):
+    common.append_log(ANOMALY_LOG, msg)
+
+
+def latest_file_in(dir_path: str):
+    # 包含已壓縮進 bundle 的報告；依歸檔檔名（時間戳）判斷最新一份
+    if not os.path.isdir(dir_path):
+        return None
+    files = [f for f in report_bundle.list_reports(dir_path) if f.endswith(".txt")]
+    return os.path.join(dir_path, max(files, key=common.archive_sort_key)) if files else None
+
+
+def check_expected_reports():
+    today = date.today()
+    anomalies = []
+
+    daily = latest_file_in(os.path.join(REPORT_DIR, "DailySnapshot"))
+    weekly = latest_file_in(os.path.join(REPORT_DIR, "WeeklyActivity"))
+    monthly = latest_file_in(os.path.join(REPORT_DIR, "MonthlyActivity"))
+
+    if not daily:
+        anomalies.append("Daily report missing")
+
+    if not weekly and today.weekday() == 0:
+        anomalies.append("Weekly report missing (Monday check)")
+
+    if not monthly and today.day <= 3:
+        anomalies.append("Monthly report missing (early-month check)")
+
+    return anomalies
+
+
+def check_scheduler_vs_task():
+    scheduler_log = os.path.join(LOG_DIR, "scheduler_log.txt")
+    task_log = os.path.join(LOG_DIR, "task_log.txt")
+
+    if not os.path.isfile(scheduler_log) or not os.path.isfile(task_log):
+        return []
+
+    # 只讀最後 10 筆排程紀錄，以及這段期間之後的執行紀錄分段，不讀完整歷史
+    scheduler_lines = log_writer.tail_lines(scheduler_log, 10)
+    since = log_writer.parse_line_time(scheduler_lines[0]) if scheduler_lines else None
+
+    task_lines = list(log_writer.read_lines(task_log, since))
+
+    anomalies = []
+
+    for line in scheduler_lines:
+        if "Created task" in line:
+            task_name = line.strip()
+            matched = any(task_name in t for t in task_lines)
+            if not matched:
+                anomalies.append(f"Scheduled task has no execution record: {task_name}")
+
+    return anomalies
+
+
+def archive_time(report_dir: str, name: str) -> datetime:
+    stamp = common.archive_sort_key(name)[0]
+    try:
+        return datetime.strptime(stamp, "%Y-%m-%d_%H-%M-%S")
+    except ValueError:
+        return datetime.fromtimestamp(os.path.getmtime(os.path.join(report_dir, name)))
+
+
+def load_baseline_cache():
+    try:
+        with open(BASELINE_CACHE, encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == BASELINE_VERSION:
+            return cache
+        log("Baseline cache version changed. Rebuilding from recent archives.")
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        log(f"Baseline cache unreadable ({e}). Rebuilding from recent archives.")
+    return {"version": BASELINE_VERSION, "reports": {}}
+
+
+def save_baseline_cache(cache):
+    tmp = BASELINE_CACHE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, BASELINE_CACHE)
+
+
+def update_history(report_dir: str, entry):
+    """
+    只讀取快取之後新增的歸檔；快取不存在時也只讀最近 BASELINE_WINDOW + 1 份。
+    每次執行的成本與「新報告數量」成正比，而非整個歷史。
+    """
+    last = entry.get("last")
+    names = sorted(
+        (n for n in report_bundle.list_reports(report_dir) if n.endswith(".txt")),
+        key=common.archive_sort_key,
+    )
+    if last:
+        last_key = common.archive_sort_key(last)
+        names = [n for n in names if common.archive_sort_key(n) > last_key]
+
+    # [Summary] 數值取自存檔時記錄的摘要檔，沒有記錄的報告才讀取報告開頭
+    history = entry.setdefault("history", [])
+    recent = names[-(BASELINE_WINDOW + 1):]
+    found = report_summary.summaries(report_dir, recent)
+    for name in recent:
+        if name not in found:
+            continue
+        history.append({
+            "archive": name,
+            "time": archive_time(report_dir, name).isoformat(),
+            "metrics": found[name].summary,
+        })
+
+    if names:
+        entry["last"] = names[-1]
+    del history[:-(BASELINE_WINDOW + 1)]
+    return len(names)
+
+
+def same_day_kind(a: str, b: str) -> bool:
+    return (datetime.fromisoformat(a).weekday() < 5) == (datetime.fromisoformat(b).weekday() < 5)
+
+
+def outlier(value: float, baseline):
+    """
+    以 median / MAD 計算 robust z；回傳 (median, MAD, 是否異常)。
+    MAD 為 0（歷史數值幾乎不變）時，只要與中位數不同即視為異常。
+    """
+    m = median(baseline)
+    mad = median(abs(x - m) for x in baseline)
+    if mad == 0:
+        return m, mad, value != m
+    z = 0.6745 * (value - m) / mad
+    return m, mad, abs(z) > OUTLIER_THRESHOLD
+
+
+def format_number(value: float) -> str:
+    return f"{value:g}"
+
+
+def check_report_trends():
+    """
+    將每一類報告最新一份的 [Summary] 數值，與同類報告最近的歷史比較。
+    DailySnapshot 只與同為工作日（或同為週末）的報告比較，避免週末的零活動拉低基準線。
+    """
+    if not os.path.isdir(REPORT_DIR):
+        return []
+
+    cache = load_baseline_cache()
+    anomalies = []
+    ingested = 0
+
+    for report_name in sorted(os.listdir(REPORT_DIR)):
+        report_dir = os.path.join(REPORT_DIR, report_name)
+        if not os.path.isdir(report_dir):
+            continue
+
+        entry = cache["reports"].setdefault(report_name, {})
+        ingested += update_history(report_dir, entry)
+
+        history = entry.get("history", [])
+        if len(history) < 2:
+            continue
+
+        latest = history[-1]
+        previous = history[:-1]
+        if report_name == "DailySnapshot":
+            previous = [h for h in previous if same_day_kind(h["time"], latest["time"])]
+
+        for metric, value in latest["metrics"].items():
+            baseline = [h["metrics"][metric] for h in previous if metric in h["metrics"]]
+            if len(baseline) < BASELINE_MIN_HISTORY:
+                continue
+
+            m, mad, flagged = outlier(value, baseline)
+            if flagged:
+                direction = "high" if value > m else "low"
+                anomalies.append(
+                    f"{report_name} {latest['archive']}: {metric} = {format_number(value)} "
+                    f"is unusually {direction} (median {format_number(m)}, "
+                    f"MAD {format_number(mad)}, last {len(baseline)} reports)"
+                )
+
+    save_baseline_cache(cache)
+    log(f"Baseline updated with {ingested} new archive(s)")
+    return anomalies
+
+
+def emit_report(anomalies):
+    timestamp = datetime.now().isoformat()
+
+    with open(ANOMALY_REPORT, "w", encoding="utf-8") as f:
+        f.write("Anomaly Signal Report\n")
+        f.write("=" * 30 + "\n")
+        f.write(f"Generated at: {timestamp}\n\n")
+
+        if not anomalies:
+            f.write("No anomalies detected.\n")
+        else:
+            f.write("Detected anomalies:\n")
+            for a in anomalies:
+                f.write(f"- {a}\n")
+
+    log(f"Anomaly report generated with {len(anomalies)} issue(s)")
+
+
+def main():
+    anomalies = []
+
+    anomalies.extend(check_expected_reports())
+    anomalies.extend(check_scheduler_vs_task())
+    anomalies.extend(check_report_trends())
+
+    emit_report(anomalies)
+
+    if anomalies:
+        print("[WARN] Anomalies detected. Please review anomaly_report.txt")
+        for a in anomalies:
+            print(f" - {a}")
+        sys.exit(1)
+
+    print("[OK] No anomalies detected.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Change Journal Collector
+==================================================
+
+- 監看指定資料夾，將「新增 / 修改」事件寫入 append-only 日誌
+- Linux 使用 inotify（ctypes），其他平台使用輪詢（polling）
+- Daily / Weekly / Monthly 報告可改從日誌推導活動，
+  時間與「變更數量」成正比，而非與整個資料夾大小成正比
+
+注意事項：
+- 本工具為唯讀，只寫入自己的日誌檔，不會修改或刪除任何被監看的檔案
+- 僅在使用者明確啟動時執行，可用 --duration 限定執行時間
+- 日誌只記錄「哪個路徑有動靜」，報告仍以檔案本身的時間戳記分類
+- 日誌出現缺口（收集器中斷、事件遺失）時，報告會自動改回完整掃描
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import select
+import signal
+import struct
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from . import common, log_writer, walker
+
+LOG_FILE = "change_journal.log"
+DEFAULT_JOURNAL = "change_journal.txt"
+
+HEARTBEAT_SECONDS = 60
+DEFAULT_POLL_SECONDS = 60
+
+# 兩筆紀錄間隔超過此倍數的心跳時間，即視為收集器曾經中斷
+LAPSE_FACTOR = 3
+
+# ===== 日誌紀錄種類 =====
+# 每行格式：<ISO 時間>\t<種類>\t<JSON>
+
+START = "START"        # 收集器啟動，JSON 為 {"root", "backend"}
+STOP = "STOP"          # 收集器正常結束
+BEAT = "BEAT"          # 心跳，證明收集器仍在執行，JSON 為 {"root"}
+GAP = "GAP"            # 事件可能遺失（例如 inotify 佇列溢位）
+CREATE = "CREATE"      # 檔案新增，JSON 為相對路徑
+MODIFY = "MODIFY"      # 檔案修改 / 屬性變更，JSON 為相對路徑
+CREATE_DIR = "CREATE_DIR"  # 新增或移入資料夾，讀取時展開整個子樹
+
+EVENT_KINDS = {CREATE, MODIFY, CREATE_DIR}
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def normalize_root(base_dir: str) -> str:
+    return os.path.normcase(os.path.abspath(base_dir))
+
+
+# ===== 寫入端 =====
+
+
+class JournalWriter:
+    def __init__(self, journal_path: str, root: str) -> None:
+        self.root = root
+        self.f: TextIO = open(journal_path, "a", encoding="utf-8", newline="\n")
+        self.last_beat = 0.0
+        self.recent: Set[Tuple[str, str]] = set()
+
+    def write(self, kind: str, value: object = None) -> None:
+        ts = datetime.now().strftime(TIMESTAMP_FORMAT)
+        self.f.write(f"{ts}\t{kind}\t{json.dumps(value, ensure_ascii=False)}\n")
+
+    def event(self, kind: str, path: str) -> None:
+        """
+        同一心跳區間內相同路徑、相同種類的事件只記一次，
+        避免大型檔案寫入時產生大量重複的 MODIFY。
+        """
+        rel_path = os.path.relpath(path, self.root)
+        if (kind, rel_path) in self.recent:
+            return
+        self.recent.add((kind, rel_path))
+        self.write(kind, rel_path)
+
+    def beat_if_due(self) -> None:
+        now = time.monotonic()
+        if now - self.last_beat >= HEARTBEAT_SECONDS:
+            # 附上監看的資料夾：讀取端通常從期間中段開始讀，看不到 START
+            self.write(BEAT, {"root": self.root})
+            self.recent.clear()
+            self.last_beat = now
+            # 收集器長時間執行；每次心跳順便寫出累積的 log
+            log_writer.flush_all()
+        self.f.flush()
+
+    def close(self) -> None:
+        self.write(STOP)
+        self.f.close()
+
+
+# ===== inotify（Linux） =====
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyError(OSError):
+    pass
+
+
+class Inotify:
+    """
+    最小化的 inotify ctypes 綁定：只提供 init / add_watch / 讀取事件。
+    """
+
+    def __init__(self) -> None:
+        import ctypes
+        import ctypes.util
+
+        self._ctypes = ctypes
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.libc.inotify_init1.argtypes = [ctypes.c_int]
+        self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise InotifyError(err, os.strerror(err))
+
+        self.watches: Dict[int, str] = {}
+
+    def add_watch(self, path: str) -> None:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return  # 資料夾在加入監看前已被移除
+            raise InotifyError(err, f"inotify_add_watch({path}): {os.strerror(err)}")
+        self.watches[wd] = path
+
+    def read_events(self, timeout: float) -> Iterator[Tuple[int, str]]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            parent = self.watches.get(wd)
+            if mask & IN_Q_OVERFLOW or parent is None:
+                yield mask, ""
+                continue
+
+            yield mask, os.path.join(parent, os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def watch_tree(notify: Inotify, path: str) -> None:
+    for root, _, _ in os.walk(path):
+        notify.add_watch(root)
+
+
+def run_inotify(writer: JournalWriter, deadline: Optional[float]) -> None:
+    notify = Inotify()
+    try:
+        watch_tree(notify, writer.root)
+        log(f"inotify watching {len(notify.watches)} folder(s) under {writer.root}")
+        writer.write(START, {"root": writer.root, "backend": "inotify"})
+        writer.beat_if_due()
+
+        while deadline is None or time.monotonic() < deadline:
+            for mask, path in notify.read_events(timeout=1.0):
+                if not path:
+                    writer.write(GAP, "inotify queue overflow")
+                    log("inotify queue overflow; journal marked with GAP")
+                    continue
+
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # 先加監看再記錄，加監看前就寫入的檔案由讀取端展開子樹補上
+                        watch_tree(notify, path)
+                        writer.event(CREATE_DIR, path)
+                    continue
+
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    writer.event(CREATE, path)
+                else:
+                    writer.event(MODIFY, path)
+
+            writer.beat_if_due()
+    finally:
+        notify.close()
+
+
+# ===== 輪詢（其他平台或 inotify 不可用時） =====
+
+
+def poll_snapshot(writer: JournalWriter) -> Dict[str, Tuple[int, int]]:
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    for root, _, files in os.walk(writer.root):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        # 大型資料夾走訪期間仍要留下心跳，否則讀取端會誤判為中斷
+        writer.beat_if_due()
+    return snapshot
+
+
+def run_poll(writer: JournalWriter, deadline: Optional[float], interval: int) -> None:
+    # 先寫 START：第一次走訪期間的心跳必須在 START 之後
+    writer.write(START, {"root": writer.root, "backend": "poll"})
+    previous = poll_snapshot(writer)
+    log(f"Polling {len(previous)} file(s) under {writer.root} every {interval}s")
+    writer.beat_if_due()
+
+    while deadline is None or time.monotonic() < deadline:
+        time.sleep(interval)
+
+        current = poll_snapshot(writer)
+        for path, state in current.items():
+            before = previous.get(path)
+            if before is None:
+                writer.event(CREATE, path)
+            elif before != state:
+                writer.event(MODIFY, path)
+        previous = current
+
+        writer.beat_if_due()
+
+
+# ===== 讀取端（供報告使用） =====
+
+
+def parse_line(line: str) -> Optional[Tuple[datetime, str, object]]:
+    parts = line.rstrip("\n").split("\t", 2)
+    if len(parts) != 3:
+        return None
+    try:
+        return (
+            datetime.strptime(parts[0], TIMESTAMP_FORMAT),
+            parts[1],
+            json.loads(parts[2]),
+        )
+    except ValueError:
+        return None
+
+
+def seek_to(f, target: datetime) -> None:
+    """
+    日誌依時間遞增寫入，以位元組位置二分搜尋，
+    跳到第一筆時間 >= target 的紀錄附近，不必從頭讀整份日誌。
+    """
+    key = target.strftime(TIMESTAMP_FORMAT).encode()
+
+    f.seek(0, os.SEEK_END)
+    lo, hi = 0, f.tell()
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        if mid:
+            f.readline()  # 略過不完整的一行
+        line = f.readline()
+        if line and line[:len(key)] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    f.seek(lo)
+    if lo:
+        f.readline()
+
+
+def changed_files(
+    journal_path: str,
+    base_dir: str,
+    since: datetime,
+    watchdog: Optional[walker.Watchdog] = None,
+) -> Optional[List[str]]:
+    """
+    回傳自 since 起可能有變動的檔案（絕對路徑，已排序）。
+
+    只有在日誌能證明「since 至今，同一個收集器持續監看 base_dir」時才回傳結果；
+    以下情況回傳 None，呼叫端應改回完整掃描：
+    - 日誌不存在，或監看的資料夾不同（START / BEAT 記錄的資料夾；
+      舊版日誌的 BEAT 沒有資料夾，無法證明時同樣改回完整掃描）
+    - since 當下收集器尚未執行
+    - 期間內有 STOP / GAP，或兩筆紀錄間隔超過容許值（收集器曾中斷）
+    - 最後一筆紀錄距今超過容許值（收集器已不在執行）
+
+    新增的資料夾（CREATE_DIR）以 walker 在 watchdog 的時間預算內展開，
+    卡住的子資料夾記錄於 watchdog.skipped，與完整走訪相同。
+    """
+    if not os.path.isfile(journal_path):
+        log(f"Journal not found: {journal_path}")
+        return None
+
+    root = normalize_root(base_dir)
+    tolerance = timedelta(seconds=HEARTBEAT_SECONDS * LAPSE_FACTOR)
+    horizon = since - tolerance
+
+    rel_paths: Set[str] = set()
+    rel_dirs: Set[str] = set()
+    alive = False
+    root_seen = False
+    last: Optional[datetime] = None
+
+    with open(journal_path, "rb") as f:
+        # 往前多留一段容許時間，才能確認 since 當下收集器正在執行
+        seek_to(f, horizon)
+
+        for raw in f:
+            record = parse_line(raw.decode("utf-8", errors="replace"))
+            if record is None:
+                continue
+            ts, kind, value = record
+
+            if last is None and ts > since:
+                log("Journal does not cover the start of the requested window")
+                return None
+
+            if alive and last is not None and ts > since and ts - last > tolerance:
+                log(f"Journal lapse between {last} and {ts}")
+                return None
+
+            if kind == START:
+                if not isinstance(value, dict) or value.get("root") != root:
+                    log(f"Journal root mismatch at {ts}")
+                    return None
+                if ts > since:
+                    log(f"Collector restarted at {ts}; journal has a gap")
+                    return None
+                alive = True
+                root_seen = True
+                rel_paths.clear()
+                rel_dirs.clear()
+            elif kind in (STOP, GAP):
+                if ts >= since:
+                    log(f"Journal {kind} at {ts}")
+                    return None
+                alive = kind == GAP
+            else:
+                if kind == BEAT and isinstance(value, dict):
+                    if value.get("root") != root:
+                        log(f"Journal root mismatch at {ts}")
+                        return None
+                    root_seen = True
+                alive = True
+                if kind in EVENT_KINDS and ts >= since and isinstance(value, str):
+                    (rel_dirs if kind == CREATE_DIR else rel_paths).add(value)
+
+            last = ts
+
+    if not root_seen:
+        log("Journal does not show which folder it watched; cannot vouch for this folder")
+        return None
+
+    if not alive or last is None or datetime.now() - last > tolerance:
+        log("Collector is not running; journal cannot vouch for recent activity")
+        return None
+
+    if watchdog is None:
+        watchdog = walker.Watchdog()
+
+    paths = {os.path.join(base_dir, rel) for rel in rel_paths}
+    for rel in rel_dirs:
+        # 只需要檔名，stat 由呼叫端處理；已被刪除的資料夾與 os.walk 相同，直接略過
+        for dir_root, _, files in walker.walk(
+            os.path.join(base_dir, rel), watchdog, want_stat=lambda name: False,
+        ):
+            paths.update(os.path.join(dir_root, name) for name, _ in files)
+
+    log(
+        f"Journal {journal_path}: since={since}, "
+        f"Paths={len(rel_paths)}, Dirs={len(rel_dirs)}"
+    )
+
+    return sorted(paths)
+
+
+# ===== CLI =====
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms journal <folder_path> [--journal <file>] "
+            "[--duration <seconds>] [--backend auto|inotify|poll] [--poll-interval <seconds>]"
+        )
+    )
+    parser.add_argument("folder_path")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL)
+    parser.add_argument("--duration", type=int, help="stop after this many seconds")
+    parser.add_argument("--backend", choices=("auto", "inotify", "poll"), default="auto")
+    parser.add_argument("--poll-interval", type=int, default=DEFAULT_POLL_SECONDS)
+    args = parser.parse_args()
+
+    base_dir = args.folder_path
+
+    if not os.path.isdir(base_dir):
+        print("[ERROR] Folder not found.")
+        sys.exit(1)
+
+    # 輪詢間隔不可超過心跳，否則讀取端會把兩次輪詢之間誤判為中斷
+    if not 1 <= args.poll_interval <= HEARTBEAT_SECONDS:
+        print(f"[ERROR] --poll-interval must be between 1 and {HEARTBEAT_SECONDS}.")
+        sys.exit(1)
+
+    backend = args.backend
+    if backend == "auto":
+        backend = "inotify" if sys.platform.startswith("linux") else "poll"
+
+    deadline = time.monotonic() + args.duration if args.duration else None
+
+    # SIGTERM（排程器結束工作）與 Ctrl+C 相同處理，確保寫入 STOP
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    writer = JournalWriter(args.journal, normalize_root(base_dir))
+    print(f"[Info] Recording changes under {base_dir} ({backend}). Press Ctrl+C to stop.")
+
+    exit_code = 0
+    try:
+        if backend == "inotify":
+            try:
+                run_inotify(writer, deadline)
+            except InotifyError as e:
+                if args.backend == "inotify":
+                    raise
+                log(f"inotify unavailable ({e}); falling back to polling")
+                run_poll(writer, deadline, args.poll_interval)
+        else:
+            run_poll(writer, deadline, args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        writer.write(GAP, str(e))
+        log(f"[ERROR] Collector stopped: {e}")
+        print(f"[ERROR] Collector stopped: {e}")
+        exit_code = 1
+    finally:
+        writer.close()
+
+    log(f"Collector stopped (journal={args.journal})")
+    print("[OK] Change journal closed.")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
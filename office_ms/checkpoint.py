@@ -0,0 +1,161 @@
+"""
+==================================================
+Checkpoint
+==================================================
+
+- 長時間掃描（Monthly、Folder Health）共用的進度檔
+- 掃描期間定期將「尚未走訪的資料夾」與「目前為止的彙整結果」寫入 sidecar 檔（JSON）
+- 重開機、VPN 斷線或排程被強制結束後，以 --resume 從進度檔繼續，
+  不必從頭再掃一次；續跑後的報告與未中斷時相同
+- 掃描完成後自動刪除進度檔
+
+注意事項：
+- 只有 --resume 時才讀取進度檔；只加 --checkpoint 時一律從頭掃描，並取代既有的進度檔
+- 進度只在「一個資料夾處理完畢」時寫入，中斷時最多重做最後一段（預設 60 秒）的工作
+- 進度檔記錄掃描參數（資料夾、期間等）；參數不同時不沿用，改為重新掃描
+- 中斷期間有變動的檔案，依續跑當下的狀態計入
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from . import walker
+
+CHECKPOINT_VERSION = 1
+
+# 距上次寫入超過此秒數，才在下一個資料夾處理完畢時寫入
+CHECKPOINT_INTERVAL_SECONDS = 60.0
+
+Logger = Callable[[str], None]
+
+
+class Checkpoint:
+    """
+    單次掃描的進度檔。
+    scan 為識別掃描參數的 dict（須可 JSON 序列化），只有完全相同時才沿用既有進度。
+    resume 為 False 時不讀取既有進度（load 一律回傳 None）。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        scan: dict,
+        log: Logger,
+        interval: float = CHECKPOINT_INTERVAL_SECONDS,
+        resume: bool = False,
+    ) -> None:
+        self.path = path
+        self.scan = scan
+        self.log = log
+        self.interval = interval
+        self.resume = resume
+        self.last_save = time.monotonic()
+
+    def load(self) -> Optional[dict]:
+        """
+        讀取既有進度：{"frontier": ..., "skipped": [...], "state": {...}}。
+        非續跑、沒有進度檔、格式不符或掃描參數不同時回傳 None（從頭掃描）。
+        """
+        if not self.resume:
+            return None
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.log(f"No checkpoint at {self.path}. Starting a new scan.")
+            return None
+        except (OSError, ValueError) as e:
+            self.log(f"Unreadable checkpoint {self.path}. Starting a new scan. Error: {e}")
+            return None
+
+        if data.get("checkpoint_version") != CHECKPOINT_VERSION:
+            self.log(f"Unsupported checkpoint format: {self.path}. Starting a new scan.")
+            return None
+
+        if data.get("scan") != self.scan:
+            self.log(f"Checkpoint {self.path} belongs to a different scan. Starting a new scan.")
+            return None
+
+        self.log(
+            f"Resuming from checkpoint {self.path} "
+            f"(saved={data.get('saved')}, {len(data['frontier'])} folder(s) pending)"
+        )
+        return data
+
+    def due(self) -> bool:
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save(self, frontier: list, skipped: List[walker.SkippedDir], state: dict) -> None:
+        """
+        先寫入暫存檔並 fsync，再取代正式檔；寫到一半被中斷時，舊的進度檔仍然完整。
+        """
+        data = {
+            "checkpoint_version": CHECKPOINT_VERSION,
+            "scan": self.scan,
+            "saved": datetime.now().isoformat(),
+            "frontier": frontier,
+            "skipped": skipped,
+            "state": state,
+        }
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        self.last_save = time.monotonic()
+        self.log(f"Checkpoint saved: {self.path} ({len(frontier)} folder(s) pending)")
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            return
+        self.log(f"Scan finished. Checkpoint removed: {self.path}")
+
+
+def restore_skipped(watchdog: walker.Watchdog, saved: dict) -> None:
+    watchdog.skipped.extend((path, reason) for path, reason in saved["skipped"])
+
+
+def add_checkpoint_arguments(parser, default_path: str) -> None:
+    parser.add_argument(
+        "--checkpoint",
+        nargs="?",
+        const=default_path,
+        help=f"periodically save scan progress (default file: {default_path})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted scan from its checkpoint",
+    )
+
+
+def checkpoint_from_args(args, default_path: str, scan: dict, log: Logger) -> Optional[Checkpoint]:
+    """
+    --checkpoint 或 --resume 任一指定時建立 Checkpoint；
+    只指定 --resume 時使用預設的進度檔。
+    --resume 時進度檔必須存在，否則輸出 [ERROR] 並結束；
+    未指定 --resume 時刪除既有的進度檔，從頭掃描（之後中斷也不會續跑到舊的進度）。
+    """
+    if not args.checkpoint and not args.resume:
+        return None
+
+    path = args.checkpoint or default_path
+    if args.resume and not os.path.isfile(path):
+        print(f"[ERROR] Checkpoint file not found: {path}")
+        sys.exit(1)
+
+    progress = Checkpoint(path, scan, log, resume=args.resume)
+    if not args.resume and os.path.isfile(path):
+        os.remove(path)
+        log(f"Existing checkpoint {path} discarded (no --resume). Starting a new scan.")
+    return progress
@@ -0,0 +1,76 @@
+"""
+==================================================
+office-ms
+==================================================
+
+- 所有工具的單一進入點：office-ms <command> [args ...]
+- 只匯入被呼叫的子指令模組，其餘工具（以及 argparse、sqlite3 等）不載入，
+  排程器大量呼叫時啟動時間維持最小
+- 子指令的參數原封不動交給該工具自己的 main() 解析
+
+注意事項：
+- 本模組刻意只匯入 sys；請勿在此加入其他模組層級的 import
+- 可用 python -X importtime -m office_ms <command> --help 檢查啟動成本
+"""
+
+import sys
+
+# 子指令 -> (模組, 說明)；模組在執行時才匯入
+COMMANDS = {
+    "daily": ("office_ms.daily_snapshot", "今天新增與修改的檔案"),
+    "weekly": ("office_ms.weekly_activity_report", "最近 7 天的檔案活動"),
+    "monthly": ("office_ms.monthly_activity_report", "指定月份 / 期間的檔案活動"),
+    "health": ("office_ms.folder_health_report", "資料夾健康報告"),
+    "cube": ("office_ms.activity_cube", "查詢活動彙總 cube（日期 × 副檔名 × 第一層資料夾）"),
+    "archive": ("office_ms.report_archiver", "將 STDIN 的報告歸檔到 reports/"),
+    "inventory": ("office_ms.report_inventory", "列出已歸檔的報告"),
+    "summarize": ("office_ms.report_summary", "補建已歸檔報告的標頭 / Summary 摘要"),
+    "compact": ("office_ms.report_bundle", "將舊報告依月份壓縮成 bundle"),
+    "diff": ("office_ms.report_diff", "比較最新一份與前一份歸檔報告"),
+    "compare": ("office_ms.snapshot_diff", "比較兩份掃描快照（新增 / 刪除 / 修改 / 搬移）"),
+    "anomaly": ("office_ms.anomaly_emitter", "A 級異常訊號"),
+    "schedule": ("office_ms.schedule_helper", "建立一次性 Windows 排程"),
+    "journal": ("office_ms.change_journal", "變更日誌收集器（可選）"),
+}
+
+PROG = "office-ms"
+
+
+def usage() -> str:
+    lines = [f"usage: {PROG} <command> [args ...]", "", "commands:"]
+    for name, (_, summary) in COMMANDS.items():
+        lines.append(f"  {name:<10} {summary}")
+    lines.append("")
+    lines.append(f"各子指令的參數請執行：{PROG} <command> --help")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+
+    if not args or args[0] in ("-h", "--help"):
+        print(usage())
+        sys.exit(0 if args else 1)
+
+    if args[0] == "--version":
+        from office_ms import __version__
+
+        print(f"{PROG} {__version__}")
+        sys.exit(0)
+
+    command = args[0]
+    if command not in COMMANDS:
+        print(f"[ERROR] Unknown command: {command}")
+        print(usage())
+        sys.exit(1)
+
+    module_name = COMMANDS[command][0]
+    module = __import__(module_name, fromlist=["main"])
+
+    # 讓子指令的 argparse 顯示 "office-ms <command>"
+    sys.argv = [f"{PROG} {command}", *args[1:]]
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+==================================================
+Common Helpers
+==================================================
+
+- Daily / Weekly / Monthly 等報告共用的小工具
+- 原本各報告各自複製一份，統一放在這裡維護
+
+注意事項：
+- 本模組只讀取設定檔與資料夾，不修改任何檔案（log 除外）
+- 各函式需要寫 log 時，由呼叫端傳入自己的 log 函式，
+  因此每個報告仍寫入各自的 log 檔
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Set, Tuple
+
+from . import log_writer, walker
+
+if TYPE_CHECKING:
+    from .scan_snapshot import Snapshot, SnapshotWriter
+
+Logger = Callable[[str], None]
+
+# Daily / Weekly / Monthly 共用同一份設定檔
+CONFIG_FILE = "daily_snapshot_config.json"
+
+# ===== 安全預設值（永遠存在） =====
+DEFAULT_ALLOWED_EXTENSIONS: Set[str] = {
+    ".docx", ".xlsx", ".pptx", ".pdf", ".txt"
+}
+
+DEFAULT_IGNORED_EXTENSIONS: Set[str] = {
+    ".tmp"
+}
+
+DEFAULT_IGNORED_FILENAMES: Set[str] = {
+    ".DS_Store", "Thumbs.db"
+}
+
+
+def append_log(path: str, msg: str) -> None:
+    """
+    寫入 "[時間] 訊息" 一行；實際寫出由 log_writer 批次處理。
+    """
+    log_writer.get_writer(path).write(msg)
+
+
+def append_line(path: str, line: str) -> None:
+    """
+    以 O_APPEND 一次寫入一整行（line 需含換行），不需任何鎖定；
+    多個行程同時附加時各行完整（本機檔案系統保證，部分網路磁碟不保證，讀取端需略過無法解析的行）。
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def load_config(log: Logger) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    載入 JSON 設定檔。
+    若檔案不存在或格式錯誤，回退至預設值。
+    """
+    if not os.path.isfile(CONFIG_FILE):
+        log("Config file not found. Using default settings.")
+        return (
+            DEFAULT_ALLOWED_EXTENSIONS,
+            DEFAULT_IGNORED_EXTENSIONS,
+            DEFAULT_IGNORED_FILENAMES,
+        )
+
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        allowed = {
+            ext.lower() for ext in data.get("allowed_extensions", [])
+        } or DEFAULT_ALLOWED_EXTENSIONS
+
+        ignored_ext = {
+            ext.lower() for ext in data.get("ignored_extensions", [])
+        }
+
+        ignored_names = set(data.get("ignored_filenames", []))
+
+        log("Config file loaded successfully.")
+        return allowed, ignored_ext, ignored_names
+
+    except Exception as e:
+        log(f"Failed to load config. Using defaults. Error: {e}")
+        return (
+            DEFAULT_ALLOWED_EXTENSIONS,
+            DEFAULT_IGNORED_EXTENSIONS,
+            DEFAULT_IGNORED_FILENAMES,
+        )
+
+
+def is_relevant_file(
+    filename: str,
+    allowed_ext: Set[str],
+    ignored_ext: Set[str],
+    ignored_names: Set[str],
+) -> bool:
+    name = os.path.basename(filename)
+
+    if name in ignored_names:
+        return False
+
+    ext = os.path.splitext(name)[1].lower()
+
+    if ext in ignored_ext:
+        return False
+
+    return ext in allowed_ext
+
+
+def archive_sort_key(filename: str) -> Tuple[str, int]:
+    """
+    依 report_archiver 的命名排序：時間戳，其次為秒以下的序號
+    （目前為微秒 _ffffff，較早的歸檔為同秒序號 _1、_2 ...）。
+    直接以字串排序會把 _10 排在 _2 前面。
+    """
+    stem = os.path.splitext(filename)[0]
+    base, _, seq = stem.rpartition("_")
+    if base and seq.isdigit():
+        return base, int(seq)
+    return stem, 0
+
+
+def iter_files(
+    base_dir: str,
+    log: Logger,
+    journal: Optional[str] = None,
+    since: Optional[datetime] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    relevant: Optional[Callable[[str], bool]] = None,
+    frontier: Optional[walker.Frontier] = None,
+    on_checkpoint: Optional[Callable[[walker.Frontier], None]] = None,
+    snapshot: Optional["Snapshot"] = None,
+    save_snapshot: Optional["SnapshotWriter"] = None,
+) -> Iterator[Tuple[str, Optional[walker.FileStat]]]:
+    """
+    逐一產出 base_dir 下的 (檔案路徑, stat)。
+    指定 journal 且日誌完整涵蓋 since 至今時，只產出日誌記錄過變動的路徑；
+    日誌有缺口時自動改回完整走訪。
+
+    列目錄與 stat 都在 watchdog 的時間預算內執行，卡住的資料夾記錄於 watchdog.skipped。
+    relevant 回傳 False 的檔案不做 stat（stat 為 None）；stat 失敗時也是 None。
+    frontier / on_checkpoint 用於中斷後續跑（完整走訪時才有效），見 walker.walk。
+
+    指定 snapshot 時不走訪，改由快照產出（stat 為快照中的屬性）；
+    指定 save_snapshot 時，所有檔案都做 stat，走訪結束後寫出快照。
+    """
+    if watchdog is None:
+        watchdog = walker.Watchdog()
+
+    if snapshot is not None:
+        watchdog.skipped.extend(snapshot.skipped(base_dir))
+        for root, _, files in snapshot.walk(base_dir):
+            for name, stat in files:
+                yield os.path.join(root, name), stat
+        return
+
+    paths = None
+    if journal:
+        from . import change_journal
+
+        paths = change_journal.changed_files(journal, base_dir, since, watchdog)
+        if paths is not None:
+            log(f"Using change journal {journal} ({len(paths)} candidate(s))")
+        else:
+            log("Change journal incomplete. Falling back to full scan.")
+
+    if paths is not None:
+        yield from walker.stat_many(paths, watchdog, want_stat=relevant)
+    else:
+        folders = walker.walk(
+            base_dir, watchdog, want_stat=None if save_snapshot else relevant,
+            frontier=frontier, on_checkpoint=on_checkpoint,
+        )
+        if save_snapshot is not None:
+            folders = save_snapshot.record(folders)
+
+        for root, _, files in folders:
+            for name, stat in files:
+                yield os.path.join(root, name), stat
+
+        if save_snapshot is not None:
+            save_snapshot.finish(watchdog.skipped)
+            log(f"Snapshot written: {save_snapshot.path}")
+
+    if watchdog.skipped:
+        log(f"Skipped {len(watchdog.skipped)} folder(s) that did not respond in time")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# NOTE: Do not enable followlinks to avoid unexpected scans
+"""
+==================================================
+Daily Activity Snapshot (Configurable)
+==================================================
+
+- 支援外部 JSON 設定檔
+- 若設定檔不存在或錯誤，自動使用安全預設值
+- 適合一般上班族與一人公司日常使用
+- 可同時保存機器可讀的當日活動（--archive-partial），供週報 / 月報直接合併（見 activity_partial.py）
+
+注意事項：
+- 本工具為唯讀，不會修改或刪除任何檔案
+- 請自行確保重要資料已有備份
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, date, time
+from typing import List, Optional, Sequence, Tuple
+
+from . import activity_partial, common, io_throttle, report_renderer, scan_snapshot, stat_backend, walker
+
+LOG_FILE = "daily_snapshot.log"
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def scan_today_activity(
+    base_dir: str,
+    journal: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+    today: Optional[date] = None,
+) -> Tuple[List[str], List[str]]:
+    today = today or date.today()
+    since = datetime.combine(today, time.min)
+    new_files: List[str] = []
+    modified_files: List[str] = []
+
+    allowed_ext, ignored_ext, ignored_names = common.load_config(log)
+
+    scanned = 0
+    ignored = 0
+
+    def relevant(name: str) -> bool:
+        return common.is_relevant_file(name, allowed_ext, ignored_ext, ignored_names)
+
+    for path, stat in common.iter_files(
+        base_dir, log, journal, since, watchdog, relevant,
+        snapshot=snapshot, save_snapshot=save_snapshot,
+    ):
+        scanned += 1
+
+        if not relevant(path):
+            ignored += 1
+            continue
+
+        if stat is None:
+            continue
+
+        created = datetime.fromtimestamp(stat.st_ctime).date()
+        modified = datetime.fromtimestamp(stat.st_mtime).date()
+
+        rel_path = os.path.relpath(path, base_dir)
+
+        if created == today:
+            new_files.append(rel_path)
+        elif modified == today:
+            modified_files.append(rel_path)
+
+    log(
+        f"Scanned={scanned}, Ignored={ignored}, "
+        f"New={len(new_files)}, Modified={len(modified_files)}"
+    )
+
+    return new_files, modified_files
+
+
+def print_report(
+    base_dir: str,
+    new_files: List[str],
+    modified_files: List[str],
+    fmt: str = "text",
+    skipped: Sequence[walker.SkippedDir] = (),
+    throttle: Optional[io_throttle.Throttle] = None,
+    today: Optional[date] = None,
+) -> None:
+    today_str = (today or date.today()).isoformat()
+
+    with report_renderer.open_renderer(fmt, "daily_snapshot", ("path",)) as out:
+        out.text("=" * 30)
+        out.text("Daily Activity Snapshot")
+        out.field(f"Date  : {today_str}", "date", today_str)
+        out.field(f"Folder: {base_dir}", "folder", base_dir)
+        out.text("=" * 30)
+        out.text()
+
+        total = len(new_files) + len(modified_files)
+
+        out.text("[Summary]")
+        out.field(f"- New files created   : {len(new_files)}", "new_files", len(new_files))
+        out.field(f"- Files modified      : {len(modified_files)}", "modified_files", len(modified_files))
+        out.field(f"- Total activity      : {total} files", "total_activity", total)
+        out.text()
+
+        if new_files:
+            out.text("[New Files]")
+            for f in sorted(new_files):
+                out.record(f"- {f}", "new", path=f)
+            out.text()
+
+        if modified_files:
+            out.text("[Modified Files]")
+            for f in sorted(modified_files):
+                out.record(f"- {f}", "modified", path=f)
+            out.text()
+
+        io_throttle.print_throttling(out, throttle)
+        walker.print_skipped(out, base_dir, skipped)
+
+        out.text("[Note]")
+        out.text("File filtering rules are configurable via JSON config.")
+        out.text("This report is read-only.")
+        out.text("Please make sure important files are backed up manually.")
+        out.text()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms daily <folder_path> "
+            "[--journal <change_journal_file>] "
+            "[--dir-timeout <seconds>] [--total-timeout <seconds>] "
+            "[--stat-backend auto|statx|os] "
+            "[--max-ops <per_second>] [--low-priority] "
+            "[--save-snapshot <file> | --from-snapshot <file>] "
+            "[--archive-partial <report_name>] "
+            "[--format text|jsonl|csv]"
+        )
+    )
+    parser.add_argument("folder_path")
+    parser.add_argument("--journal", help="build the report from a change journal")
+    parser.add_argument(
+        "--archive-partial",
+        help="also save today's activity for weekly / monthly --compose under this report name",
+    )
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    walker.add_timeout_arguments(parser)
+    stat_backend.add_stat_arguments(parser)
+    io_throttle.add_throttle_arguments(parser)
+    scan_snapshot.add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    base_dir = args.folder_path
+    partial_name = activity_partial.report_name_from_args(args.archive_partial)
+
+    if args.journal and (args.save_snapshot or args.from_snapshot):
+        print("[ERROR] --journal cannot be combined with --save-snapshot or --from-snapshot.")
+        sys.exit(1)
+
+    if partial_name and args.from_snapshot:
+        print("[ERROR] --archive-partial cannot be combined with --from-snapshot.")
+        sys.exit(1)
+
+    if not args.from_snapshot and not os.path.isdir(base_dir):
+        print("[ERROR] Folder not found.")
+        sys.exit(1)
+
+    watchdog = walker.watchdog_from_args(args)
+    stat_backend.backend_from_args(args)
+    throttle = io_throttle.throttle_from_args(args)
+    snapshot = scan_snapshot.snapshot_from_args(args, log, base_dir)
+    # 由快照產生時，「今天」為快照建立的日期
+    today = snapshot.generated.date() if snapshot is not None else date.today()
+    new_files, modified_files = scan_today_activity(
+        base_dir, args.journal, watchdog,
+        snapshot, scan_snapshot.writer_from_args(args, base_dir), today,
+    )
+    if partial_name:
+        activity_partial.save(partial_name, today, base_dir, new_files, modified_files, watchdog)
+    print_report(base_dir, new_files, modified_files, args.format, watchdog.skipped, throttle, today)
+
+
+if __name__ == "__main__":
+    main()
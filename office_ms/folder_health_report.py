@@ -0,0 +1,1004 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Folder Health Report
+==================================================
+
+- 檢查資料夾健康狀態
+- 列出空資料夾、大型檔案、久未修改的檔案
+- 彙總各資料夾（含子資料夾）的總容量與檔案數，列出最大的子樹與檔案
+- 可選：找出內容完全相同的重複檔案（--duplicates）
+- 可選：本機雜湊快取（--hash-cache），內容未變的檔案不會被重複讀取
+- 長時間掃描可定期保存進度（--checkpoint），中斷後以 --resume 繼續
+- 可選：抽樣估計（--estimate），隨機抽樣資料夾推估各項數字與信賴區間，
+  適合只需要概略數字的超大型資料夾
+- 可選：限制每秒的檔案系統操作數與讀取量、降低優先權（見 io_throttle.py），
+  避免與上班時間重疊時拖慢共用的網路磁碟
+- 僅產出報告，不會修改或刪除任何資料
+
+注意事項：
+- 本工具為唯讀
+- 請自行確保重要資料已有備份
+"""
+
+import os
+import sys
+import math
+import mmap
+import heapq
+import time
+import random
+import hashlib
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, date, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from . import checkpoint, common, io_throttle, report_renderer, scan_snapshot, stat_backend, walker
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+LOG_FILE = "folder_health_report.log"
+CHECKPOINT_FILE = "folder_health_report.checkpoint.json"
+
+# ===== 健康檢查門檻（刻意寫死，避免過度複雜） =====
+
+LARGE_FILE_MB = 50
+STALE_DAYS = 180
+TOP_N = 10
+
+MB = 1024 * 1024
+
+# ===== 重複檔案偵測 =====
+# 大小 → 頭尾各 64 KiB 的雜湊 → 完整雜湊，逐步縮小需要讀取的範圍
+
+PARTIAL_BYTES = 64 * 1024
+READ_CHUNK_BYTES = 1024 * 1024
+HASH_WORKERS = 4
+
+# 雜湊演算法或取樣方式改變時須更新，既有快取會自動作廢
+DIGEST_SCHEME = "blake2b-160/partial-64KiB"
+
+# ===== 雜湊快取 =====
+
+DEFAULT_HASH_CACHE = "folder_health_hash_cache.sqlite3"
+HASH_CACHE_MAX_ENTRIES = 1_000_000
+HASH_CACHE_MAX_AGE_DAYS = 90
+
+# ===== 抽樣估計（--estimate） =====
+# 每次探測由根目錄隨機往下走到底，以沿途分支數加權推估全體（Knuth 樹大小估計法）
+
+ESTIMATE_METRICS = (
+    "folders", "empty_folders", "files", "total_bytes",
+    "large_files", "large_bytes", "stale_files",
+)
+# 這兩項的信賴區間達到目標精度即停止
+ESTIMATE_STOP_METRICS = ("files", "total_bytes")
+ESTIMATE_MIN_PROBES = 30
+ESTIMATE_PRECISION = 0.05
+ESTIMATE_TIME_BUDGET_SECONDS = 60.0
+ESTIMATE_SEED = 0
+# 95% 信賴區間（常態近似）
+CONFIDENCE_Z = 1.96
+
+# (st_dev, st_ino, st_size, st_mtime_ns)：任一項改變即視為不同內容
+FileKey = Tuple[int, int, int, int]
+
+# (rel_path, abs_path, file_key)
+DuplicateCandidate = Tuple[str, str, FileKey]
+
+
+@dataclass
+class HealthScan:
+    # 掃描開始的日期；續跑時沿用，久未修改的判斷基準不因中斷而改變
+    scan_date: date = field(default_factory=date.today)
+    empty_folders: List[str] = field(default_factory=list)
+    # (rel_path, size_bytes)
+    large_files: List[Tuple[str, int]] = field(default_factory=list)
+    stale_files: List[Tuple[str, date]] = field(default_factory=list)
+    # (rel_dir, total_bytes, file_count)，由大到小
+    heavy_dirs: List[Tuple[str, int, int]] = field(default_factory=list)
+    # (rel_path, size_bytes)，由大到小
+    top_files: List[Tuple[str, int]] = field(default_factory=list)
+    total_bytes: int = 0
+    total_files: int = 0
+    # (size_bytes, [rel_path, ...])；未啟用重複偵測時為 None
+    duplicates: Optional[List[Tuple[int, List[str]]]] = None
+    # 逾時略過的資料夾（path, reason）；其內容不計入上述統計
+    skipped: List[walker.SkippedDir] = field(default_factory=list)
+
+
+@dataclass
+class HealthEstimate:
+    # metric -> (estimate, 95% 信賴區間半寬)
+    figures: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    probes: int = 0
+    folders_read: int = 0
+    seed: int = ESTIMATE_SEED
+    stop_reason: str = ""
+    elapsed_seconds: float = 0.0
+    skipped: List[walker.SkippedDir] = field(default_factory=list)
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def push_top(heap: list, item: tuple) -> None:
+    """
+    維持大小為 TOP_N 的最小堆積，只保留最大的 N 筆，
+    不需要把全部資料收集起來再排序。
+    """
+    if len(heap) < TOP_N:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+class HashCache:
+    """
+    以 SQLite 保存的本機雜湊快取。
+
+    - 以 (device, inode, size, mtime_ns) 為鍵，檔案未變動時直接沿用已知雜湊
+    - 查詢與寫入只在主執行緒進行，雜湊計算仍交給執行緒池
+    - 關閉時更新使用時間，並依「最久未使用」與存放天數淘汰，總筆數不超過上限
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = HASH_CACHE_MAX_ENTRIES,
+        max_age_days: int = HASH_CACHE_MAX_AGE_DAYS,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._touched: Set[FileKey] = set()
+
+        # 僅在 --hash-cache 時才載入 sqlite3，一般執行不付出匯入成本
+        import sqlite3
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'scheme'"
+        ).fetchone()
+        if row is None or row[0] != DIGEST_SCHEME:
+            self.conn.execute("DROP TABLE IF EXISTS digests")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('scheme', ?)",
+                (DIGEST_SCHEME,),
+            )
+
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digests (
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                partial BLOB,
+                full BLOB,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (dev, ino, size, mtime_ns)
+            ) WITHOUT ROWID
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used)"
+        )
+        self.conn.commit()
+
+    def get(self, key: FileKey, kind: str) -> Optional[bytes]:
+        row = self.conn.execute(
+            f"SELECT {kind} FROM digests "
+            "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+            key,
+        ).fetchone()
+
+        if row is None or row[0] is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched.add(key)
+        return row[0]
+
+    def put(self, key: FileKey, kind: str, digest: bytes) -> None:
+        self.conn.execute(
+            f"INSERT INTO digests (dev, ino, size, mtime_ns, {kind}, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (dev, ino, size, mtime_ns) "
+            f"DO UPDATE SET {kind} = excluded.{kind}, last_used = excluded.last_used",
+            (*key, digest, time.time()),
+        )
+
+    def close(self) -> None:
+        now = time.time()
+
+        self.conn.executemany(
+            "UPDATE digests SET last_used = ? "
+            "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+            ((now, *key) for key in self._touched),
+        )
+
+        expired = self.conn.execute(
+            "DELETE FROM digests WHERE last_used < ?",
+            (now - self.max_age_days * 86400,),
+        ).rowcount
+
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM digests").fetchone()
+        evicted = 0
+        if count > self.max_entries:
+            evicted = self.conn.execute(
+                "DELETE FROM digests WHERE (dev, ino, size, mtime_ns) IN ("
+                "SELECT dev, ino, size, mtime_ns FROM digests "
+                "ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+
+        self.conn.commit()
+        self.conn.close()
+
+        log(
+            f"Hash_cache={self.path}, Hits={self.hits}, Misses={self.misses}, "
+            f"Expired={expired}, Evicted={evicted}"
+        )
+
+
+def partial_digest(path: str, size: int) -> bytes:
+    """
+    僅讀取檔案頭尾各 PARTIAL_BYTES。
+    檔案不大於 2 * PARTIAL_BYTES 時等同讀取整個檔案。
+    """
+    h = hashlib.blake2b(digest_size=20)
+    throttle = io_throttle.current()
+    if throttle is not None:
+        throttle.op()
+        throttle.read(min(size, 2 * PARTIAL_BYTES))
+    with open(path, "rb") as f:
+        h.update(f.read(PARTIAL_BYTES))
+        if size > PARTIAL_BYTES:
+            f.seek(max(PARTIAL_BYTES, size - PARTIAL_BYTES))
+            h.update(f.read(PARTIAL_BYTES))
+    return h.digest()
+
+
+def full_digest(path: str, size: int) -> bytes:
+    """
+    完整內容雜湊。優先使用 mmap（hashlib 計算期間會釋放 GIL，可多執行緒並行），
+    無法 mmap 時（例如部分網路磁碟）改用大區塊讀取。
+    限制讀取量（--max-mb）時，mmap 也逐區塊取得額度後才雜湊。
+    """
+    h = hashlib.blake2b(digest_size=20)
+    throttle = io_throttle.current()
+    if throttle is not None:
+        throttle.op()
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                if throttle is None:
+                    h.update(m)
+                else:
+                    with memoryview(m) as view:
+                        for offset in range(0, len(view), READ_CHUNK_BYTES):
+                            chunk = view[offset:offset + READ_CHUNK_BYTES]
+                            throttle.read(len(chunk))
+                            h.update(chunk)
+                            chunk.release()
+            return h.digest()
+        except (OSError, ValueError):
+            f.seek(0)
+
+        while True:
+            chunk = f.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if throttle is not None:
+                throttle.read(len(chunk))
+            h.update(chunk)
+    return h.digest()
+
+
+def regroup(
+    groups: List[Tuple[int, List[DuplicateCandidate]]],
+    digest: Callable[[str, int], bytes],
+    kind: str,
+    pool: "ThreadPoolExecutor",
+    cache: Optional[HashCache] = None,
+) -> List[Tuple[int, List[DuplicateCandidate]]]:
+    """
+    以 digest 對每一組候選檔案再分組，只保留仍有兩個以上成員的組別。
+    快取中已有相同鍵的檔案不再讀取。
+    讀取失敗的檔案直接排除（寧可漏報，不可誤報）。
+    """
+    jobs = []
+    for size, candidates in groups:
+        for candidate in candidates:
+            known = cache.get(candidate[2], kind) if cache else None
+            if known is not None:
+                jobs.append((size, candidate, known))
+            else:
+                jobs.append((size, candidate, pool.submit(digest, candidate[1], size)))
+
+    buckets: Dict[Tuple[int, bytes], List[DuplicateCandidate]] = defaultdict(list)
+    for size, candidate, job in jobs:
+        if isinstance(job, bytes):
+            buckets[(size, job)].append(candidate)
+            continue
+
+        try:
+            value = job.result()
+        except OSError as e:
+            log(f"Hash failed: {candidate[0]} ({e})")
+            continue
+
+        if cache:
+            cache.put(candidate[2], kind, value)
+        buckets[(size, value)].append(candidate)
+
+    return [
+        (size, candidates)
+        for (size, _), candidates in buckets.items()
+        if len(candidates) > 1
+    ]
+
+
+def find_duplicates(
+    by_size: Dict[int, List[DuplicateCandidate]],
+    cache: Optional[HashCache] = None,
+) -> List[Tuple[int, List[str]]]:
+    groups = [
+        (size, candidates)
+        for size, candidates in by_size.items()
+        if len(candidates) > 1
+    ]
+    size_candidates = sum(len(c) for _, c in groups)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        groups = regroup(groups, partial_digest, "partial", pool, cache)
+        partial_candidates = sum(len(c) for _, c in groups)
+
+        # 頭尾雜湊已涵蓋整個檔案的組別不必再讀一次
+        small = [g for g in groups if g[0] <= 2 * PARTIAL_BYTES]
+        large = [g for g in groups if g[0] > 2 * PARTIAL_BYTES]
+        groups = small + regroup(large, full_digest, "full", pool, cache)
+
+    log(
+        f"Duplicate_candidates: size={size_candidates}, "
+        f"partial={partial_candidates}, groups={len(groups)}"
+    )
+
+    return sorted(
+        (
+            (size, sorted(rel for rel, _, _ in candidates))
+            for size, candidates in groups
+        ),
+        key=lambda g: (-g[0] * (len(g[1]) - 1), g[1][0]),
+    )
+
+
+def scan_folder_health(
+    base_dir: str,
+    check_duplicates: bool = False,
+    hash_cache: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    progress: Optional[checkpoint.Checkpoint] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+) -> HealthScan:
+    """
+    完整走訪並彙整。
+    給定 progress 時，走訪期間定期保存進度與目前為止的彙整結果，
+    有先前中斷的進度時從該處繼續，結果與未中斷時相同。
+    給定 snapshot 時不走訪，改由快照彙整（Scan Date 為快照建立的日期）；
+    給定 save_snapshot 時，走訪結束後另外寫出快照。
+    """
+    result = HealthScan()
+
+    if watchdog is None:
+        watchdog = walker.Watchdog()
+
+    if snapshot is not None:
+        result.scan_date = snapshot.generated.date()
+        watchdog.skipped.extend(snapshot.skipped(base_dir))
+
+    scanned_files = 0
+    scanned_dirs = 0
+
+    # 由下而上走訪：子資料夾一定先於父資料夾出現，
+    # 子樹總量在父資料夾處理完後即可丟棄，記憶體只與「尚未處理的父層」有關。
+    pending: Dict[str, Tuple[int, int]] = {}
+    dir_heap: List[Tuple[int, int, str]] = []
+    file_heap: List[Tuple[int, str]] = []
+    by_size: Dict[int, List[DuplicateCandidate]] = defaultdict(list)
+
+    frontier = None
+    saved = progress.load() if progress is not None else None
+    if saved is not None:
+        state = saved["state"]
+        frontier = saved["frontier"]
+        checkpoint.restore_skipped(watchdog, saved)
+
+        result.scan_date = date.fromisoformat(state["scan_date"])
+        result.empty_folders = state["empty_folders"]
+        result.large_files = [(path, size) for path, size in state["large_files"]]
+        result.stale_files = [
+            (path, date.fromisoformat(mdate)) for path, mdate in state["stale_files"]
+        ]
+        result.total_bytes = state["total_bytes"]
+        result.total_files = state["total_files"]
+        scanned_files = state["scanned_files"]
+        scanned_dirs = state["scanned_dirs"]
+        pending = {path: (size, count) for path, size, count in state["pending"]}
+        # 保持原本的陣列順序，heap 結構不變
+        dir_heap = [(size, count, rel_dir) for size, count, rel_dir in state["dir_heap"]]
+        file_heap = [(size, rel_path) for size, rel_path in state["file_heap"]]
+        for rel_path, path, key in state["duplicate_candidates"]:
+            by_size[key[2]].append((rel_path, path, tuple(key)))
+
+    stale_threshold = result.scan_date - timedelta(days=STALE_DAYS)
+
+    def on_checkpoint(frames: walker.Frontier) -> None:
+        if not progress.due():
+            return
+        progress.save(frames, watchdog.skipped, {
+            "scan_date": result.scan_date.isoformat(),
+            "empty_folders": result.empty_folders,
+            "large_files": result.large_files,
+            "stale_files": [(path, mdate.isoformat()) for path, mdate in result.stale_files],
+            "total_bytes": result.total_bytes,
+            "total_files": result.total_files,
+            "scanned_files": scanned_files,
+            "scanned_dirs": scanned_dirs,
+            "pending": [(path, size, count) for path, (size, count) in pending.items()],
+            "dir_heap": dir_heap,
+            "file_heap": file_heap,
+            "duplicate_candidates": [c for candidates in by_size.values() for c in candidates],
+        })
+
+    if snapshot is not None:
+        folders = snapshot.walk(base_dir, topdown=False)
+    else:
+        folders = walker.walk(
+            base_dir, watchdog, topdown=False, frontier=frontier,
+            on_checkpoint=on_checkpoint if progress is not None else None,
+        )
+        if save_snapshot is not None:
+            folders = save_snapshot.record(folders)
+
+    for root, dirs, files in folders:
+        scanned_dirs += 1
+
+        rel_dir = os.path.relpath(root, base_dir)
+
+        # 空資料夾直接由 walk 已列出的內容判斷，不再額外 scandir
+        if not dirs and not files and rel_dir != ".":
+            result.empty_folders.append(rel_dir)
+
+        dir_bytes = 0
+        dir_files = 0
+
+        for name in dirs:
+            child_bytes, child_files = pending.pop(os.path.join(root, name), (0, 0))
+            dir_bytes += child_bytes
+            dir_files += child_files
+
+        for name, stat in files:
+            scanned_files += 1
+            path = os.path.join(root, name)
+
+            if stat is None:
+                continue
+
+            dir_bytes += stat.st_size
+            dir_files += 1
+
+            size_mb = stat.st_size / MB
+            modified_date = datetime.fromtimestamp(stat.st_mtime).date()
+
+            rel_path = os.path.relpath(path, base_dir)
+
+            push_top(file_heap, (stat.st_size, rel_path))
+
+            # 空檔案彼此都「相同」，列出來沒有意義
+            if check_duplicates and stat.st_size > 0:
+                key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                by_size[stat.st_size].append((rel_path, path, key))
+
+            if size_mb >= LARGE_FILE_MB:
+                result.large_files.append((rel_path, stat.st_size))
+
+            if modified_date <= stale_threshold:
+                result.stale_files.append((rel_path, modified_date))
+
+        if rel_dir == ".":
+            result.total_bytes = dir_bytes
+            result.total_files = dir_files
+        else:
+            pending[root] = (dir_bytes, dir_files)
+            push_top(dir_heap, (dir_bytes, dir_files, rel_dir))
+
+    result.heavy_dirs = [
+        (rel_dir, size, count)
+        for size, count, rel_dir in sorted(dir_heap, reverse=True)
+    ]
+    result.top_files = [
+        (rel_path, size) for size, rel_path in sorted(file_heap, reverse=True)
+    ]
+
+    result.skipped = watchdog.skipped
+
+    if progress is not None:
+        progress.clear()
+
+    if save_snapshot is not None:
+        save_snapshot.finish(watchdog.skipped)
+        log(f"Snapshot written: {save_snapshot.path}")
+
+    if check_duplicates:
+        cache = HashCache(hash_cache) if hash_cache else None
+        try:
+            result.duplicates = find_duplicates(by_size, cache)
+        finally:
+            if cache:
+                cache.close()
+
+    log(
+        f"Scanned_dirs={scanned_dirs}, "
+        f"Scanned_files={scanned_files}, "
+        f"Empty={len(result.empty_folders)}, "
+        f"Large={len(result.large_files)}, "
+        f"Stale={len(result.stale_files)}, "
+        f"Total_bytes={result.total_bytes}, "
+        f"Skipped_dirs={len(result.skipped)}"
+    )
+
+    return result
+
+
+def read_folder_metrics(
+    base_dir: str,
+    root: str,
+    stale_threshold: date,
+    watchdog: walker.Watchdog,
+) -> Tuple[Tuple[int, ...], List[str]]:
+    """
+    讀取單一資料夾（不含子資料夾）的各項數字，順序同 ESTIMATE_METRICS，
+    並回傳可往下走訪的子資料夾（排序後，確保同一 seed 抽到相同的資料夾）。
+    逾時或無法讀取的資料夾視為空的末端資料夾。
+    """
+    try:
+        dirs, descend, files = watchdog.run(walker.list_dir, root, None)
+    except walker.Stalled as e:
+        watchdog.skip(root, str(e))
+        return (0,) * len(ESTIMATE_METRICS), []
+    except OSError:
+        return (0,) * len(ESTIMATE_METRICS), []
+
+    is_subfolder = os.path.relpath(root, base_dir) != "."
+
+    file_count = total_bytes = large_files = large_bytes = stale_files = 0
+    for _, stat in files:
+        if stat is None:
+            continue
+        file_count += 1
+        total_bytes += stat.st_size
+        if stat.st_size / MB >= LARGE_FILE_MB:
+            large_files += 1
+            large_bytes += stat.st_size
+        if datetime.fromtimestamp(stat.st_mtime).date() <= stale_threshold:
+            stale_files += 1
+
+    metrics = (
+        int(is_subfolder),
+        int(is_subfolder and not dirs and not files),
+        file_count,
+        total_bytes,
+        large_files,
+        large_bytes,
+        stale_files,
+    )
+    return metrics, sorted(descend)
+
+
+def half_width(m2: float, probes: int) -> float:
+    if probes < 2:
+        return math.inf
+    return CONFIDENCE_Z * math.sqrt(m2 / (probes - 1) / probes)
+
+
+def estimate_folder_health(
+    base_dir: str,
+    precision: float = ESTIMATE_PRECISION,
+    time_budget: float = ESTIMATE_TIME_BUDGET_SECONDS,
+    seed: int = ESTIMATE_SEED,
+    watchdog: Optional[walker.Watchdog] = None,
+) -> HealthEstimate:
+    """
+    隨機探測推估資料夾的各項數字，不走訪整個資料夾。
+
+    每次探測由根目錄出發，每層隨機選一個子資料夾往下走到底，
+    沿途每個資料夾的數字乘以「到達該資料夾的機率的倒數」（沿途分支數的乘積）後加總，
+    即為全體總數的一個不偏估計。多次探測取平均，並以樣本變異數計算信賴區間。
+
+    至少探測 ESTIMATE_MIN_PROBES 次；檔案數與總容量的信賴區間半寬
+    都不超過估計值的 precision 時停止，或超過 time_budget 秒時停止。
+    """
+    if watchdog is None:
+        watchdog = walker.Watchdog()
+
+    rng = random.Random(seed)
+    stale_threshold = date.today() - timedelta(days=STALE_DAYS)
+
+    # path -> (metrics, 子資料夾)；靠近根目錄的資料夾會被反覆經過，只讀取一次
+    folders: Dict[str, Tuple[Tuple[int, ...], List[str]]] = {}
+
+    count = len(ESTIMATE_METRICS)
+    stop_index = [ESTIMATE_METRICS.index(m) for m in ESTIMATE_STOP_METRICS]
+    mean = [0.0] * count
+    m2 = [0.0] * count
+    probes = 0
+
+    started = time.monotonic()
+
+    while True:
+        totals = [0.0] * count
+        path = base_dir
+        weight = 1
+
+        while True:
+            node = folders.get(path)
+            if node is None:
+                node = read_folder_metrics(base_dir, path, stale_threshold, watchdog)
+                folders[path] = node
+
+            metrics, children = node
+            for i, value in enumerate(metrics):
+                totals[i] += weight * value
+
+            if not children:
+                break
+            weight *= len(children)
+            path = os.path.join(path, rng.choice(children))
+
+        # Welford：逐次更新平均與離差平方和
+        probes += 1
+        for i, value in enumerate(totals):
+            delta = value - mean[i]
+            mean[i] += delta / probes
+            m2[i] += delta * (value - mean[i])
+
+        if probes >= ESTIMATE_MIN_PROBES and all(
+            half_width(m2[i], probes) <= precision * mean[i] for i in stop_index
+        ):
+            stop_reason = f"precision reached (±{precision * 100:g}%)"
+            break
+
+        if time.monotonic() - started >= time_budget:
+            stop_reason = f"time budget ({time_budget:g}s) reached"
+            break
+
+    estimate = HealthEstimate(
+        figures={
+            metric: (mean[i], half_width(m2[i], probes))
+            for i, metric in enumerate(ESTIMATE_METRICS)
+        },
+        probes=probes,
+        folders_read=len(folders),
+        seed=seed,
+        stop_reason=stop_reason,
+        elapsed_seconds=time.monotonic() - started,
+        skipped=watchdog.skipped,
+    )
+
+    log(
+        f"Estimate: Probes={probes}, "
+        f"Folders_read={estimate.folders_read}, "
+        f"Seed={seed}, "
+        f"Stop={stop_reason}, "
+        f"Files~{mean[ESTIMATE_METRICS.index('files')]:.0f}, "
+        f"Total_bytes~{mean[ESTIMATE_METRICS.index('total_bytes')]:.0f}"
+    )
+
+    return estimate
+
+
+def print_report(
+    base_dir: str,
+    result: HealthScan,
+    fmt: str = "text",
+    throttle: Optional[io_throttle.Throttle] = None,
+) -> None:
+    empty_folders = result.empty_folders
+    large_files = result.large_files
+    stale_files = result.stale_files
+
+    today_str = result.scan_date.isoformat()
+
+    columns = ("path", "size_bytes", "last_modified", "file_count", "group")
+
+    with report_renderer.open_renderer(fmt, "folder_health", columns) as out:
+        out.text("=" * 40)
+        out.text("Folder Health Report")
+        out.field(f"Scan Date : {today_str}", "scan_date", today_str)
+        out.field(f"Folder    : {base_dir}", "folder", base_dir)
+        out.text("=" * 40)
+        out.text()
+
+        out.text("[Summary]")
+        out.field(f"- Empty folders            : {len(empty_folders)}", "empty_folders", len(empty_folders))
+        out.field(f"- Large files (>= {LARGE_FILE_MB} MB)   : {len(large_files)}", "large_files", len(large_files))
+        out.field(f"- Stale files (>= {STALE_DAYS} days) : {len(stale_files)}", "stale_files", len(stale_files))
+        out.field(
+            f"- Total size               : {result.total_bytes / MB:.1f} MB ({result.total_files} files)",
+            "total_bytes",
+            result.total_bytes,
+        )
+        if result.duplicates is not None:
+            wasted = sum(size * (len(paths) - 1) for size, paths in result.duplicates)
+            out.field(
+                f"- Duplicate groups         : {len(result.duplicates)} ({wasted / MB:.1f} MB reclaimable)",
+                "duplicate_groups",
+                len(result.duplicates),
+            )
+        out.text()
+
+        if empty_folders:
+            out.text("[Empty Folders]")
+            for d in sorted(empty_folders):
+                out.record(f"- {d}", "empty", path=d)
+            out.text()
+
+        if large_files:
+            out.text("[Large Files]")
+            for path, size in sorted(large_files, key=lambda x: -x[1]):
+                out.record(f"- {path} ({size / MB:.1f} MB)", "large", path=path, size_bytes=size)
+            out.text()
+
+        if stale_files:
+            out.text("[Stale Files]")
+            for path, mdate in sorted(stale_files, key=lambda x: x[1]):
+                out.record(f"- {path} (last modified: {mdate})", "stale", path=path, last_modified=mdate)
+            out.text()
+
+        if result.heavy_dirs:
+            out.text(f"[Largest Subtrees (Top {TOP_N})]")
+            for d, size, count in result.heavy_dirs:
+                out.record(
+                    f"- {d} ({size / MB:.1f} MB, {count} files)",
+                    "largest_subtree", path=d, size_bytes=size, file_count=count,
+                )
+            out.text()
+
+        if result.top_files:
+            out.text(f"[Largest Files (Top {TOP_N})]")
+            for path, size in result.top_files:
+                out.record(f"- {path} ({size / MB:.1f} MB)", "largest_file", path=path, size_bytes=size)
+            out.text()
+
+        if result.duplicates:
+            out.text("[Duplicate Files]")
+            for group, (size, paths) in enumerate(result.duplicates, 1):
+                out.text(f"- {len(paths)} copies x {size / MB:.1f} MB")
+                for path in paths:
+                    out.record(f"  - {path}", "duplicate", path=path, size_bytes=size, group=group)
+            out.text()
+
+        io_throttle.print_throttling(out, throttle)
+        walker.print_skipped(out, base_dir, result.skipped)
+
+        out.text("[Note]")
+        out.text("- This report is read-only.")
+        out.text("- No files or folders were modified.")
+        out.text("- Please review carefully before taking any action.")
+        out.text()
+
+
+def print_estimate_report(
+    base_dir: str,
+    estimate: HealthEstimate,
+    fmt: str = "text",
+    throttle: Optional[io_throttle.Throttle] = None,
+) -> None:
+    today_str = date.today().isoformat()
+
+    lines = (
+        ("folders", "- Folders                  ", False),
+        ("empty_folders", "- Empty folders            ", False),
+        ("files", "- Files                    ", False),
+        ("total_bytes", "- Total size               ", True),
+        ("large_files", f"- Large files (>= {LARGE_FILE_MB} MB)   ", False),
+        ("large_bytes", "- Size of large files      ", True),
+        ("stale_files", f"- Stale files (>= {STALE_DAYS} days) ", False),
+    )
+
+    columns = ("metric", "estimate", "low", "high")
+
+    with report_renderer.open_renderer(fmt, "folder_health_estimate", columns) as out:
+        out.text("=" * 40)
+        out.text("Folder Health Report (ESTIMATE)")
+        out.field(f"Scan Date : {today_str}", "scan_date", today_str)
+        out.field(f"Folder    : {base_dir}", "folder", base_dir)
+        out.text("=" * 40)
+        out.text()
+
+        out.text("[Estimated Summary]")
+        out.text("- All figures below are ESTIMATES (95% confidence interval), not exact counts.")
+        for metric, label, is_bytes in lines:
+            value, margin = estimate.figures[metric]
+            low = max(0.0, value - margin)
+            high = value + margin
+            if is_bytes:
+                text = f"~{value / MB:.1f} MB (range {low / MB:.1f} ~ {high / MB:.1f} MB)"
+            else:
+                text = f"~{value:.0f} (range {low:.0f} ~ {high:.0f})"
+            out.record(
+                f"{label}: {text}",
+                "estimate", metric=metric, estimate=round(value), low=round(low), high=round(high),
+            )
+        out.text()
+
+        out.text("[Sampling]")
+        out.field(f"- Probes        : {estimate.probes}", "probes", estimate.probes)
+        out.field(f"- Folders read  : {estimate.folders_read}", "folders_read", estimate.folders_read)
+        out.field(f"- Seed          : {estimate.seed}", "seed", estimate.seed)
+        out.field(f"- Stopped       : {estimate.stop_reason}", "stop_reason", estimate.stop_reason)
+        out.field(
+            f"- Elapsed       : {estimate.elapsed_seconds:.1f}s",
+            "elapsed_seconds", round(estimate.elapsed_seconds, 1),
+        )
+        out.text()
+
+        io_throttle.print_throttling(out, throttle)
+        walker.print_skipped(out, base_dir, estimate.skipped)
+
+        out.text("[Note]")
+        out.text("- This report is read-only.")
+        out.text("- Figures are extrapolated from randomly sampled folders, not counted.")
+        out.text("- The same --seed on an unchanged folder samples the same folders.")
+        out.text("- File lists are not produced; run without --estimate for exact results.")
+        out.text()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms health <folder_path> "
+            "[--duplicates [--hash-cache [<cache_file>]]] [--format text|jsonl|csv] "
+            "[--dir-timeout <seconds>] [--total-timeout <seconds>] "
+            "[--stat-backend auto|statx|os]\n"
+            "       [--max-ops <per_second>] [--max-mb <per_second>] [--low-priority]\n"
+            "       (full scans also accept --checkpoint [<file>], --resume,\n"
+            "        --save-snapshot <file> and --from-snapshot <file>)\n"
+            "       office-ms health <folder_path> --estimate "
+            "[--precision <ratio>] [--time-budget <seconds>] [--seed <n>]"
+        )
+    )
+    parser.add_argument("folder_path")
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="also list files with identical content (reads file content)",
+    )
+    parser.add_argument(
+        "--hash-cache",
+        nargs="?",
+        const=DEFAULT_HASH_CACHE,
+        help=f"reuse digests of unchanged files (default file: {DEFAULT_HASH_CACHE})",
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="estimate figures from randomly sampled folders instead of a full scan",
+    )
+    parser.add_argument(
+        "--precision",
+        type=float,
+        help=f"stop once the 95%% interval is within this ratio (default {ESTIMATE_PRECISION:g})",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help=f"stop sampling after this many seconds (default {ESTIMATE_TIME_BUDGET_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help=f"random seed; same seed samples the same folders (default {ESTIMATE_SEED})",
+    )
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    walker.add_timeout_arguments(parser)
+    stat_backend.add_stat_arguments(parser)
+    io_throttle.add_throttle_arguments(parser, reads_content=True)
+    checkpoint.add_checkpoint_arguments(parser, CHECKPOINT_FILE)
+    scan_snapshot.add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    base_dir = args.folder_path
+
+    if args.hash_cache and not args.duplicates:
+        print("[ERROR] --hash-cache requires --duplicates.")
+        sys.exit(1)
+
+    sampling = (args.precision, args.time_budget, args.seed)
+    if not args.estimate and any(v is not None for v in sampling):
+        print("[ERROR] --precision, --time-budget and --seed require --estimate.")
+        sys.exit(1)
+
+    if args.estimate and args.duplicates:
+        print("[ERROR] --estimate cannot be combined with --duplicates.")
+        sys.exit(1)
+
+    if args.estimate and (args.checkpoint or args.resume):
+        print("[ERROR] --estimate cannot be combined with --checkpoint or --resume.")
+        sys.exit(1)
+
+    if (args.save_snapshot or args.from_snapshot) and (
+        args.estimate or args.checkpoint or args.resume
+    ):
+        print(
+            "[ERROR] --save-snapshot / --from-snapshot cannot be combined with "
+            "--estimate, --checkpoint or --resume."
+        )
+        sys.exit(1)
+
+    if args.from_snapshot and args.duplicates:
+        print("[ERROR] --duplicates reads file content and cannot run from a snapshot.")
+        sys.exit(1)
+
+    if args.precision is not None and not 0 < args.precision < 1:
+        print("[ERROR] --precision must be between 0 and 1 (e.g. 0.05).")
+        sys.exit(1)
+
+    if args.time_budget is not None and args.time_budget <= 0:
+        print("[ERROR] --time-budget must be greater than 0.")
+        sys.exit(1)
+
+    if not args.from_snapshot and not os.path.isdir(base_dir):
+        print("[ERROR] Folder not found.")
+        sys.exit(1)
+
+    watchdog = walker.watchdog_from_args(args)
+    stat_backend.backend_from_args(args)
+    throttle = io_throttle.throttle_from_args(args)
+    snapshot = scan_snapshot.snapshot_from_args(args, log, base_dir)
+
+    if args.estimate:
+        estimate = estimate_folder_health(
+            base_dir,
+            ESTIMATE_PRECISION if args.precision is None else args.precision,
+            ESTIMATE_TIME_BUDGET_SECONDS if args.time_budget is None else args.time_budget,
+            ESTIMATE_SEED if args.seed is None else args.seed,
+            watchdog,
+        )
+        print_estimate_report(base_dir, estimate, args.format, throttle)
+        return
+
+    progress = checkpoint.checkpoint_from_args(
+        args, CHECKPOINT_FILE,
+        {
+            "report": "folder_health",
+            "folder": os.path.abspath(base_dir),
+            "duplicates": args.duplicates,
+        },
+        log,
+    )
+
+    result = scan_folder_health(
+        base_dir, args.duplicates, args.hash_cache, watchdog, progress,
+        snapshot, scan_snapshot.writer_from_args(args, base_dir),
+    )
+    print_report(base_dir, result, args.format, throttle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+==================================================
+IO Throttle
+==================================================
+
+- 掃描工具共用的讀取節流，避免上班時間的掃描拖慢整台 NAS
+- 限制每秒的檔案系統操作數（列目錄、stat、開檔；--max-ops）
+  與每秒讀取的檔案內容（--max-mb，僅 health --duplicates 會讀取內容）
+- 以 token bucket 實作：同一次執行中的所有執行緒（走訪、雜湊）共用同一組額度
+- 可選：降低本程序的 CPU 與 I/O 優先權（--low-priority）
+- 啟用時，報告加上 [Throttling] 區段，記錄限制、操作量與因節流而等待的時間
+
+降低優先權（--low-priority）：
+- Linux：nice +10，並以 ioprio_set 設為 best-effort 最低等級（7）
+- macOS 等其他 POSIX：nice +10
+- Windows：背景處理模式（PROCESS_MODE_BACKGROUND_BEGIN，同時降低 CPU 與 I/O 優先權）
+
+注意事項：
+- I/O 優先權只影響本機磁碟的排程；網路磁碟（SMB / NFS）的負載請以 --max-ops / --max-mb 控制
+- 節流等待的時間不計入 --dir-timeout（單一資料夾），但計入 --total-timeout（整次掃描）
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Dict, Optional
+
+MB = 1024 * 1024
+
+# 額度最多累積 1 秒份，閒置後不會一次爆量
+BURST_SECONDS = 1.0
+
+NICE_INCREMENT = 10
+
+# <linux/ioprio.h>
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_BE = 2
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_LOWEST_LEVEL = 7
+
+# ioprio_set 的系統呼叫編號（glibc 沒有包裝函式）
+IOPRIO_SET_SYSCALL = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "riscv64": 30,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "s390x": 282,
+}
+
+# <winbase.h>
+PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+
+
+class TokenBucket:
+    """
+    每秒補充 rate 個額度，最多累積 rate * BURST_SECONDS 個。
+    額度不足時先預扣（可為負）再等待；同時等待的執行緒依序排隊，長期速率不超過 rate。
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(rate * BURST_SECONDS, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: int) -> float:
+        """
+        預扣 amount，回傳需要等待的秒數。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            self.used += amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class Throttle:
+    """
+    一次執行的節流設定與統計。max_ops / max_mb 為 None 時該項不限制。
+    """
+
+    def __init__(self, max_ops: Optional[float] = None, max_mb: Optional[float] = None) -> None:
+        self.max_ops = max_ops
+        self.max_mb = max_mb
+        self.ops = TokenBucket(max_ops) if max_ops else None
+        self.bytes = TokenBucket(max_mb * MB) if max_mb else None
+        self.priority: Optional[str] = None
+        self.started = time.monotonic()
+
+        # 至少有一個執行緒在等待額度的累計時間（牆鐘時間，不重複計算並行的等待）
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._waiting_since = 0.0
+        self._thread_waits: Dict[int, float] = {}
+
+    def op(self, count: int = 1) -> None:
+        """
+        每次列目錄、stat 或開檔前呼叫。
+        """
+        if self.ops is not None:
+            self._sleep(self.ops.reserve(count))
+
+    def read(self, size: int) -> None:
+        """
+        讀取 size bytes 的檔案內容前呼叫。
+        """
+        if self.bytes is not None:
+            self._sleep(self.bytes.reserve(size))
+
+    def waited(self, thread_id: int) -> float:
+        """
+        該執行緒累計（含正在進行）的等待秒數，供 walker 從逾時判斷中扣除。
+        """
+        with self._lock:
+            return self._thread_waits.get(thread_id, 0.0)
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            # 開始等待時就計入，walker 在等待期間即可延長時間預算
+            self._thread_waits[thread_id] = self._thread_waits.get(thread_id, 0.0) + seconds
+            if not self._waiting:
+                self._waiting_since = time.monotonic()
+            self._waiting += 1
+
+        try:
+            time.sleep(seconds)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                if not self._waiting:
+                    self.throttled_seconds += time.monotonic() - self._waiting_since
+
+
+def set_ioprio_lowest() -> bool:
+    import ctypes
+    import platform
+
+    number = IOPRIO_SET_SYSCALL.get(platform.machine())
+    if number is None:
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return False
+    value = (IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT) | IOPRIO_LOWEST_LEVEL
+    return libc.syscall(number, IOPRIO_WHO_PROCESS, 0, value) == 0
+
+
+def set_background_mode() -> bool:
+    import ctypes
+
+    kernel32 = ctypes.windll.kernel32
+    return bool(kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), PROCESS_MODE_BACKGROUND_BEGIN))
+
+
+def lower_priority() -> str:
+    """
+    降低本程序的 CPU 與 I/O 優先權，回傳實際套用的項目（供報告記錄）。
+    須在走訪與雜湊執行緒建立前呼叫：Linux 的 I/O 優先權以執行緒為單位，之後建立的執行緒才會沿用。
+    """
+    applied = []
+
+    if sys.platform == "win32":
+        if set_background_mode():
+            applied.append("background mode")
+    elif hasattr(os, "nice"):
+        try:
+            os.nice(NICE_INCREMENT)
+            applied.append(f"nice +{NICE_INCREMENT}")
+        except OSError:
+            pass
+        if sys.platform.startswith("linux") and set_ioprio_lowest():
+            applied.append(f"ioprio best-effort {IOPRIO_LOWEST_LEVEL}")
+
+    return ", ".join(applied) if applied else "unchanged (not supported on this system)"
+
+
+_throttle: Optional[Throttle] = None
+
+
+def use(throttle: Optional[Throttle]) -> Optional[Throttle]:
+    global _throttle
+    _throttle = throttle
+    return _throttle
+
+
+def current() -> Optional[Throttle]:
+    """
+    目前的節流設定；未啟用時為 None（走訪不付出任何額外成本）。
+    """
+    return _throttle
+
+
+def print_throttling(out, throttle: Optional[Throttle]) -> None:
+    """
+    報告共用的 [Throttling] 區段；未啟用節流或 --low-priority 時不輸出。
+    """
+    if throttle is None:
+        return
+
+    elapsed = time.monotonic() - throttle.started
+
+    out.text("[Throttling]")
+    if throttle.ops is not None:
+        out.field(
+            f"- Metadata ops limit  : {throttle.max_ops:g}/s ({throttle.ops.used} ops)",
+            "max_ops_per_second", throttle.max_ops,
+        )
+    if throttle.bytes is not None:
+        out.field(
+            f"- Read limit          : {throttle.max_mb:g} MB/s ({throttle.bytes.used / MB:.1f} MB read)",
+            "max_mb_per_second", throttle.max_mb,
+        )
+    if throttle.priority is not None:
+        out.field(f"- Priority            : {throttle.priority}", "priority", throttle.priority)
+    out.field(
+        f"- Waiting for limits  : {throttle.throttled_seconds:.1f}s of {elapsed:.1f}s elapsed",
+        "throttled_seconds", round(throttle.throttled_seconds, 1),
+    )
+    out.field(f"- Elapsed             : {elapsed:.1f}s", "elapsed_seconds", round(elapsed, 1))
+    out.text()
+
+
+def add_throttle_arguments(parser, reads_content: bool = False) -> None:
+    """
+    reads_content：會讀取檔案內容的工具（health --duplicates）才提供 --max-mb。
+    """
+    parser.add_argument(
+        "--max-ops", type=float,
+        help="limit file system operations (listings, stats, opens) per second (default: no limit)",
+    )
+    if reads_content:
+        parser.add_argument(
+            "--max-mb", type=float,
+            help="limit file content read per second, in MB (default: no limit)",
+        )
+    parser.add_argument(
+        "--low-priority", action="store_true",
+        help="lower this process's CPU and I/O priority",
+    )
+
+
+def throttle_from_args(args) -> Optional[Throttle]:
+    max_mb = getattr(args, "max_mb", None)
+    for name, value in (("--max-ops", args.max_ops), ("--max-mb", max_mb)):
+        if value is not None and value <= 0:
+            print(f"[ERROR] {name} must be greater than 0.")
+            sys.exit(1)
+
+    if args.max_ops is None and max_mb is None and not args.low_priority:
+        return use(None)
+
+    throttle = Throttle(args.max_ops, max_mb)
+    if args.low_priority:
+        throttle.priority = lower_priority()
+    return use(throttle)
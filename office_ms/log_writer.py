@@ -0,0 +1,282 @@
+"""
+==================================================
+Log Writer
+==================================================
+
+- 各工具共用的 log 寫入元件
+- 每個 log 檔在同一個行程中只開啟一次，訊息累積後批次寫出，
+  取代「每則訊息開檔、寫一行、關檔」
+- 行程結束時（atexit）寫出剩餘內容並 fsync，確保紀錄落地
+- log 超過大小上限或跨月時，輪替成獨立的分段檔，並在索引檔記錄每段的時間範圍，
+  讀取端可只讀取需要的分段，不必讀完整個歷史
+
+檔案配置（以 daily_snapshot.log 為例）：
+    daily_snapshot.log                          目前寫入中的分段
+    daily_snapshot.2026-09-01_08-00-00.log      已輪替的分段（檔名為該段第一筆的時間）
+    daily_snapshot.log.index                    分段索引，每行一個 JSON：
+        {"file": ..., "first": ..., "last": ..., "bytes": ...}
+
+注意事項：
+- 只附加、只改名，不刪除任何分段
+- 輪替為盡力而為：其他行程正開著檔案（Windows）導致改名失敗時，沿用目前分段，下次再試
+- 行程被強制終止（kill -9、工作管理員結束工作）時，尚未寫出的最後幾行會遺失
+"""
+
+import os
+import json
+import time
+import atexit
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO
+
+# 目前分段超過此大小即輪替
+LOG_SEGMENT_BYTES = 1024 * 1024
+
+# 累積滿此行數，或距上次寫出超過此秒數，即寫出
+LOG_BATCH_LINES = 200
+LOG_FLUSH_SECONDS = 5.0
+
+INDEX_SUFFIX = ".index"
+SEGMENT_STAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+
+class Segment(NamedTuple):
+    path: str
+    first: Optional[datetime]
+    last: Optional[datetime]
+
+
+def parse_line_time(line: str) -> Optional[datetime]:
+    """
+    解析 "[2026-01-05 18:00:00.123456] ..." 開頭的時間；沒有時間前綴時回傳 None。
+    """
+    if not line.startswith("["):
+        return None
+    end = line.find("]")
+    if end < 0:
+        return None
+    try:
+        return datetime.fromisoformat(line[1:end])
+    except ValueError:
+        return None
+
+
+def parse_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def segment_name(path: str, stamp: datetime) -> str:
+    stem, ext = os.path.splitext(path)
+    base = f"{stem}.{stamp.strftime(SEGMENT_STAMP_FORMAT)}"
+    candidate = f"{base}{ext}"
+    n = 1
+    while os.path.exists(candidate):
+        candidate = f"{base}_{n}{ext}"
+        n += 1
+    return candidate
+
+
+class SegmentedLog:
+    """
+    單一 log 檔的批次寫入器。
+    timestamp=True 時每行自動加上 "[時間] " 前綴（與原本各工具的 log 格式相同）。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        timestamp: bool = True,
+        segment_bytes: int = LOG_SEGMENT_BYTES,
+        batch_lines: int = LOG_BATCH_LINES,
+        flush_seconds: float = LOG_FLUSH_SECONDS,
+    ) -> None:
+        self.path = path
+        self.timestamp = timestamp
+        self.segment_bytes = segment_bytes
+        self.batch_lines = batch_lines
+        self.flush_seconds = flush_seconds
+
+        self.pending: List[str] = []
+        # 閒置後的第一則訊息立即寫出，只有連續大量訊息才會累積
+        self.last_flush = float("-inf")
+        self.handle: Optional[TextIO] = None
+        self.period = ""
+
+    def write(self, msg: str) -> None:
+        if self.timestamp:
+            msg = f"[{datetime.now()}] {msg}"
+        self.pending.append(msg + "\n")
+
+        if (
+            len(self.pending) >= self.batch_lines
+            or time.monotonic() - self.last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self, sync: bool = False) -> None:
+        if self.pending:
+            self._rotate_if_due()
+            if self.handle is None:
+                self.handle = open(self.path, "a", encoding="utf-8")
+            self.handle.write("".join(self.pending))
+            self.pending.clear()
+            self.handle.flush()
+
+        if sync and self.handle is not None:
+            os.fsync(self.handle.fileno())
+
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush(sync=True)
+        self._close_handle()
+
+    def _rotate_if_due(self) -> None:
+        now = datetime.now().strftime("%Y-%m")
+
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            # 其他行程已將分段輪替走，重新開啟目前的 log 檔
+            self._close_handle()
+            self.period = now
+            return
+
+        if self.handle is not None:
+            opened = os.fstat(self.handle.fileno())
+            if (opened.st_dev, opened.st_ino) != (st.st_dev, st.st_ino):
+                # 開著的是已被其他行程輪替的分段，改寫入目前的 log 檔
+                self._close_handle()
+
+        if not self.period:
+            self.period = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m")
+
+        if st.st_size < self.segment_bytes and self.period == now:
+            return
+
+        if st.st_size > 0:
+            self._rotate(st)
+        self.period = now
+
+    def _close_handle(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def _rotate(self, st: os.stat_result) -> None:
+        self._close_handle()
+
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            first = parse_line_time(f.readline())
+        last = datetime.fromtimestamp(st.st_mtime)
+        target = segment_name(self.path, first or last)
+
+        try:
+            os.rename(self.path, target)
+        except OSError:
+            # 其他行程已輪替（檔案不存在），或正開著檔案（Windows）；沿用目前分段
+            return
+
+        record = {
+            "file": os.path.basename(target),
+            "first": first.isoformat() if first else None,
+            "last": last.isoformat(),
+            "bytes": st.st_size,
+        }
+        with open(self.path + INDEX_SUFFIX, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+_writers: Dict[str, SegmentedLog] = {}
+
+
+def get_writer(path: str, timestamp: bool = True) -> SegmentedLog:
+    """
+    同一行程中同一個 log 檔只建立一個寫入器。
+    """
+    key = os.path.abspath(path)
+    writer = _writers.get(key)
+    if writer is None:
+        writer = SegmentedLog(path, timestamp=timestamp)
+        _writers[key] = writer
+    return writer
+
+
+def flush_all() -> None:
+    for writer in _writers.values():
+        writer.flush()
+
+
+@atexit.register
+def close_all() -> None:
+    for writer in _writers.values():
+        try:
+            writer.close()
+        except OSError:
+            pass
+
+
+# ===== 讀取端 =====
+
+def segments(path: str) -> List[Segment]:
+    """
+    依時間先後列出所有分段，最後一個為目前寫入中的分段。
+    沒有索引檔（從未輪替）時只有目前分段。
+    """
+    result: List[Segment] = []
+    folder = os.path.dirname(path)
+
+    try:
+        with open(path + INDEX_SUFFIX, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    result.append(Segment(
+                        os.path.join(folder, record["file"]),
+                        parse_iso(record.get("first")),
+                        parse_iso(record.get("last")),
+                    ))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+
+    result.append(Segment(path, None, None))
+    return result
+
+
+def read_lines(path: str, since: Optional[datetime] = None) -> Iterator[str]:
+    """
+    依時間先後逐行讀取 log。
+    指定 since 時，跳過最後一筆早於 since 的分段（不開檔）。
+    """
+    for seg in segments(path):
+        if since is not None and seg.last is not None and seg.last < since:
+            continue
+        try:
+            with open(seg.path, encoding="utf-8", errors="replace") as f:
+                yield from f
+        except FileNotFoundError:
+            continue
+
+
+def tail_lines(path: str, n: int) -> List[str]:
+    """
+    最後 n 行。由最新的分段往回讀，湊滿 n 行即停止。
+    """
+    collected: deque = deque()
+    if n <= 0:
+        return []
+
+    for seg in reversed(segments(path)):
+        try:
+            with open(seg.path, encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            continue
+        collected.extendleft(reversed(lines[-(n - len(collected)):]))
+        if len(collected) >= n:
+            break
+
+    return list(collected)
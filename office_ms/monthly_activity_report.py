@@ -0,0 +1,868 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Monthly Activity Report
+==================================================
+
+- 掃描指定月份的檔案活動
+- 列出該月每日新增 / 修改的檔案
+- 輸出為人類可閱讀的文字報告
+- 亦可指定任意日期區間（--from / --to），依日 / ISO 週 / 月分組
+- 補跑模式（--from-month / --to-month）：單次掃描，逐月輸出報告
+- 長時間掃描可定期保存進度（--checkpoint），中斷後以 --resume 繼續
+- 可同時將活動彙總成 cube（--save-cube），供 office-ms cube 查詢（見 activity_cube.py）
+- 可限制每秒的檔案系統操作數、降低優先權（--max-ops / --low-priority，見 io_throttle.py）
+- 可由每日快照保存的當日活動合併產生（--compose），只補掃缺少的日子（見 activity_partial.py）
+
+注意事項：
+- 本工具為唯讀，不會修改或刪除任何檔案
+- 不依賴 Daily / Weekly 是否曾執行
+- 僅根據檔案系統現況推導
+"""
+
+import io
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, date, time, timedelta
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from . import activity_cube, activity_partial, checkpoint, common, io_throttle, report_renderer, scan_snapshot, stat_backend, walker
+
+LOG_FILE = "monthly_activity_report.log"
+CHECKPOINT_FILE = "monthly_activity_report.checkpoint.json"
+
+INDEX_VERSION = 1
+
+BUCKETS = ("day", "week", "month")
+
+# (rel_path, ctime, mtime, size)
+FileTimes = Tuple[str, float, float, int]
+Activity = Dict[Hashable, Dict[str, List[str]]]
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def month_range(year: int, month: int) -> tuple[date, date]:
+    start = date(year, month, 1)
+    if month == 12:
+        end = date(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end = date(year, month + 1, 1) - timedelta(days=1)
+    return start, end
+
+
+def months_between(first: Tuple[int, int], last: Tuple[int, int]) -> List[Tuple[int, int]]:
+    months = []
+    year, month = first
+    while (year, month) <= last:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def bucket_key(day: date, bucket: str) -> str:
+    """
+    將日期轉為分組鍵：
+    - day   → 2026-01-05
+    - week  → 2026-W02（ISO 週）
+    - month → 2026-01
+    """
+    if bucket == "week":
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if bucket == "month":
+        return f"{day.year}-{day.month:02d}"
+    return day.isoformat()
+
+
+def walk_file_times(
+    base_dir: str,
+    stats: Dict[str, int],
+    relevant: Optional[Callable[[str], bool]] = None,
+    journal: Optional[str] = None,
+    since: Optional[datetime] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    frontier: Optional[walker.Frontier] = None,
+    on_checkpoint: Optional[Callable[[walker.Frontier], None]] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+) -> Iterator[FileTimes]:
+    """
+    走訪資料夾，逐一產出 (相對路徑, ctime, mtime, size)。
+    若給定 relevant，不相關的檔案不會被 stat；
+    寫入索引時則不過濾，讓索引保留完整檔案清單。
+    """
+    for path, stat in common.iter_files(
+        base_dir, log, journal, since, watchdog, relevant, frontier, on_checkpoint,
+        snapshot, save_snapshot,
+    ):
+        stats["scanned"] += 1
+
+        if relevant is not None and not relevant(path):
+            stats["ignored"] += 1
+            continue
+
+        if stat is None:
+            continue
+
+        rel_path = os.path.relpath(path, base_dir)
+        yield rel_path, stat.st_ctime, stat.st_mtime, stat.st_size
+
+
+def parse_index_header(line: str, index_path: str) -> dict:
+    try:
+        header = json.loads(line or "{}")
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("index_version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported index format: {index_path}")
+    return header
+
+
+def read_index_header(index_path: str) -> dict:
+    with open(index_path, "r", encoding="utf-8") as f:
+        return parse_index_header(f.readline(), index_path)
+
+
+def read_index(index_path: str, stats: Dict[str, int]) -> Iterator[FileTimes]:
+    """
+    讀取 metadata 索引（JSON Lines），不走訪檔案系統。
+    第一行為標頭，其餘每行為 [rel_path, ctime, mtime, size]。
+    """
+    with open(index_path, "r", encoding="utf-8") as f:
+        header = parse_index_header(f.readline(), index_path)
+
+        log(
+            f"Reading index {index_path} "
+            f"(folder={header.get('folder')}, generated={header.get('generated')})"
+        )
+
+        for line in f:
+            if not line.strip():
+                continue
+            rel_path, ctime, mtime, size = json.loads(line)
+            stats["scanned"] += 1
+            yield rel_path, ctime, mtime, size
+
+
+def tee_to_index(
+    entries: Iterator[FileTimes],
+    base_dir: str,
+    index_path: str,
+    watchdog: walker.Watchdog,
+) -> Iterator[FileTimes]:
+    """
+    將掃描結果原樣轉交，同時寫入 metadata 索引，供之後的區間查詢免走訪使用。
+    先寫入暫存檔，完整結束後才取代正式檔，避免留下半份索引。
+    有資料夾逾時略過時，索引不完整，不取代正式檔。
+    """
+    tmp_path = index_path + ".tmp"
+    header = {
+        "index_version": INDEX_VERSION,
+        "folder": os.path.abspath(base_dir),
+        "generated": datetime.now().isoformat(),
+    }
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            yield entry
+
+    if watchdog.skipped:
+        os.remove(tmp_path)
+        log(f"Index not written: {len(watchdog.skipped)} folder(s) skipped, index would be incomplete")
+        return
+
+    os.replace(tmp_path, index_path)
+    log(f"Index written: {index_path}")
+
+
+def collect_activity(
+    entries: Iterator[FileTimes],
+    start_day: date,
+    end_day: date,
+    key: Callable[[date], Hashable],
+    relevant: Callable[[str], bool],
+    stats: Dict[str, int],
+    activity: Optional[Activity] = None,
+    cube: Optional[activity_cube.Cube] = None,
+    period: Optional[Callable[[date], Hashable]] = None,
+) -> Activity:
+    """
+    單次走過所有檔案，依建立 / 修改日期放入對應分組。
+    建立日期落在區間內者列為新增，否則修改日期落在區間內者列為修改。
+    給定 period 時（backfill），區間再依 period 切成多段，每段各自判斷：
+    建立與修改落在不同段時，建立的那段列為新增、修改的那段列為修改，與逐段單獨掃描相同。
+    給定 activity 時（續跑），在既有結果上繼續累加；給定 cube 時同時彙總（見 Cube.add_file）。
+    """
+    if activity is None:
+        activity = new_activity()
+
+    for rel_path, ctime, mtime, size in entries:
+        if not relevant(rel_path):
+            stats["ignored"] += 1
+            continue
+
+        created = datetime.fromtimestamp(ctime).date()
+        modified = datetime.fromtimestamp(mtime).date()
+
+        created_in_range = start_day <= created <= end_day
+        if created_in_range:
+            activity[key(created)]["new"].append(rel_path)
+        if start_day <= modified <= end_day and not (
+            created_in_range and (period is None or period(created) == period(modified))
+        ):
+            activity[key(modified)]["modified"].append(rel_path)
+
+        if cube is not None:
+            cube.add_file(rel_path, created, modified, size)
+
+    return activity
+
+
+def new_activity() -> Activity:
+    return defaultdict(lambda: {"new": [], "modified": []})
+
+
+def collect_resumable(
+    base_dir: str,
+    start_day: date,
+    end_day: date,
+    key: Callable[[date], Hashable],
+    relevant: Callable[[str], bool],
+    stats: Dict[str, int],
+    watchdog: walker.Watchdog,
+    progress: checkpoint.Checkpoint,
+    cube: Optional[activity_cube.Cube] = None,
+    period: Optional[Callable[[date], Hashable]] = None,
+) -> Activity:
+    """
+    完整走訪並彙整，與 collect_activity(walk_file_times(...)) 結果相同；
+    走訪期間定期將進度與已彙整的結果寫入 progress，有先前中斷的進度時從該處繼續。
+    分組鍵為日期（date）或字串（週 / 月分組），進度檔中以字串保存。
+    """
+    activity = new_activity()
+    frontier = None
+
+    saved = progress.load()
+    if saved is not None:
+        frontier = saved["frontier"]
+        checkpoint.restore_skipped(watchdog, saved)
+        stats.update(saved["state"]["stats"])
+        for group, is_date, new, modified in saved["state"]["activity"]:
+            group_key = date.fromisoformat(group) if is_date else group
+            activity[group_key] = {"new": new, "modified": modified}
+        if cube is not None:
+            cube.load_rows(saved["state"].get("cube", []))
+
+    def on_checkpoint(pending: walker.Frontier) -> None:
+        if not progress.due():
+            return
+        state = {
+            "stats": stats,
+            "activity": [
+                [str(group), isinstance(group, date), data["new"], data["modified"]]
+                for group, data in activity.items()
+            ],
+        }
+        if cube is not None:
+            state["cube"] = cube.rows()
+        progress.save(pending, watchdog.skipped, state)
+
+    entries = walk_file_times(
+        base_dir, stats, relevant, watchdog=watchdog,
+        frontier=frontier, on_checkpoint=on_checkpoint,
+    )
+    collect_activity(entries, start_day, end_day, key, relevant, stats, activity, cube, period)
+
+    progress.clear()
+    return activity
+
+
+def relevance_filter() -> Callable[[str], bool]:
+    allowed_ext, ignored_ext, ignored_names = common.load_config(log)
+    return lambda name: common.is_relevant_file(name, allowed_ext, ignored_ext, ignored_names)
+
+
+def open_entries(
+    base_dir: str,
+    stats: Dict[str, int],
+    relevant: Callable[[str], bool],
+    index_path: Optional[str] = None,
+    save_index: Optional[str] = None,
+    journal: Optional[str] = None,
+    since: Optional[datetime] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+) -> Iterator[FileTimes]:
+    if index_path:
+        return read_index(index_path, stats)
+
+    if watchdog is None:
+        watchdog = walker.Watchdog()
+
+    if save_index:
+        return tee_to_index(
+            walk_file_times(base_dir, stats, watchdog=watchdog), base_dir, save_index, watchdog
+        )
+
+    return walk_file_times(
+        base_dir, stats, relevant, journal, since, watchdog,
+        snapshot=snapshot, save_snapshot=save_snapshot,
+    )
+
+
+def collect(
+    base_dir: str,
+    start_day: date,
+    end_day: date,
+    key: Callable[[date], Hashable],
+    index_path: Optional[str] = None,
+    save_index: Optional[str] = None,
+    journal: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    progress: Optional[checkpoint.Checkpoint] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+    cube: Optional[activity_cube.Cube] = None,
+    period: Optional[Callable[[date], Hashable]] = None,
+) -> Tuple[Activity, Dict[str, int]]:
+    """
+    依來源（索引、快照、變更日誌、可續跑的完整走訪、一般走訪）取得檔案並彙整。
+    period 見 collect_activity。
+    """
+    stats = {"scanned": 0, "ignored": 0}
+    relevant = relevance_filter()
+
+    if progress is not None:
+        activity = collect_resumable(
+            base_dir, start_day, end_day, key, relevant, stats,
+            watchdog or walker.Watchdog(), progress, cube, period,
+        )
+        return activity, stats
+
+    entries = open_entries(
+        base_dir, stats, relevant, index_path, save_index,
+        journal, datetime.combine(start_day, time.min), watchdog,
+        snapshot, save_snapshot,
+    )
+    activity = collect_activity(entries, start_day, end_day, key, relevant, stats, cube=cube, period=period)
+    return activity, stats
+
+
+def scan_monthly_activity(
+    base_dir: str,
+    year: int,
+    month: int,
+    index_path: Optional[str] = None,
+    save_index: Optional[str] = None,
+    journal: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    progress: Optional[checkpoint.Checkpoint] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+    cube: Optional[activity_cube.Cube] = None,
+) -> Dict[date, Dict[str, List[str]]]:
+    start_day, end_day = month_range(year, month)
+
+    activity, stats = collect(
+        base_dir, start_day, end_day, lambda d: d,
+        index_path, save_index, journal, watchdog, progress,
+        snapshot, save_snapshot, cube,
+    )
+
+    log(
+        f"Scanned={stats['scanned']}, Ignored={stats['ignored']}, "
+        f"Period={start_day}~{end_day}"
+    )
+
+    return activity
+
+
+def scan_range_activity(
+    base_dir: str,
+    start_day: date,
+    end_day: date,
+    bucket: str,
+    index_path: Optional[str] = None,
+    save_index: Optional[str] = None,
+    journal: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    progress: Optional[checkpoint.Checkpoint] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+    cube: Optional[activity_cube.Cube] = None,
+) -> Activity:
+    activity, stats = collect(
+        base_dir, start_day, end_day, lambda d: bucket_key(d, bucket),
+        index_path, save_index, journal, watchdog, progress,
+        snapshot, save_snapshot, cube,
+    )
+
+    log(
+        f"Scanned={stats['scanned']}, Ignored={stats['ignored']}, "
+        f"Period={start_day}~{end_day}, Bucket={bucket}, "
+        f"Source={'index' if index_path else 'walk'}"
+    )
+
+    return activity
+
+
+def scan_backfill_activity(
+    base_dir: str,
+    months: List[Tuple[int, int]],
+    index_path: Optional[str] = None,
+    save_index: Optional[str] = None,
+    journal: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    progress: Optional[checkpoint.Checkpoint] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+    cube: Optional[activity_cube.Cube] = None,
+) -> Dict[Tuple[int, int], Dict[date, Dict[str, List[str]]]]:
+    """
+    單次掃描涵蓋多個月份，再依月份拆分。
+    新增 / 修改依各月份自己的區間判斷（period 為月份），
+    每個月份的結果與單獨執行 scan_monthly_activity 相同。
+    """
+    start_day = month_range(*months[0])[0]
+    end_day = month_range(*months[-1])[1]
+
+    activity, stats = collect(
+        base_dir, start_day, end_day, lambda d: d,
+        index_path, save_index, journal, watchdog, progress,
+        snapshot, save_snapshot, cube, lambda d: (d.year, d.month),
+    )
+
+    per_month: Dict[Tuple[int, int], Dict[date, Dict[str, List[str]]]] = {
+        ym: {} for ym in months
+    }
+    for day, day_data in activity.items():
+        per_month[(day.year, day.month)][day] = day_data
+
+    log(
+        f"Scanned={stats['scanned']}, Ignored={stats['ignored']}, "
+        f"Backfill={start_day}~{end_day}, Months={len(months)}"
+    )
+
+    return per_month
+
+
+def print_breakdown(out, activity: Activity) -> None:
+    for day in sorted(activity.keys()):
+        day_data = activity[day]
+        if not day_data["new"] and not day_data["modified"]:
+            continue
+
+        out.text(str(day))
+        if day_data["new"]:
+            out.text("- New:")
+            for f in sorted(day_data["new"]):
+                out.record(f"  - {f}", "new", date=day, path=f)
+        if day_data["modified"]:
+            out.text("- Modified:")
+            for f in sorted(day_data["modified"]):
+                out.record(f"  - {f}", "modified", date=day, path=f)
+        out.text()
+
+
+def print_summary(out, activity: Activity) -> None:
+    total_new = sum(len(v["new"]) for v in activity.values())
+    total_modified = sum(len(v["modified"]) for v in activity.values())
+    total = total_new + total_modified
+
+    out.field(f"- New files created   : {total_new}", "new_files", total_new)
+    out.field(f"- Files modified      : {total_modified}", "modified_files", total_modified)
+    out.field(f"- Total activity      : {total} files", "total_activity", total)
+    out.text()
+
+
+def print_report(
+    base_dir: str,
+    year: int,
+    month: int,
+    activity: Dict[date, Dict[str, List[str]]],
+    fmt: str = "text",
+    stream: Optional[TextIO] = None,
+    skipped: Sequence[walker.SkippedDir] = (),
+    throttle: Optional[io_throttle.Throttle] = None,
+    composed: Optional[activity_partial.Composed] = None,
+) -> None:
+    start_day, end_day = month_range(year, month)
+
+    with report_renderer.open_renderer(
+        fmt, "monthly_activity", ("date", "path"), stream
+    ) as out:
+        out.text("=" * 45)
+        out.text("Monthly Activity Report")
+        out.field(f"Period : {start_day} ~ {end_day}", "period", f"{start_day}~{end_day}")
+        out.field(f"Folder : {base_dir}", "folder", base_dir)
+        out.text("=" * 45)
+        out.text()
+
+        out.text("[Summary]")
+        print_summary(out, activity)
+
+        out.text("[Daily Breakdown]")
+        out.text()
+
+        print_breakdown(out, activity)
+
+        activity_partial.print_sources(out, composed)
+        io_throttle.print_throttling(out, throttle)
+        walker.print_skipped(out, base_dir, skipped)
+
+        out.text("[Note]")
+        out.text("- This report is read-only.")
+        out.text("- Data is inferred from file timestamps.")
+        out.text("- Creation time semantics may vary by OS.")
+        out.text()
+
+
+def print_range_report(
+    base_dir: str,
+    start_day: date,
+    end_day: date,
+    bucket: str,
+    activity: Activity,
+    fmt: str = "text",
+    skipped: Sequence[walker.SkippedDir] = (),
+    throttle: Optional[io_throttle.Throttle] = None,
+) -> None:
+    with report_renderer.open_renderer(fmt, "activity_range", ("date", "path")) as out:
+        out.text("=" * 45)
+        out.text("Activity Range Report")
+        out.field(f"Period : {start_day} ~ {end_day}", "period", f"{start_day}~{end_day}")
+        out.field(f"Folder : {base_dir}", "folder", base_dir)
+        out.field(f"Bucket : {bucket}", "bucket", bucket)
+        out.text("=" * 45)
+        out.text()
+
+        days = (end_day - start_day).days + 1
+
+        out.text("[Summary]")
+        out.field(f"- Days in period      : {days}", "days_in_period", days)
+        print_summary(out, activity)
+
+        title = {"day": "Daily", "week": "Weekly", "month": "Monthly"}[bucket]
+        out.text(f"[{title} Breakdown]")
+        out.text()
+
+        print_breakdown(out, activity)
+
+        io_throttle.print_throttling(out, throttle)
+        walker.print_skipped(out, base_dir, skipped)
+
+        out.text("[Note]")
+        out.text("- This report is read-only.")
+        out.text("- Data is inferred from file timestamps.")
+        out.text("- Creation time semantics may vary by OS.")
+        out.text("- Weeks follow ISO 8601 numbering (Monday to Sunday).")
+        out.text()
+
+
+def emit_backfill(
+    base_dir: str,
+    per_month: Dict[Tuple[int, int], Dict[date, Dict[str, List[str]]]],
+    archive_name: Optional[str] = None,
+    fmt: str = "text",
+    skipped: Sequence[walker.SkippedDir] = (),
+    throttle: Optional[io_throttle.Throttle] = None,
+) -> None:
+    """
+    逐月輸出報告。
+    指定 archive_name 時，每份月報各自交給 report_archiver 存檔，
+    內容與「月報 | report_archiver」管線產生的檔案相同。
+    """
+    if archive_name:
+        from . import report_archiver
+
+    for (year, month), activity in per_month.items():
+        if not archive_name:
+            print_report(base_dir, year, month, activity, fmt, skipped=skipped, throttle=throttle)
+            continue
+
+        buffer = io.StringIO()
+        print_report(base_dir, year, month, activity, fmt, buffer, skipped, throttle)
+
+        path = report_archiver.archive_report(archive_name, buffer.getvalue())
+        print(f"[OK] {year}-{month:02d} archived at: {path}")
+
+
+def scan_identity(base_dir: str, mode: str, *params: object, cube: bool = False) -> dict:
+    """
+    進度檔的掃描識別；資料夾、模式、期間或是否彙總 cube 不同時不沿用既有進度。
+    """
+    identity = {
+        "report": "monthly_activity",
+        "folder": os.path.abspath(base_dir),
+        "mode": mode,
+        "params": list(params),
+    }
+    if cube:
+        identity["cube"] = True
+    return identity
+
+
+def new_cube(
+    args: argparse.Namespace,
+    base_dir: str,
+    start_day: date,
+    end_day: date,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+) -> Optional[activity_cube.Cube]:
+    if not args.save_cube:
+        return None
+    # 由快照產生時，cube 的時間點為快照建立的時間
+    generated = snapshot.generated if snapshot is not None else None
+    return activity_cube.Cube(os.path.abspath(base_dir), start_day, end_day, generated)
+
+
+def parse_month(value: str) -> Tuple[int, int]:
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        print(f"[ERROR] Invalid month: {value} (expected YYYY-MM)")
+        sys.exit(1)
+    return parsed.year, parsed.month
+
+
+def parse_day(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        print(f"[ERROR] Invalid date: {value} (expected YYYY-MM-DD)")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms monthly <folder_path> <year> <month> [--compose <report_name>]\n"
+            "       office-ms monthly <folder_path> "
+            "--from YYYY-MM-DD --to YYYY-MM-DD [--bucket day|week|month]\n"
+            "       office-ms monthly <folder_path> "
+            "--from-month YYYY-MM --to-month YYYY-MM [--archive <report_name>]\n"
+            "       (all modes accept --format text|jsonl|csv, "
+            "--dir-timeout <seconds>, --total-timeout <seconds>,\n"
+            "        --stat-backend auto|statx|os, --checkpoint [<file>], --resume, "
+            "--save-snapshot <file>, --from-snapshot <file>,\n"
+            "        --save-cube <dir>, --max-ops <per_second> and --low-priority)"
+        )
+    )
+    parser.add_argument("folder_path")
+    parser.add_argument("year", nargs="?", type=int)
+    parser.add_argument("month", nargs="?", type=int)
+    parser.add_argument("--from", dest="date_from", help="range start (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="range end (YYYY-MM-DD)")
+    parser.add_argument("--bucket", choices=BUCKETS, default="day")
+    parser.add_argument("--from-month", help="backfill start month (YYYY-MM)")
+    parser.add_argument("--to-month", help="backfill end month (YYYY-MM)")
+    parser.add_argument("--archive", help="archive each backfilled month under this report name")
+    parser.add_argument("--index", help="answer from a saved metadata index, no walk")
+    parser.add_argument("--save-index", help="write a metadata index while scanning")
+    parser.add_argument("--journal", help="build the report from a change journal")
+    parser.add_argument(
+        "--compose",
+        help="merge the daily partials archived under this report name; scan only days without one",
+    )
+    parser.add_argument("--save-cube", help="also save an activity cube (day x extension x folder) in this folder")
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    walker.add_timeout_arguments(parser)
+    stat_backend.add_stat_arguments(parser)
+    io_throttle.add_throttle_arguments(parser)
+    checkpoint.add_checkpoint_arguments(parser, CHECKPOINT_FILE)
+    scan_snapshot.add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    watchdog = walker.watchdog_from_args(args)
+    stat_backend.backend_from_args(args)
+    throttle = io_throttle.throttle_from_args(args)
+
+    base_dir = args.folder_path
+    range_mode = args.date_from is not None or args.date_to is not None
+    backfill_mode = args.from_month is not None or args.to_month is not None
+
+    if [range_mode, backfill_mode, args.year is not None].count(True) != 1:
+        parser.print_usage()
+        sys.exit(1)
+
+    if args.archive is not None and not backfill_mode:
+        print("[ERROR] --archive is only available in backfill mode.")
+        sys.exit(1)
+
+    if args.archive is not None and args.format != "text":
+        print("[ERROR] --archive only stores text reports.")
+        sys.exit(1)
+
+    compose_name = activity_partial.report_name_from_args(args.compose)
+    if compose_name and (range_mode or backfill_mode):
+        print("[ERROR] --compose is only available for a single month (<year> <month>).")
+        sys.exit(1)
+
+    if compose_name and (
+        args.index or args.save_index or args.journal or args.checkpoint or args.resume
+        or args.save_snapshot or args.from_snapshot or args.save_cube
+    ):
+        print(
+            "[ERROR] --compose cannot be combined with --index, --save-index, --journal, "
+            "--checkpoint, --resume, --save-snapshot, --from-snapshot or --save-cube."
+        )
+        sys.exit(1)
+
+    if args.index and args.save_index:
+        print("[ERROR] --index and --save-index cannot be used together.")
+        sys.exit(1)
+
+    if args.journal and (args.index or args.save_index):
+        print("[ERROR] --journal cannot be combined with --index or --save-index.")
+        sys.exit(1)
+
+    if (args.checkpoint or args.resume) and (args.index or args.save_index or args.journal):
+        print("[ERROR] --checkpoint / --resume cannot be combined with --index, --save-index or --journal.")
+        sys.exit(1)
+
+    if (args.save_snapshot or args.from_snapshot) and (
+        args.index or args.save_index or args.journal or args.checkpoint or args.resume
+    ):
+        print(
+            "[ERROR] --save-snapshot / --from-snapshot cannot be combined with "
+            "--index, --save-index, --journal, --checkpoint or --resume."
+        )
+        sys.exit(1)
+
+    if args.index:
+        if not os.path.isfile(args.index):
+            print("[ERROR] Index file not found.")
+            sys.exit(1)
+        try:
+            header = read_index_header(args.index)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        folder = os.path.abspath(base_dir)
+        if os.path.normcase(str(header.get("folder"))) != os.path.normcase(folder):
+            print(f"[ERROR] Index is of a different folder: {header.get('folder')} (expected {folder})")
+            sys.exit(1)
+    elif not args.from_snapshot and not os.path.isdir(base_dir):
+        print("[ERROR] Folder not found.")
+        sys.exit(1)
+
+    snapshot = scan_snapshot.snapshot_from_args(args, log, base_dir)
+    save_snapshot = scan_snapshot.writer_from_args(args, base_dir)
+
+    if backfill_mode:
+        if args.from_month is None or args.to_month is None:
+            print("[ERROR] Both --from-month and --to-month are required.")
+            sys.exit(1)
+
+        first = parse_month(args.from_month)
+        last = parse_month(args.to_month)
+
+        if first > last:
+            print("[ERROR] --from-month must not be later than --to-month.")
+            sys.exit(1)
+
+        if args.archive is not None and not args.archive.strip():
+            print("[ERROR] Report name cannot be empty.")
+            sys.exit(1)
+
+        months = months_between(first, last)
+        cube = new_cube(args, base_dir, month_range(*months[0])[0], month_range(*months[-1])[1], snapshot)
+        progress = checkpoint.checkpoint_from_args(
+            args, CHECKPOINT_FILE,
+            scan_identity(base_dir, "backfill", args.from_month, args.to_month, cube=cube is not None), log,
+        )
+        per_month = scan_backfill_activity(
+            base_dir, months,
+            args.index, args.save_index, args.journal, watchdog, progress,
+            snapshot, save_snapshot, cube,
+        )
+        if cube is not None:
+            activity_cube.save(cube, args.save_cube, watchdog)
+        emit_backfill(
+            base_dir, per_month, args.archive and args.archive.strip(), args.format,
+            watchdog.skipped, throttle,
+        )
+        return
+
+    if range_mode:
+        if args.date_from is None or args.date_to is None:
+            print("[ERROR] Both --from and --to are required.")
+            sys.exit(1)
+
+        start_day = parse_day(args.date_from)
+        end_day = parse_day(args.date_to)
+
+        if start_day > end_day:
+            print("[ERROR] --from must not be later than --to.")
+            sys.exit(1)
+
+        cube = new_cube(args, base_dir, start_day, end_day, snapshot)
+        progress = checkpoint.checkpoint_from_args(
+            args, CHECKPOINT_FILE,
+            scan_identity(
+                base_dir, "range", str(start_day), str(end_day), args.bucket, cube=cube is not None,
+            ),
+            log,
+        )
+        activity = scan_range_activity(
+            base_dir, start_day, end_day, args.bucket,
+            args.index, args.save_index, args.journal, watchdog, progress,
+            snapshot, save_snapshot, cube,
+        )
+        if cube is not None:
+            activity_cube.save(cube, args.save_cube, watchdog)
+        print_range_report(
+            base_dir, start_day, end_day, args.bucket, activity, args.format,
+            watchdog.skipped, throttle,
+        )
+        return
+
+    if args.month is None:
+        parser.print_usage()
+        sys.exit(1)
+
+    if args.month < 1 or args.month > 12:
+        print("[ERROR] Month must be 1-12.")
+        sys.exit(1)
+
+    if compose_name:
+        start_day, end_day = month_range(args.year, args.month)
+        # 尚未到來的日子沒有活動，不讀取也不補掃
+        last_day = min(end_day, date.today())
+        days = [start_day + timedelta(days=i) for i in range((last_day - start_day).days + 1)]
+        activity, composed = activity_partial.compose_activity(compose_name, base_dir, days, watchdog)
+        print_report(
+            base_dir, args.year, args.month, activity, args.format,
+            skipped=watchdog.skipped, throttle=throttle, composed=composed,
+        )
+        return
+
+    cube = new_cube(args, base_dir, *month_range(args.year, args.month), snapshot)
+    progress = checkpoint.checkpoint_from_args(
+        args, CHECKPOINT_FILE,
+        scan_identity(base_dir, "month", args.year, args.month, cube=cube is not None), log,
+    )
+    activity = scan_monthly_activity(
+        base_dir, args.year, args.month,
+        args.index, args.save_index, args.journal, watchdog, progress,
+        snapshot, save_snapshot, cube,
+    )
+    if cube is not None:
+        activity_cube.save(cube, args.save_cube, watchdog)
+    print_report(
+        base_dir, args.year, args.month, activity, args.format,
+        skipped=watchdog.skipped, throttle=throttle,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Report Archiver
+==================================================
+
+- 從 STDIN 接收文字報告
+- 依照報告類型與時間（精確到微秒），自動存檔；多個行程同時存檔也不會互相覆寫
+- 不解析、不修改、不理解內容
+- 存檔時記錄報告的標頭與 [Summary] 數值（見 report_summary.py）
+- 存檔後將報告中的路徑加入搜尋索引（見 report_index.py）；
+  索引只讀取已存檔的副本，失敗或索引忙碌時不影響存檔
+
+使用方式：
+office-ms <report> ... | office-ms archive <report_name>
+
+其他工具亦可直接呼叫 archive_report()，存檔規則完全相同。
+"""
+
+import sys
+import os
+import threading
+from datetime import datetime
+
+BASE_REPORT_DIR = "reports"
+
+
+def publish(tmp_path: str, report_path: str) -> bool:
+    """
+    以獨佔方式將已寫好的暫存檔發布為 report_path；名稱已被使用時回傳 False。
+    hard link 不會取代既有檔案，其他行程也看不到寫到一半的報告。
+    """
+    try:
+        os.link(tmp_path, report_path)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:
+        # 不支援 hard link 的檔案系統（FAT、部分網路磁碟）：改以獨佔模式直接寫入
+        pass
+
+    try:
+        with open(report_path, "xb") as dst, open(tmp_path, "rb") as src:
+            dst.write(src.read())
+        return True
+    except FileExistsError:
+        return False
+
+
+def archive_report(
+    report_name: str,
+    content: str,
+    base_dir: str = BASE_REPORT_DIR,
+) -> str:
+    """
+    將報告內容寫入 reports/<report_name>/<timestamp>_<微秒>.txt，回傳檔案路徑。
+
+    先寫入暫存檔，再以獨佔方式發布，絕不覆寫既有報告；
+    同一微秒內重複存檔（多個行程同時存檔）時，序號往後遞增直到名稱可用。
+    寫入完成後記錄摘要，並加入搜尋索引。
+    """
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+
+    report_dir = os.path.join(base_dir, report_name)
+    os.makedirs(report_dir, exist_ok=True)
+
+    # 以 . 開頭，list_reports 不會列出
+    tmp_path = os.path.join(report_dir, f".archive.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+    try:
+        seq = now.microsecond
+        while True:
+            report_path = os.path.join(report_dir, f"{timestamp}_{seq:06d}.txt")
+            if publish(tmp_path, report_path):
+                break
+            seq += 1
+    finally:
+        os.remove(tmp_path)
+
+    from . import report_index, report_summary
+
+    report_summary.record_archived(report_path, content)
+    report_index.index_archived(base_dir, report_name, report_path)
+    return report_path
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        print("Usage: office-ms archive <report_name>")
+        sys.exit(1)
+
+    report_name = sys.argv[1].strip()
+    if not report_name:
+        print("[ERROR] Report name cannot be empty.")
+        sys.exit(1)
+
+    content = sys.stdin.read()
+    if not content.strip():
+        print("[ERROR] No input received from STDIN.")
+        sys.exit(1)
+
+    report_path = archive_report(report_name, content)
+
+    print(f"[OK] Report archived at: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
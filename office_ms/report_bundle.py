@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Report Bundle
+==================================================
+
+- 將 reports/<report_name>/ 中超過指定天數的報告，依月份壓縮成一個 bundle
+  （<YYYY-MM>.bundle.zip），資料夾內的檔案數不再無限增加
+- bundle 為標準 ZIP：中央目錄即成員索引，可直接讀取其中一份報告，不需解開整包
+- 成員內容與原始報告逐位元組相同；寫入後逐一比對成功，才刪除原始檔
+- 讀取端（inventory、diff、anomaly、搜尋索引）透過 list_reports / open_report
+  同時看到資料夾中的報告與 bundle 中的報告，不必知道報告是否已壓縮
+
+使用方式：
+office-ms compact [report_name] [--reports-dir <dir>] [--older-than <days>]
+
+注意事項：
+- 只壓縮檔名為 report_archiver 時間格式（YYYY-MM-DD_HH-MM-SS[_n].txt，_n 為微秒或同秒序號）的報告
+- 同一月份再次壓縮時，併入既有 bundle（先寫入暫存檔，完成後才取代）
+- 任何 ZIP 工具都能解開 bundle，取回原始報告
+"""
+
+import io
+import os
+import sys
+import shutil
+import argparse
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from . import common
+
+LOG_FILE = "report_bundle.log"
+BASE_REPORT_DIR = "reports"
+
+BUNDLE_SUFFIX = ".bundle.zip"
+DEFAULT_OLDER_THAN_DAYS = 90
+
+# 同一時間只允許一個壓縮作業；鎖定檔放在 reports/ 根目錄，不會被當成報告列出
+LOCK_FILE = ".compact.lock"
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def archive_time(name: str) -> Optional[datetime]:
+    stamp = common.archive_sort_key(name)[0]
+    try:
+        return datetime.strptime(stamp, "%Y-%m-%d_%H-%M-%S")
+    except ValueError:
+        return None
+
+
+def bundle_path(report_dir: str, month: str) -> str:
+    return os.path.join(report_dir, f"{month}{BUNDLE_SUFFIX}")
+
+
+def is_bundle_file(name: str) -> bool:
+    # 包含壓縮途中留下的暫存檔（<month>.bundle.zip.<pid>.tmp）
+    return BUNDLE_SUFFIX in name
+
+
+def bundle_members(path: str) -> List[str]:
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return zf.namelist()
+    except (OSError, zipfile.BadZipFile) as e:
+        log(f"Unreadable bundle {path}. Error: {e}")
+        return []
+
+
+def list_reports(report_dir: str) -> List[str]:
+    """
+    列出 report_dir 中的報告檔名：資料夾中的檔案加上各 bundle 的成員（不含 bundle 本身）。
+    """
+    names = set()
+    for name in os.listdir(report_dir):
+        path = os.path.join(report_dir, name)
+        # 以 . 開頭為存檔途中的暫存檔
+        if name.startswith(".") or not os.path.isfile(path):
+            continue
+        if name.endswith(BUNDLE_SUFFIX):
+            names.update(bundle_members(path))
+        elif not is_bundle_file(name):
+            names.add(name)
+    return sorted(names)
+
+
+@contextmanager
+def open_report(path: str) -> Iterator[TextIO]:
+    """
+    以文字模式開啟報告（UTF-8，無法解碼的位元組以替代字元表示）。
+    檔案已被壓縮時，改由該月份的 bundle 讀取，路徑寫法不變。
+    """
+    try:
+        f = open(path, encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        report_dir, name = os.path.split(path)
+        stamp = archive_time(name)
+        if stamp is None:
+            raise
+        bundle = bundle_path(report_dir, stamp.strftime("%Y-%m"))
+        try:
+            zf = zipfile.ZipFile(bundle)
+        except (FileNotFoundError, zipfile.BadZipFile):
+            raise FileNotFoundError(f"Report not found: {path}")
+        try:
+            member = zf.open(name)
+        except KeyError:
+            zf.close()
+            raise FileNotFoundError(f"Report not found: {path}")
+        with zf, io.TextIOWrapper(member, encoding="utf-8", errors="replace") as text:
+            yield text
+        return
+
+    with f:
+        yield f
+
+
+def pack_month(report_dir: str, month: str, names: List[str]) -> int:
+    """
+    將 names 併入該月份的 bundle，回傳已壓縮（並已刪除原始檔）的報告數。
+    bundle 中已有同名成員時：內容相同即視為已壓縮（上次在刪除前中斷），不同則保留原始檔。
+    """
+    bundle = bundle_path(report_dir, month)
+    tmp_path = f"{bundle}.{os.getpid()}.tmp"
+
+    if os.path.isfile(bundle):
+        shutil.copyfile(bundle, tmp_path)
+        mode = "a"
+    else:
+        mode = "w"
+
+    packed: List[str] = []
+    try:
+        with zipfile.ZipFile(tmp_path, mode, compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+            present = set(zf.namelist())
+            for name in names:
+                path = os.path.join(report_dir, name)
+                with open(path, "rb") as f:
+                    data = f.read()
+
+                if name in present:
+                    if zf.read(name) == data:
+                        packed.append(name)
+                    else:
+                        log(f"{bundle} already has a different {name}. Keeping the original file.")
+                    continue
+
+                info = zipfile.ZipInfo(name, archive_time(name).timetuple()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, data, compresslevel=9)
+                packed.append(name)
+
+        # 重新開啟，逐一與原始檔比對後才刪除原始檔
+        with zipfile.ZipFile(tmp_path) as zf:
+            for name in packed:
+                with open(os.path.join(report_dir, name), "rb") as f:
+                    if zf.read(name) != f.read():
+                        raise ValueError(f"Bundle verification failed for {name}")
+
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, bundle)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    for name in packed:
+        os.remove(os.path.join(report_dir, name))
+    return len(packed)
+
+
+def compact_reports(report_dir: str, cutoff: datetime) -> List[Tuple[str, int]]:
+    """
+    壓縮 report_dir 中早於 cutoff 的報告；回傳 [(bundle 路徑, 壓縮份數), ...]。
+    """
+    by_month: Dict[str, List[str]] = {}
+    for name in os.listdir(report_dir):
+        if not name.endswith(".txt"):
+            continue
+        stamp = archive_time(name)
+        if stamp is None or stamp >= cutoff:
+            continue
+        by_month.setdefault(stamp.strftime("%Y-%m"), []).append(name)
+
+    results = []
+    for month, names in sorted(by_month.items()):
+        names.sort(key=common.archive_sort_key)
+        count = pack_month(report_dir, month, names)
+        results.append((bundle_path(report_dir, month), count))
+        log(f"Packed {count} report(s) into {bundle_path(report_dir, month)}")
+    return results
+
+
+@contextmanager
+def compaction_lock(base_dir: str) -> Iterator[None]:
+    path = os.path.join(base_dir, LOCK_FILE)
+    try:
+        with open(path, "x", encoding="utf-8") as f:
+            f.write(f"{os.getpid()} {datetime.now().isoformat()}\n")
+    except FileExistsError:
+        print(f"[ERROR] Another compaction is running (remove {path} if it is not).")
+        sys.exit(1)
+    try:
+        yield
+    finally:
+        os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage="office-ms compact [report_name] [--reports-dir <dir>] [--older-than <days>]"
+    )
+    parser.add_argument("report_name", nargs="?", help="only compact this report type")
+    parser.add_argument("--reports-dir", default=BASE_REPORT_DIR)
+    parser.add_argument(
+        "--older-than", type=int, default=DEFAULT_OLDER_THAN_DAYS,
+        help=f"compact reports archived more than this many days ago (default {DEFAULT_OLDER_THAN_DAYS})",
+    )
+    args = parser.parse_args()
+
+    if args.older_than < 1:
+        print("[ERROR] --older-than must be at least 1.")
+        sys.exit(1)
+
+    if not os.path.isdir(args.reports_dir):
+        print("[ERROR] Report folder not found.")
+        sys.exit(1)
+
+    if args.report_name:
+        report_names = [args.report_name.strip()]
+        if not os.path.isdir(os.path.join(args.reports_dir, report_names[0])):
+            print("[ERROR] Report folder not found.")
+            sys.exit(1)
+    else:
+        report_names = sorted(
+            name for name in os.listdir(args.reports_dir)
+            if os.path.isdir(os.path.join(args.reports_dir, name))
+        )
+
+    # 以日期為界（不含當天時刻），同一天執行多次的結果相同
+    cutoff = datetime.combine(datetime.now().date() - timedelta(days=args.older_than), datetime.min.time())
+
+    total = 0
+    with compaction_lock(args.reports_dir):
+        for report_name in report_names:
+            for bundle, count in compact_reports(os.path.join(args.reports_dir, report_name), cutoff):
+                print(f"[OK] {count} report(s) packed into {bundle}")
+                total += count
+
+    if not total:
+        print(f"[OK] No reports older than {args.older_than} day(s) to compact.")
+    log(f"Compaction finished: {args.reports_dir} (older than {args.older_than} days, packed={total})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Report Diff
+==================================================
+
+- 比較同一類型中「最新一份」與「前一份」已歸檔報告
+- 逐一列出兩份報告的路徑區段中新增、消失、變更的項目
+- 以排序合併（sorted merge）串流比對，記憶體用量有上限
+
+注意事項：
+- 本工具為唯讀，不會修改或刪除任何報告
+- 僅比對報告文字本身，不重新掃描資料夾
+- 「消失」代表不再出現在報告中，不代表檔案已被刪除
+"""
+
+import os
+import re
+import sys
+import json
+import heapq
+import argparse
+import tempfile
+from typing import IO, Iterator, List, Optional, Tuple
+
+from . import common, report_bundle, report_renderer
+
+LOG_FILE = "report_diff.log"
+BASE_REPORT_DIR = "reports"
+
+# 單一報告超過此筆數時，分段排序後寫入暫存檔，再以 heap 合併
+CHUNK_ENTRIES = 200_000
+
+# 不含路徑的區段（報告的統計與執行資訊）
+SKIPPED_SECTIONS = {"Summary", "Note", "Throttling", "Sources", "Estimated Summary", "Sampling"}
+
+SECTION_RE = re.compile(r"^\[(.+)\]$")
+ENTRY_RE = re.compile(r"^(  )?- (.*)$")
+SUBHEADER_RE = re.compile(r"^- (New|Modified):$")
+COUNT_RE = re.compile(r"^- Count: \d+$")
+DUPLICATE_GROUP_RE = re.compile(r"^- \d+ copies x .+ MB$")
+
+# 報告在路徑後附加的說明，例如 (12.3 MB)、(last modified: 2025-01-01)
+ANNOTATION_RE = re.compile(
+    r"^(.*) \((\d+\.\d MB(?:, \d+ files)?"
+    r"|last modified: \d{4}-\d{2}-\d{2}"
+    r"|no response after [\d.]+s|total time budget \([\d.]+s\) exhausted"
+    r"|\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\)$"
+)
+
+# ((section, path), detail)
+Entry = Tuple[Tuple[str, str], str]
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def pick_archives(report_dir: str, current: Optional[str] = None) -> Tuple[str, str]:
+    names = sorted(
+        (n for n in report_bundle.list_reports(report_dir) if n.endswith(".txt")),
+        key=common.archive_sort_key,
+    )
+
+    if current is None:
+        if len(names) < 2:
+            raise ValueError("Need at least two archived reports to compare.")
+        return (
+            os.path.join(report_dir, names[-2]),
+            os.path.join(report_dir, names[-1]),
+        )
+
+    current_name = os.path.basename(current)
+    if current_name not in names:
+        raise ValueError(f"Archive not found: {current_name}")
+
+    index = names.index(current_name)
+    if index == 0:
+        raise ValueError(f"No archive precedes {current_name}.")
+
+    return (
+        os.path.join(report_dir, names[index - 1]),
+        os.path.join(report_dir, current_name),
+    )
+
+
+def iter_entries(path: str) -> Iterator[Entry]:
+    """
+    逐行解析報告中的路徑區段，產出 ((區段, 路徑), 說明)。
+    說明包含所屬日期 / 週 / 月、New / Modified，以及路徑後的附註。
+    """
+    section = ""
+    group = ""
+    sub = ""
+
+    with report_bundle.open_report(path) as f:
+        for raw in f:
+            line = raw.rstrip("\r\n")
+            if not line:
+                continue
+
+            match = SECTION_RE.match(line)
+            if match:
+                section, group, sub = match.group(1), "", ""
+                continue
+
+            if not section or section in SKIPPED_SECTIONS:
+                continue
+
+            match = SUBHEADER_RE.match(line)
+            if match:
+                sub = match.group(1)
+                continue
+
+            if COUNT_RE.match(line):
+                continue
+
+            if DUPLICATE_GROUP_RE.match(line):
+                group, sub = line[2:], ""
+                continue
+
+            match = ENTRY_RE.match(line)
+            if not match:
+                # 非清單行：週報 / 月報中的日期（或週、月）分組標題
+                group, sub = line, ""
+                continue
+
+            item = match.group(2)
+            note = ""
+            annotated = ANNOTATION_RE.match(item)
+            if annotated:
+                item, note = annotated.group(1), annotated.group(2)
+
+            detail = " ".join(part for part in (group, sub, note) if part)
+            yield (section, item), detail
+
+
+def spill(chunk: List[Entry]) -> IO[str]:
+    chunk.sort()
+    f = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for (section, item), detail in chunk:
+        f.write(json.dumps([section, item, detail], ensure_ascii=False) + "\n")
+    f.seek(0)
+    return f
+
+
+def read_spilled(f: IO[str]) -> Iterator[Entry]:
+    for line in f:
+        section, item, detail = json.loads(line)
+        yield (section, item), detail
+
+
+def sorted_entries(path: str) -> Iterator[Entry]:
+    """
+    依 (區段, 路徑) 排序後逐筆產出。
+    部分區段（例如 Large Files 依大小排序）不是依路徑排列，
+    因此先分段排序；超過 CHUNK_ENTRIES 筆時寫入暫存檔再合併，記憶體用量維持固定上限。
+    """
+    chunk: List[Entry] = []
+    spilled: List[IO[str]] = []
+
+    for entry in iter_entries(path):
+        chunk.append(entry)
+        if len(chunk) >= CHUNK_ENTRIES:
+            spilled.append(spill(chunk))
+            chunk = []
+
+    if not spilled:
+        chunk.sort()
+        yield from chunk
+        return
+
+    if chunk:
+        spilled.append(spill(chunk))
+
+    try:
+        yield from heapq.merge(*(read_spilled(f) for f in spilled))
+    finally:
+        for f in spilled:
+            f.close()
+
+
+def diff_entries(
+    old: Iterator[Entry],
+    new: Iterator[Entry],
+) -> Iterator[Tuple[str, Tuple[str, str], str, str]]:
+    """
+    兩個已排序串流的合併比對，線性時間。
+    產出 (kind, (區段, 路徑), 舊說明, 新說明)，kind 為 added / removed / changed。
+    """
+    sentinel = object()
+    a = next(old, sentinel)
+    b = next(new, sentinel)
+
+    while a is not sentinel or b is not sentinel:
+        if b is sentinel or (a is not sentinel and a[0] < b[0]):
+            yield "removed", a[0], a[1], ""
+            a = next(old, sentinel)
+        elif a is sentinel or b[0] < a[0]:
+            yield "added", b[0], "", b[1]
+            b = next(new, sentinel)
+        else:
+            if a[1] != b[1]:
+                yield "changed", a[0], a[1], b[1]
+            a = next(old, sentinel)
+            b = next(new, sentinel)
+
+
+def describe(item: str, detail: str) -> str:
+    return f"{item} ({detail})" if detail else item
+
+
+def print_report(
+    report_name: str,
+    previous: str,
+    current: str,
+    fmt: str = "text",
+) -> None:
+    counts = {"added": 0, "removed": 0, "changed": 0}
+    columns = ("report_section", "path", "before", "after")
+
+    with report_renderer.open_renderer(fmt, "report_diff", columns) as out:
+        out.text("=" * 40)
+        out.text("Report Diff")
+        out.field(f"Report   : {report_name}", "report", report_name)
+        out.field(f"Previous : {os.path.basename(previous)}", "previous", os.path.basename(previous))
+        out.field(f"Current  : {os.path.basename(current)}", "current", os.path.basename(current))
+        out.text("=" * 40)
+        out.text()
+
+        out.text("[Changes]")
+        changes = diff_entries(sorted_entries(previous), sorted_entries(current))
+        for kind, (section, item), before, after in changes:
+            counts[kind] += 1
+
+            if kind == "added":
+                line = f"+ [{section}] {describe(item, after)}"
+            elif kind == "removed":
+                line = f"- [{section}] {describe(item, before)}"
+            else:
+                line = f"~ [{section}] {item} ({before} -> {after})"
+
+            out.record(line, kind, report_section=section, path=item, before=before, after=after)
+
+        if not any(counts.values()):
+            out.text("No differences in listed paths.")
+        out.text()
+
+        out.text("[Summary]")
+        out.field(f"- Added   : {counts['added']}", "added", counts["added"])
+        out.field(f"- Removed : {counts['removed']}", "removed", counts["removed"])
+        out.field(f"- Changed : {counts['changed']}", "changed", counts["changed"])
+        out.text()
+
+        out.text("[Note]")
+        out.text("- Only path sections are compared; summary counts are not.")
+        out.text("- \"Removed\" means no longer listed, not necessarily deleted.")
+        out.text("- This report is read-only.")
+        out.text()
+
+    log(
+        f"Report={report_name}, Previous={previous}, Current={current}, "
+        f"Added={counts['added']}, Removed={counts['removed']}, Changed={counts['changed']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms diff <report_name> [--reports-dir <dir>] "
+            "[--current <archive_file>] [--format text|jsonl|csv]"
+        )
+    )
+    parser.add_argument("report_name")
+    parser.add_argument("--reports-dir", default=BASE_REPORT_DIR)
+    parser.add_argument("--current", help="compare this archive with the one before it")
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    args = parser.parse_args()
+
+    report_dir = os.path.join(args.reports_dir, args.report_name.strip())
+
+    if not os.path.isdir(report_dir):
+        print("[ERROR] Report folder not found.")
+        sys.exit(1)
+
+    try:
+        previous, current = pick_archives(report_dir, args.current)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    print_report(args.report_name.strip(), previous, current, args.format)
+
+
+if __name__ == "__main__":
+    main()
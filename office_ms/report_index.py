@@ -0,0 +1,458 @@
+"""
+==================================================
+Report Index
+==================================================
+
+- 已歸檔報告的反向索引：路徑 -> (報告類型, 存檔時間, 區段)
+- report_archiver 每次存檔後自動加入索引；report_inventory --search 直接查詢索引，
+  不必逐一讀取 reports/ 下的所有報告
+- 支援完整路徑、前綴與子字串查詢（不分大小寫，/ 與 \\ 視為相同）
+
+索引內容（SQLite，reports/search_index.sqlite3）：
+    reports     每份已索引的報告（類型、檔名、時間）
+    paths       報告中出現過的路徑，每個路徑只存一份
+    sections    區段名稱
+    postings    路徑 -> 報告、區段
+    words       路徑拆成的片段（以 / \\ . _ - 空白分隔），每個片段只存一份
+    word_paths  片段 -> 路徑；子字串查詢先找出包含查詢字串的片段，再比對完整路徑
+
+待索引紀錄（reports/search_index.pending）：
+- 存檔後先在此附加一行「報告類型<TAB>檔名」，不需取得索引的鎖定，多個存檔行程互不等待
+- 取得索引寫入權的行程（存檔或查詢）一併處理所有待索引的報告；
+  已處理到的位置記錄在 meta，與索引內容在同一個交易中更新
+
+注意事項：
+- 只解析報告文字中的路徑區段（與 report_diff 相同的解析規則），不重新掃描資料夾
+- 索引為輔助資料：建立失敗不影響存檔；查詢前會先補上尚未索引的報告、移除已不存在的報告
+- 請以預設的 text 格式歸檔，報告才能被解析
+"""
+
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from . import common, report_bundle
+from .report_diff import iter_entries
+from .report_inventory import parse_timestamp
+
+LOG_FILE = "report_index.log"
+
+INDEX_FILE = "search_index.sqlite3"
+# 路徑區段的解析規則（report_diff.iter_entries）改變時更新，舊索引會被捨棄並重建
+INDEX_SCHEME = "report-index-v4"
+
+PENDING_FILE = "search_index.pending"
+
+# 待索引紀錄全部處理完且超過此大小時刪除，重新開始
+PENDING_ROTATE_BYTES = 1 << 20
+
+# 存檔時每次最多代為處理的待索引報告數；其餘留給下一個存檔或查詢，單次存檔不會等太久
+ARCHIVE_DRAIN_REPORTS = 20
+
+MATCH_MODES = ("exact", "prefix", "substring")
+
+# 補索引時每累積此份數 commit 一次
+SYNC_BATCH_REPORTS = 100
+
+# 路徑片段：分隔字元以外的連續字元
+WORD_RE = re.compile(r"[^/.\s_-]+")
+
+# UTF-8 編碼中最大的字元，用於前綴查詢的上界
+MAX_CHAR = "\U0010ffff"
+
+
+class Hit(NamedTuple):
+    path: str
+    report_type: str
+    filename: str
+    timestamp: str
+    section: str
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def normalize(path: str) -> str:
+    """
+    索引與查詢共用的比對鍵：小寫，\\ 一律換成 /。
+    """
+    return path.replace("\\", "/").lower()
+
+
+def words(key: str) -> Set[str]:
+    return set(WORD_RE.findall(key))
+
+
+def append_pending(base_dir: str, report_type: str, filename: str) -> None:
+    """
+    登記一份待索引的報告，不需任何鎖定。
+    萬一同時寫入的行互相混雜，無法解析的行會被略過，由查詢前的同步補上。
+    """
+    common.append_line(os.path.join(base_dir, PENDING_FILE), f"{report_type}\t{filename}\n")
+
+
+class ReportIndex:
+    """
+    reports/ 目錄的搜尋索引；使用完畢請 close()（或以 with 使用）。
+    """
+
+    def __init__(self, base_dir: str, timeout: float = 30) -> None:
+        self.base_dir = base_dir
+
+        # 僅在存檔與搜尋時才載入 sqlite3，其他工具不付出匯入成本
+        import sqlite3
+
+        # 查詢時等待其他行程完成寫入；存檔時以 timeout=0 嘗試，索引忙碌就不等待
+        self.conn = sqlite3.connect(os.path.join(base_dir, INDEX_FILE), timeout=timeout)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'scheme'"
+        ).fetchone()
+        if row is None or row[0] != INDEX_SCHEME:
+            for table in ("word_paths", "words", "postings", "sections", "paths", "reports"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('scheme', ?)",
+                (INDEX_SCHEME,),
+            )
+
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY,
+                report_type TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                UNIQUE (report_type, filename)
+            );
+            CREATE TABLE IF NOT EXISTS paths (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                path TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sections (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                path_id INTEGER NOT NULL,
+                report_id INTEGER NOT NULL,
+                section_id INTEGER NOT NULL,
+                PRIMARY KEY (path_id, report_id, section_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_report ON postings (report_id);
+            CREATE TABLE IF NOT EXISTS words (
+                id INTEGER PRIMARY KEY,
+                word TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS word_paths (
+                word_id INTEGER NOT NULL,
+                path_id INTEGER NOT NULL,
+                PRIMARY KEY (word_id, path_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self.conn.commit()
+
+        # 名稱 -> id；id 一經建立不再變動，同一個連線中可跨報告沿用
+        self._paths: Dict[str, int] = {}
+        self._words: Dict[str, int] = {}
+        self._sections: Dict[str, int] = {}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ReportIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ===== 建立索引 =====
+
+    def _id(self, table: str, column: str, value: str, cache: Dict[str, int]) -> int:
+        """
+        取得（或新增）一筆名稱的 id。
+        """
+        cached = cache.get(value)
+        if cached is not None:
+            return cached
+
+        row = self.conn.execute(
+            f"SELECT id FROM {table} WHERE {column} = ?", (value,)
+        ).fetchone()
+        if row is not None:
+            new_id = row[0]
+        else:
+            new_id = self.conn.execute(
+                f"INSERT INTO {table} ({column}) VALUES (?)", (value,)
+            ).lastrowid
+        cache[value] = new_id
+        return new_id
+
+    def _path_id(self, path: str) -> int:
+        key = normalize(path)
+        cached = self._paths.get(key)
+        if cached is not None:
+            return cached
+
+        row = self.conn.execute("SELECT id FROM paths WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._paths[key] = row[0]
+            return row[0]
+
+        path_id = self.conn.execute(
+            "INSERT INTO paths (key, path) VALUES (?, ?)", (key, path)
+        ).lastrowid
+        word_ids = [self._id("words", "word", word, self._words) for word in words(key)]
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO word_paths (word_id, path_id) VALUES (?, ?)",
+            ((word_id, path_id) for word_id in word_ids),
+        )
+        self._paths[key] = path_id
+        return path_id
+
+    def add(self, report_type: str, filename: str, commit: bool = True) -> bool:
+        """
+        將 reports/<report_type>/<filename> 加入索引；已索引過時不重複處理，回傳 False。
+        大量補索引時以 commit=False 累積，由呼叫端一次 commit。
+        """
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO reports (report_type, filename, timestamp) VALUES (?, ?, ?)",
+            (report_type, filename, parse_timestamp(filename)),
+        )
+        if cursor.rowcount == 0:
+            return False
+        report_id = cursor.lastrowid
+
+        postings = set()
+
+        report_path = os.path.join(self.base_dir, report_type, filename)
+        try:
+            for (section, item), _ in iter_entries(report_path):
+                postings.add((
+                    self._path_id(item),
+                    report_id,
+                    self._id("sections", "name", section, self._sections),
+                ))
+        except OSError:
+            # 讀取失敗時不留下沒有內容的報告紀錄，下次同步重試
+            self.conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+            raise
+
+        # 依主鍵順序寫入，減少 B-tree 的隨機寫入
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO postings (path_id, report_id, section_id) VALUES (?, ?, ?)",
+            sorted(postings),
+        )
+        if commit:
+            self.conn.commit()
+        return True
+
+    def remove(self, report_id: int) -> None:
+        self.conn.execute("DELETE FROM postings WHERE report_id = ?", (report_id,))
+        self.conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+        self.conn.commit()
+
+    def _pending_offset(self) -> int:
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'pending_offset'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_pending_offset(self, offset: int) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('pending_offset', ?)",
+            (str(offset),),
+        )
+
+    def drain_pending(self, max_reports: Optional[int] = None) -> int:
+        """
+        將待索引紀錄中尚未處理的報告加入索引，回傳新增數。
+        處理期間又有其他行程登記時繼續處理，直到沒有新的完整行，或已處理 max_reports 行。
+        同一份報告重複登記不會重複索引（add 會略過已索引的報告）。
+        """
+        path = os.path.join(self.base_dir, PENDING_FILE)
+        added = 0
+        processed = 0
+
+        # 先取得寫入權，確保同一時間只有一個行程處理待索引紀錄
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            start = offset = self._pending_offset()
+            while max_reports is None or processed < max_reports:
+                try:
+                    with open(path, "rb") as f:
+                        if os.fstat(f.fileno()).st_size < offset:
+                            # 紀錄檔已被刪除並重新建立
+                            offset = 0
+                        f.seek(offset)
+                        data = f.read()
+                except FileNotFoundError:
+                    offset = 0
+                    break
+
+                end = data.rfind(b"\n") + 1
+                if not end:
+                    break
+                for raw in data[:end].splitlines(keepends=True):
+                    if max_reports is not None and processed >= max_reports:
+                        break
+                    offset += len(raw)
+                    processed += 1
+
+                    report_type, sep, filename = raw.decode("utf-8", "replace").rstrip("\n").partition("\t")
+                    if not sep or not filename.endswith(".txt"):
+                        continue
+                    try:
+                        if self.add(report_type, filename, commit=False):
+                            added += 1
+                    except OSError as e:
+                        log(f"Failed to index {report_type}/{filename}. Error: {e}")
+
+            if offset >= PENDING_ROTATE_BYTES:
+                try:
+                    # 只有全部處理完才刪除；達到 max_reports 而提早停止、或剛有新登記時保留，
+                    # 剩下的紀錄由下一次處理接續
+                    if os.path.getsize(path) == offset:
+                        os.remove(path)
+                        offset = 0
+                except OSError:
+                    # 已被刪除，或 Windows 上其他行程正在附加時無法刪除，下次再試
+                    pass
+
+            if offset != start:
+                self._set_pending_offset(offset)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        return added
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        與 reports/ 目錄對齊：補上尚未索引的報告、移除已不存在的報告。
+        只列出檔名（含 bundle 的成員索引），不讀取已索引報告的內容。回傳 (新增數, 移除數)。
+        """
+        # 登記一定在存檔之後：在列出目錄前已登記的報告，都會出現在目錄中
+        try:
+            pending_size = os.path.getsize(os.path.join(self.base_dir, PENDING_FILE))
+        except OSError:
+            pending_size = 0
+
+        present: Set[Tuple[str, str]] = set()
+        for report_type in sorted(os.listdir(self.base_dir)):
+            type_dir = os.path.join(self.base_dir, report_type)
+            if not os.path.isdir(type_dir):
+                continue
+            for name in report_bundle.list_reports(type_dir):
+                if name.endswith(".txt"):
+                    present.add((report_type, name))
+
+        indexed: Dict[Tuple[str, str], int] = {
+            (report_type, filename): report_id
+            for report_id, report_type, filename in self.conn.execute(
+                "SELECT id, report_type, filename FROM reports"
+            )
+        }
+
+        added = 0
+        for n, (report_type, filename) in enumerate(sorted(present - indexed.keys()), 1):
+            try:
+                if self.add(report_type, filename, commit=False):
+                    added += 1
+            except OSError as e:
+                log(f"Failed to index {report_type}/{filename}. Error: {e}")
+            if n % SYNC_BATCH_REPORTS == 0:
+                self.conn.commit()
+        if pending_size > self._pending_offset():
+            self._set_pending_offset(pending_size)
+        self.conn.commit()
+
+        removed = 0
+        for key in indexed.keys() - present:
+            self.remove(indexed[key])
+            removed += 1
+
+        if added or removed:
+            log(f"Index synced: {self.base_dir} (added={added}, removed={removed})")
+        return added, removed
+
+    # ===== 查詢 =====
+
+    def _matching_paths(self, query: str, mode: str) -> List[int]:
+        key = normalize(query)
+
+        if mode == "exact":
+            sql, params = "SELECT id FROM paths WHERE key = ?", (key,)
+        elif mode == "prefix":
+            sql, params = "SELECT id FROM paths WHERE key >= ? AND key < ?", (key, key + MAX_CHAR)
+        else:
+            # 查詢字串中最長的片段必定是某個路徑片段的子字串；
+            # 先由片段表（不重複，數量遠少於路徑）縮小範圍，再比對完整路徑
+            pieces = sorted(WORD_RE.findall(key), key=len)
+            if pieces:
+                sql = (
+                    "SELECT id FROM paths WHERE id IN ("
+                    "  SELECT wp.path_id FROM words w JOIN word_paths wp ON wp.word_id = w.id"
+                    "  WHERE instr(w.word, ?) > 0"
+                    ") AND instr(key, ?) > 0"
+                )
+                params = (pieces[-1], key)
+            else:
+                sql, params = "SELECT id FROM paths WHERE instr(key, ?) > 0", (key,)
+
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def search(self, query: str, mode: str = "exact") -> List[Hit]:
+        """
+        查詢路徑，依路徑、報告類型、存檔順序排列。
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {mode} (expected one of {', '.join(MATCH_MODES)})")
+
+        hits: List[Hit] = []
+        path_ids = self._matching_paths(query, mode)
+        for start in range(0, len(path_ids), 500):
+            batch = path_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            hits.extend(Hit(*row) for row in self.conn.execute(
+                "SELECT p.path, r.report_type, r.filename, r.timestamp, s.name "
+                "FROM postings x "
+                "JOIN paths p ON p.id = x.path_id "
+                "JOIN reports r ON r.id = x.report_id "
+                "JOIN sections s ON s.id = x.section_id "
+                f"WHERE x.path_id IN ({placeholders})",
+                batch,
+            ))
+
+        hits.sort(key=lambda h: (normalize(h.path), h.report_type, common.archive_sort_key(h.filename), h.section))
+        return hits
+
+
+def index_archived(base_dir: str, report_type: str, report_path: str) -> Optional[int]:
+    """
+    存檔後加入索引（盡力而為，不等待）：先登記為待索引，再嘗試取得索引寫入權並處理。
+    索引正被其他行程寫入時直接返回，由該行程、下一次存檔或查詢前的同步接手。
+    回傳本次加入索引的報告數；未處理或失敗時回傳 None（只寫 log），不影響已完成的存檔。
+    """
+    import sqlite3
+
+    try:
+        append_pending(base_dir, report_type, os.path.basename(report_path))
+    except OSError as e:
+        log(f"Failed to queue {report_path} for indexing. Error: {e}")
+
+    try:
+        with ReportIndex(base_dir, timeout=0) as index:
+            return index.drain_pending(ARCHIVE_DRAIN_REPORTS)
+    except sqlite3.OperationalError as e:
+        if "locked" not in str(e):
+            log(f"Failed to index {report_path}. Error: {e}")
+        return None
+    except Exception as e:
+        log(f"Failed to index {report_path}. Error: {e}")
+        return None
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Report Inventory
+==================================================
+
+- 掃描 reports 目錄
+- 列出目前實際存在的報告檔案
+- 僅整理與顯示，不做任何修改或判斷
+- --search：查詢「哪些報告曾列出某個路徑」，直接查詢搜尋索引（見 report_index.py），
+  不逐一讀取報告
+- --totals：在每份報告後列出 [Summary] 數值，取自存檔時記錄的摘要（見 report_summary.py）
+
+注意事項：
+- 本工具為唯讀（--search 時會更新搜尋索引，不修改報告）
+- 不推論「應該存在的報告」
+- 不進行補齊、分類正確性或完整性判斷
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from . import report_bundle, report_renderer, report_summary
+
+if TYPE_CHECKING:
+    from .report_index import Hit
+
+BASE_REPORT_DIR = "reports"
+
+
+def parse_timestamp(filename: str) -> str:
+    """
+    嘗試從檔名解析時間戳。
+    秒以下的序號後綴（例如 _123456、_1）會被略過。
+    若失敗，僅回傳原始檔名。
+    """
+    name = os.path.splitext(filename)[0]
+    stem, _, seq = name.rpartition("_")
+    if stem and seq.isdigit():
+        name = stem
+    try:
+        dt = datetime.strptime(name, "%Y-%m-%d_%H-%M-%S")
+        return dt.isoformat(sep=" ")
+    except ValueError:
+        return filename
+
+
+def scan_reports(base_dir: str) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    掃描 reports 目錄結構。
+
+    回傳結構：
+    {
+        report_type: [
+            (filename, parsed_time),
+            ...
+        ]
+    }
+    """
+    inventory: Dict[str, List[Tuple[str, str]]] = {}
+
+    if not os.path.isdir(base_dir):
+        return inventory
+
+    for report_type in sorted(os.listdir(base_dir)):
+        type_dir = os.path.join(base_dir, report_type)
+        if not os.path.isdir(type_dir):
+            continue
+
+        files: List[Tuple[str, str]] = []
+
+        # 已壓縮進 bundle 的報告與資料夾中的報告一起列出
+        for name in report_bundle.list_reports(type_dir):
+            timestamp = parse_timestamp(name)
+            files.append((name, timestamp))
+
+        if files:
+            inventory[report_type] = files
+
+    return inventory
+
+
+def load_totals(base_dir: str, inventory: Dict[str, List[Tuple[str, str]]]) -> Dict[str, Dict[str, str]]:
+    """
+    各報告的 [Summary] 數值（已格式化），例如 "New files created=3, Files modified=0"。
+    """
+    totals: Dict[str, Dict[str, str]] = {}
+    for report_type, files in inventory.items():
+        found = report_summary.summaries(
+            os.path.join(base_dir, report_type), (name for name, _ in files)
+        )
+        totals[report_type] = {
+            name: report_summary.format_totals(entry.summary) for name, entry in found.items()
+        }
+    return totals
+
+
+def print_report(
+    inventory: Dict[str, List[Tuple[str, str]]],
+    fmt: str = "text",
+    totals: Optional[Dict[str, Dict[str, str]]] = None,
+) -> None:
+    columns = ("filename", "timestamp", "totals") if totals is not None else ("filename", "timestamp")
+
+    with report_renderer.open_renderer(fmt, "report_inventory", columns) as out:
+        out.text("=" * 40)
+        out.text("Report Inventory")
+        out.text("=" * 40)
+        out.text()
+
+        if not inventory:
+            out.text("No reports found.")
+            out.text()
+            return
+
+        for report_type, files in inventory.items():
+            out.text(f"[{report_type}]")
+            out.field(f"- Count: {len(files)}", "count", len(files), section=report_type)
+
+            for filename, timestamp in files:
+                if totals is None:
+                    out.record(
+                        f"  - {filename} ({timestamp})",
+                        report_type, filename=filename, timestamp=timestamp,
+                    )
+                    continue
+                summary = totals[report_type].get(filename, "")
+                out.record(
+                    f"  - {filename} ({timestamp})" + (f"  {summary}" if summary else ""),
+                    report_type, filename=filename, timestamp=timestamp, totals=summary,
+                )
+
+            out.text()
+
+
+def print_search(query: str, mode: str, hits: Sequence["Hit"], fmt: str = "text") -> None:
+    columns = ("path", "report_type", "filename", "timestamp", "report_section")
+
+    with report_renderer.open_renderer(fmt, "report_search", columns) as out:
+        out.text("=" * 40)
+        out.text("Report Search")
+        out.field(f"Query : {query}", "query", query)
+        out.field(f"Match : {mode}", "match", mode)
+        out.text("=" * 40)
+        out.text()
+
+        out.text("[Matches]")
+        if not hits:
+            out.text("No archived report lists this path.")
+
+        current = None
+        for hit in hits:
+            if hit.path != current:
+                current = hit.path
+                out.text(f"- {hit.path}")
+            out.record(
+                f"  - {hit.report_type} / {hit.filename} ({hit.timestamp}) [{hit.section}]",
+                "match",
+                path=hit.path,
+                report_type=hit.report_type,
+                filename=hit.filename,
+                timestamp=hit.timestamp,
+                report_section=hit.section,
+            )
+        out.text()
+
+        paths = len({hit.path for hit in hits})
+        reports = len({(hit.report_type, hit.filename) for hit in hits})
+        out.text("[Summary]")
+        out.field(f"- Paths   : {paths}", "paths", paths)
+        out.field(f"- Reports : {reports}", "reports", reports)
+        out.text()
+
+
+def search_reports(base_dir: str, query: str, mode: str, fmt: str = "text") -> None:
+    from . import report_index
+
+    with report_index.ReportIndex(base_dir) as index:
+        index.sync()
+        hits = index.search(query, mode)
+
+    print_search(query, mode, hits, fmt)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms inventory [reports_dir] [--totals] [--search <path>] "
+            "[--match exact|prefix|substring] [--format text|jsonl|csv]"
+        )
+    )
+    parser.add_argument("reports_dir", nargs="?", default=BASE_REPORT_DIR)
+    parser.add_argument("--totals", action="store_true", help="show each report's [Summary] values")
+    parser.add_argument("--search", help="list archived reports that mention this path")
+    parser.add_argument("--match", choices=("exact", "prefix", "substring"), default="exact")
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    args = parser.parse_args()
+
+    if args.search is not None:
+        if not args.search.strip():
+            print("[ERROR] Search text cannot be empty.")
+            sys.exit(1)
+        if not os.path.isdir(args.reports_dir):
+            print("[ERROR] Report folder not found.")
+            sys.exit(1)
+        search_reports(args.reports_dir, args.search.strip(), args.match, args.format)
+        return
+
+    inventory = scan_reports(args.reports_dir)
+    totals = load_totals(args.reports_dir, inventory) if args.totals else None
+    print_report(inventory, args.format, totals)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Report Renderer
+==================================================
+
+- 各報告共用的輸出層
+- 所有輸出先累積在記憶體緩衝區，達到一定大小才一次寫出，
+  取代「每個路徑一次 print()」
+- 支援三種格式：
+  - text ：與原本 print() 輸出逐位元組相同的人類可讀報告
+  - jsonl：JSON Lines，每行一個物件，供下游工具直接讀取
+  - csv  ：僅輸出明細列（每個路徑一列），第一列為欄位名稱
+
+使用方式（報告程式內）：
+    with open_renderer(fmt, "daily_snapshot", ("path",)) as out:
+        out.text("Daily Activity Snapshot")
+        out.field(f"- New files created   : {n}", "new_files", n)
+        out.record(f"- {path}", "new", path=path)
+
+注意事項：
+- 本模組只負責輸出格式，不讀取、不修改任何檔案
+"""
+
+import csv
+import sys
+import json
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, TextIO
+
+FORMATS = ("text", "jsonl", "csv")
+
+# 累積約 1 MiB 文字才寫出一次
+BUFFER_CHARS = 1024 * 1024
+
+
+class BufferedLineWriter:
+    """
+    將多行文字累積後一次寫出。
+    寫入對象為當下的 sys.stdout（或指定的 stream），因此重新導向 stdout 時仍然有效。
+    """
+
+    def __init__(self, stream: TextIO, limit: int = BUFFER_CHARS) -> None:
+        self.stream = stream
+        self.limit = limit
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, data: str) -> None:
+        self.parts.append(data)
+        self.size += len(data)
+        if self.size >= self.limit:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            self.stream.write("".join(self.parts))
+            self.parts.clear()
+            self.size = 0
+        self.stream.flush()
+
+
+class TextRenderer:
+    """
+    人類可讀格式：只輸出每個呼叫帶入的文字行，與原本的 print() 結果相同。
+    """
+
+    def __init__(self, writer: BufferedLineWriter, report: str, columns: Sequence[str]) -> None:
+        self.writer = writer
+
+    def text(self, line: str = "") -> None:
+        self.writer.write(line + "\n")
+
+    def field(self, line: str, key: str, value: object, section: Optional[str] = None) -> None:
+        self.text(line)
+
+    def record(self, line: str, section: str, **values: object) -> None:
+        self.text(line)
+
+
+class JsonLinesRenderer:
+    """
+    JSON Lines：
+    {"type": "report", "report": ...}
+    {"type": "field", "key": ..., "value": ...}
+    {"type": "record", "section": ..., <欄位>: ...}
+    純版面文字（標題、分隔線、說明）不輸出。
+    """
+
+    def __init__(self, writer: BufferedLineWriter, report: str, columns: Sequence[str]) -> None:
+        self.writer = writer
+        self._emit({"type": "report", "report": report})
+
+    def _emit(self, obj: dict) -> None:
+        self.writer.write(json.dumps(obj, ensure_ascii=False, default=str) + "\n")
+
+    def text(self, line: str = "") -> None:
+        pass
+
+    def field(self, line: str, key: str, value: object, section: Optional[str] = None) -> None:
+        obj = {"type": "field", "key": key, "value": value}
+        if section is not None:
+            obj["section"] = section
+        self._emit(obj)
+
+    def record(self, line: str, section: str, **values: object) -> None:
+        self._emit({"type": "record", "section": section, **values})
+
+
+class CsvRenderer:
+    """
+    CSV：第一列為 section + 報告宣告的欄位，其後每筆明細一列。
+    標題與摘要不輸出（可由明細列推得）。
+    """
+
+    def __init__(self, writer: BufferedLineWriter, report: str, columns: Sequence[str]) -> None:
+        self.columns = list(columns)
+        self.csv = csv.writer(writer, lineterminator="\n")
+        self.csv.writerow(["section", *self.columns])
+
+    def text(self, line: str = "") -> None:
+        pass
+
+    def field(self, line: str, key: str, value: object, section: Optional[str] = None) -> None:
+        pass
+
+    def record(self, line: str, section: str, **values: object) -> None:
+        self.csv.writerow([section, *(values.get(c, "") for c in self.columns)])
+
+
+RENDERERS = {
+    "text": TextRenderer,
+    "jsonl": JsonLinesRenderer,
+    "csv": CsvRenderer,
+}
+
+
+@contextmanager
+def open_renderer(
+    fmt: str,
+    report: str,
+    columns: Sequence[str] = ("path",),
+    stream: Optional[TextIO] = None,
+) -> Iterator[TextRenderer]:
+    if fmt not in RENDERERS:
+        raise ValueError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
+
+    writer = BufferedLineWriter(stream if stream is not None else sys.stdout)
+    renderer = RENDERERS[fmt](writer, report, columns)
+    try:
+        yield renderer
+    finally:
+        writer.flush()
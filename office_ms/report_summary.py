@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Report Summary
+==================================================
+
+- 已歸檔報告的標頭欄位（Date、Folder、Period ...）與 [Summary] 數值，
+  另存於各報告類型資料夾中的 .summaries.jsonl，每份報告一行
+- report_archiver 存檔時直接由記憶體中的報告內容擷取並附加，不需重讀報告
+- 既有的歸檔以 office-ms summarize 補建：以 mmap 只讀取報告開頭（標頭與 [Summary]），
+  不讀取其餘明細，數百 MB 的報告也只碰觸開頭幾 KB
+- inventory --totals 與 anomaly_emitter 直接讀取此檔，不必開啟報告本身
+
+使用方式：
+office-ms summarize [report_name] [--reports-dir <dir>]
+
+注意事項：
+- 只解析 text 格式的報告；jsonl / csv 報告會被記錄，但沒有欄位
+- 摘要檔為輔助資料，可隨時刪除後以 summarize 重建；檔名以 . 開頭，不會被當成報告列出
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import mmap
+import argparse
+from typing import Dict, Iterable, List, NamedTuple
+
+from . import common, report_bundle
+
+LOG_FILE = "report_summary.log"
+BASE_REPORT_DIR = "reports"
+
+SIDECAR_FILE = ".summaries.jsonl"
+
+# 標頭與 [Summary] 位於報告開頭；只在此範圍內尋找
+HEAD_BYTES = 64 * 1024
+
+# "- Files modified      : 3" -> ("Files modified", 3)
+SUMMARY_LINE_RE = re.compile(r"^- (.+?)\s*:\s*(-?\d+(?:\.\d+)?)")
+
+# "Folder    : C:\work" -> ("Folder", "C:\work")
+HEADER_LINE_RE = re.compile(r"^([A-Za-z][A-Za-z ]*?)\s*:\s*(.*?)\s*$")
+
+
+class Summary(NamedTuple):
+    header: Dict[str, str]
+    summary: Dict[str, float]
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def extract(lines: Iterable[str]) -> Summary:
+    """
+    由報告開頭擷取標頭欄位與 [Summary] 數值；讀到 [Summary] 結束即停止。
+    標頭為第一個 [區段] 之前的「名稱 : 值」行。
+    """
+    header: Dict[str, str] = {}
+    summary: Dict[str, float] = {}
+    in_header = True
+    in_summary = False
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line.startswith("[") and line.endswith("]"):
+            in_header = False
+            if in_summary:
+                break
+            in_summary = line == "[Summary]"
+            continue
+        if in_summary:
+            if not line:
+                break
+            match = SUMMARY_LINE_RE.match(line)
+            if match:
+                summary[match.group(1)] = float(match.group(2))
+        elif in_header:
+            match = HEADER_LINE_RE.match(line)
+            if match:
+                header[match.group(1)] = match.group(2)
+
+    return Summary(header, summary)
+
+
+def head_of(mm: mmap.mmap, size: int) -> bytes:
+    """
+    報告開頭到 [Summary] 結束（空白行）為止的位元組；沒有 [Summary] 時為前 HEAD_BYTES。
+    """
+    limit = min(size, HEAD_BYTES)
+    start = mm.find(b"\n[Summary]", 0, limit)
+    if start < 0:
+        return mm[:limit]
+    ends = [i for i in (mm.find(b"\n\n", start + 1, limit), mm.find(b"\n\r\n", start + 1, limit)) if i >= 0]
+    return mm[:min(ends) + 1] if ends else mm[:limit]
+
+
+def read_head(path: str) -> Summary:
+    """
+    讀取一份已歸檔報告的標頭與 [Summary]。資料夾中的報告以 mmap 只讀取開頭；
+    已壓縮進 bundle 的報告由 bundle 串流讀取，讀到 [Summary] 結束即停止。
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        with report_bundle.open_report(path) as text:
+            return extract(text)
+
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return Summary({}, {})
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            head = head_of(mm, size)
+    return extract(io.StringIO(head.decode("utf-8", errors="replace")))
+
+
+def append(report_dir: str, filename: str, entry: Summary) -> None:
+    record = {"file": filename, "header": entry.header, "summary": entry.summary}
+    common.append_line(
+        os.path.join(report_dir, SIDECAR_FILE),
+        json.dumps(record, ensure_ascii=False) + "\n",
+    )
+
+
+def load(report_dir: str) -> Dict[str, Summary]:
+    """
+    讀取摘要檔：檔名 -> Summary。同一份報告有多筆時以最後一筆為準；無法解析的行略過。
+    """
+    entries: Dict[str, Summary] = {}
+    try:
+        with open(os.path.join(report_dir, SIDECAR_FILE), encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    entries[record["file"]] = Summary(record["header"], record["summary"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def summaries(report_dir: str, names: Iterable[str]) -> Dict[str, Summary]:
+    """
+    names 中各報告的摘要；摘要檔中沒有的報告改讀報告開頭（不寫回摘要檔）。
+    無法讀取的報告不列入結果。
+    """
+    recorded = load(report_dir)
+    result: Dict[str, Summary] = {}
+    for name in names:
+        entry = recorded.get(name)
+        if entry is None:
+            try:
+                entry = read_head(os.path.join(report_dir, name))
+            except OSError as e:
+                log(f"Cannot read {name}: {e}")
+                continue
+        result[name] = entry
+    return result
+
+
+def record_archived(report_path: str, content: str) -> None:
+    """
+    存檔後附加摘要（盡力而為）：內容已在記憶體中，不重讀報告；失敗時只寫 log。
+    """
+    report_dir, filename = os.path.split(report_path)
+    try:
+        append(report_dir, filename, extract(content.splitlines()))
+    except OSError as e:
+        log(f"Failed to record summary for {report_path}. Error: {e}")
+
+
+def backfill(report_dir: str) -> int:
+    """
+    為摘要檔中還沒有的報告補上摘要，回傳補上的份數。
+    """
+    recorded = load(report_dir)
+    count = 0
+    for name in report_bundle.list_reports(report_dir):
+        if not name.endswith(".txt") or name in recorded:
+            continue
+        try:
+            entry = read_head(os.path.join(report_dir, name))
+        except OSError as e:
+            log(f"Cannot read {name}: {e}")
+            continue
+        append(report_dir, name, entry)
+        count += 1
+    return count
+
+
+def format_totals(summary: Dict[str, float]) -> str:
+    return ", ".join(f"{key}={value:g}" for key, value in summary.items())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage="office-ms summarize [report_name] [--reports-dir <dir>]"
+    )
+    parser.add_argument("report_name", nargs="?", help="only summarize this report type")
+    parser.add_argument("--reports-dir", default=BASE_REPORT_DIR)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.reports_dir):
+        print("[ERROR] Report folder not found.")
+        sys.exit(1)
+
+    if args.report_name:
+        report_names: List[str] = [args.report_name.strip()]
+        if not os.path.isdir(os.path.join(args.reports_dir, report_names[0])):
+            print("[ERROR] Report folder not found.")
+            sys.exit(1)
+    else:
+        report_names = sorted(
+            name for name in os.listdir(args.reports_dir)
+            if os.path.isdir(os.path.join(args.reports_dir, name))
+        )
+
+    total = 0
+    for report_name in report_names:
+        report_dir = os.path.join(args.reports_dir, report_name)
+        count = backfill(report_dir)
+        if count:
+            print(f"[OK] {count} report(s) summarized in {report_dir}")
+        total += count
+
+    if not total:
+        print("[OK] All archived reports already have summaries.")
+    log(f"Summary backfill finished: {args.reports_dir} (added={total})")
+
+
+if __name__ == "__main__":
+    main()
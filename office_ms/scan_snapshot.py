@@ -0,0 +1,451 @@
+"""
+==================================================
+Scan Snapshot
+==================================================
+
+- 將一次完整走訪的原始結果（資料夾結構、檔名、大小、mtime、ctime）存成精簡的二進位檔
+- 之後 Daily / Weekly / Monthly / Folder Health 可加上 --from-snapshot 直接由快照產生報告，
+  不再碰觸網路磁碟：換一個期間、換一種輸出格式都只需數秒
+- 檔名與資料夾名稱只存一份（名稱表去除重複），路徑由資料夾表的父子關係組回
+- 讀取時以 mmap + memoryview 直接對應各欄位，不整批載入、不複製
+
+檔案配置（整數皆為本機位元組順序，標頭記錄於 byteorder）：
+    "OFMSSNAP"                  8 bytes
+    標頭長度                     uint32
+    標頭（JSON）                 版本、資料夾、時間、筆數、略過的資料夾、各欄位的位置
+    各欄位（8 bytes 對齊）：
+        name_offsets  uint64[names + 1]   名稱表：第 i 個名稱為 name_blob[offsets[i]:offsets[i+1]]
+        name_blob     bytes               UTF-8
+        dir_parent    int32[dirs]         父資料夾（根目錄為 -1）
+        dir_name      uint32[dirs]        名稱表索引
+        dir_pos       uint32[dirs]        在父資料夾列目錄結果中的順序
+        dir_walked    uint8[dirs]         是否有走訪（資料夾捷徑、逾時略過者為 0）
+        dir_first     uint64[dirs]        該資料夾第一個檔案的索引（同一資料夾的檔案連續存放）
+        dir_files     uint32[dirs]        該資料夾的檔案數
+        file_name     uint32[files]       名稱表索引
+        file_size     uint64[files]
+        file_mtime    float64[files]
+        file_ctime    float64[files]      建立時間（見 stat_backend）
+        file_dev      uint64[files]       裝置與 inode，供快照比對辨識搬移 / 改名（第 2 版起）
+        file_ino      uint64[files]
+
+注意事項：
+- 快照只反映「建立當下」的狀態，之後的變動不會出現在報告中
+- 無法 stat 的檔案不列入快照
+- 不保存檔案內容，因此 Folder Health 的 --duplicates 無法由快照產生
+- Windows 上列目錄取得的 inode 為 0，此時視為未知
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import walker
+
+MAGIC = b"OFMSSNAP"
+SNAPSHOT_VERSION = 2
+# 第 1 版沒有 file_dev / file_ino，仍可讀取（兩欄為 None）
+READABLE_VERSIONS = (1, 2)
+
+# (欄位名稱, array typecode)
+COLUMNS = (
+    ("name_offsets", "Q"),
+    ("name_blob", "B"),
+    ("dir_parent", "i"),
+    ("dir_name", "I"),
+    ("dir_pos", "I"),
+    ("dir_walked", "B"),
+    ("dir_first", "Q"),
+    ("dir_files", "I"),
+    ("file_name", "I"),
+    ("file_size", "Q"),
+    ("file_mtime", "d"),
+    ("file_ctime", "d"),
+    ("file_dev", "Q"),
+    ("file_ino", "Q"),
+)
+
+# 較新版本才加入的欄位；舊版快照中不存在
+OPTIONAL_COLUMNS = {"file_dev", "file_ino"}
+
+Folder = Tuple[str, List[str], List[walker.FileEntry]]
+
+
+class SnapshotStat(NamedTuple):
+    """
+    快照中的檔案屬性；欄位名稱與 stat_backend.FileStat 相同，報告程式可直接沿用。
+    """
+    st_size: int
+    st_mtime: float
+    st_ctime: float
+
+
+def encode_name(name: str) -> bytes:
+    # surrogateescape：Linux 上無法以 UTF-8 解碼的檔名也能原樣保存
+    return name.encode("utf-8", "surrogateescape")
+
+
+def decode_name(data: bytes) -> str:
+    return data.decode("utf-8", "surrogateescape")
+
+
+def align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class SnapshotWriter:
+    """
+    邊走訪邊記錄，走訪結束後以 finish() 一次寫出。
+    資料夾可依任意順序加入（由上而下或由下而上皆可）。
+    """
+
+    def __init__(self, path: str, base_dir: str) -> None:
+        self.path = path
+        self.base_dir = base_dir
+        self.generated = datetime.now()
+
+        self.names: Dict[str, int] = {}
+        self.name_offsets = array("Q", [0])
+        self.name_blob = bytearray()
+
+        self.dir_index: Dict[str, int] = {}
+        self.dir_parent = array("i")
+        self.dir_name = array("I")
+        self.dir_pos = array("I")
+        self.dir_walked = array("B")
+        self.dir_first = array("Q")
+        self.dir_files = array("I")
+
+        self.file_name = array("I")
+        self.file_size = array("Q")
+        self.file_mtime = array("d")
+        self.file_ctime = array("d")
+        self.file_dev = array("Q")
+        self.file_ino = array("Q")
+
+        self._folder(base_dir)
+
+    def _name(self, name: str) -> int:
+        index = self.names.get(name)
+        if index is None:
+            index = len(self.names)
+            self.names[name] = index
+            self.name_blob += encode_name(name)
+            self.name_offsets.append(len(self.name_blob))
+        return index
+
+    def _folder(self, path: str) -> int:
+        index = self.dir_index.get(path)
+        if index is None:
+            index = len(self.dir_parent)
+            self.dir_index[path] = index
+            self.dir_parent.append(-1)
+            self.dir_name.append(self._name("" if path == self.base_dir else os.path.basename(path)))
+            self.dir_pos.append(0)
+            self.dir_walked.append(0)
+            self.dir_first.append(0)
+            self.dir_files.append(0)
+        return index
+
+    def add_folder(self, root: str, dirs: List[str], files: List[walker.FileEntry]) -> None:
+        index = self._folder(root)
+        self.dir_walked[index] = 1
+        self.dir_first[index] = len(self.file_name)
+
+        count = 0
+        for name, stat in files:
+            if stat is None:
+                continue
+            self.file_name.append(self._name(name))
+            self.file_size.append(stat.st_size)
+            self.file_mtime.append(stat.st_mtime)
+            self.file_ctime.append(stat.st_ctime)
+            self.file_dev.append(stat.st_dev)
+            self.file_ino.append(stat.st_ino)
+            count += 1
+        self.dir_files[index] = count
+
+        for pos, name in enumerate(dirs):
+            child = self._folder(os.path.join(root, name))
+            self.dir_parent[child] = index
+            self.dir_pos[child] = pos
+
+    def record(self, folders: Iterable[Folder]) -> Iterator[Folder]:
+        """
+        原樣轉交走訪結果，同時記錄每個資料夾。
+        """
+        for root, dirs, files in folders:
+            self.add_folder(root, dirs, files)
+            yield root, dirs, files
+
+    def finish(self, skipped: List[walker.SkippedDir]) -> None:
+        """
+        寫入暫存檔，完成後才取代正式檔，避免留下半份快照。
+        """
+        columns = [
+            (name, getattr(self, name) if name != "name_blob" else array("B", self.name_blob))
+            for name, _ in COLUMNS
+        ]
+
+        header = {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "folder": os.path.abspath(self.base_dir),
+            "generated": self.generated.isoformat(),
+            "byteorder": sys.byteorder,
+            "dirs": len(self.dir_parent),
+            "files": len(self.file_name),
+            "names": len(self.names),
+            "skipped": [
+                [os.path.relpath(path, self.base_dir), reason] for path, reason in skipped
+            ],
+            "columns": {},
+        }
+
+        # 欄位位置取決於標頭長度，標頭長度又取決於欄位位置的位數；
+        # 先以足夠寬的占位計算，再固定標頭長度
+        layout: Dict[str, List[int]] = {}
+        header["columns"] = {name: [0, 0] for name, _ in COLUMNS}
+        header_len = len(json.dumps(header).encode("utf-8")) + 64 * len(COLUMNS)
+        offset = align(len(MAGIC) + 4 + header_len)
+        for name, values in columns:
+            size = len(values) * values.itemsize
+            layout[name] = [offset, size]
+            offset = align(offset + size)
+        header["columns"] = layout
+
+        encoded = json.dumps(header).encode("utf-8").ljust(header_len)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", header_len))
+            f.write(encoded)
+            for name, values in columns:
+                f.seek(layout[name][0])
+                values.tofile(f)
+            f.truncate(offset)
+
+        os.replace(tmp_path, self.path)
+
+
+class Snapshot:
+    """
+    以 mmap 開啟快照；各欄位為 memoryview，讀取時才解碼需要的名稱。
+    使用完畢請 close()（或以 with 使用）。
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._views: List[memoryview] = []
+
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a scan snapshot: {path}")
+
+        try:
+            self._load()
+        except (KeyError, TypeError, struct.error):
+            self.close()
+            raise ValueError(f"Not a scan snapshot: {path}")
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        view = memoryview(self._mm)
+        self._views.append(view)
+
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a scan snapshot: {self.path}")
+
+        (header_len,) = struct.unpack_from("<I", view, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start:start + header_len]))
+
+        if header.get("snapshot_version") not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported snapshot format: {self.path}")
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Snapshot was written on a {header.get('byteorder')}-endian machine: {self.path}")
+
+        self.folder: str = header["folder"]
+        self.generated = datetime.fromisoformat(header["generated"])
+        self.dir_count: int = header["dirs"]
+        self.file_count: int = header["files"]
+        self._skipped: List[List[str]] = header["skipped"]
+
+        for name, code in COLUMNS:
+            if name in OPTIONAL_COLUMNS and name not in header["columns"]:
+                setattr(self, name, None)
+                continue
+            offset, size = header["columns"][name]
+            column = view[offset:offset + size].cast(code)
+            self._views.append(column)
+            setattr(self, name, column)
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def name(self, index: int) -> str:
+        return decode_name(bytes(self.name_blob[self.name_offsets[index]:self.name_offsets[index + 1]]))
+
+    def skipped(self, base_dir: str) -> List[walker.SkippedDir]:
+        return [(os.path.join(base_dir, rel_path), reason) for rel_path, reason in self._skipped]
+
+    def _children(self) -> List[List[int]]:
+        # 依列目錄順序排列，走訪順序與實際走訪相同
+        children: List[List[Tuple[int, int]]] = [[] for _ in range(self.dir_count)]
+        for index in range(1, self.dir_count):
+            children[self.dir_parent[index]].append((self.dir_pos[index], index))
+        return [[index for _, index in sorted(items)] for items in children]
+
+    def _folder(self, index: int, path: str, children: List[int]) -> Folder:
+        first = self.dir_first[index]
+        files: List[walker.FileEntry] = [
+            (
+                self.name(self.file_name[i]),
+                SnapshotStat(self.file_size[i], self.file_mtime[i], self.file_ctime[i]),
+            )
+            for i in range(first, first + self.dir_files[index])
+        ]
+        return path, [self.name(self.dir_name[c]) for c in children], files
+
+    def files_by_path(self) -> Iterator[Tuple[Tuple[str, ...], int]]:
+        """
+        依相對路徑排序，逐一產出 (路徑各層名稱, 檔案索引)。
+        排序以路徑各層名稱逐層比較（同一資料夾內檔案與子資料夾一起依名稱排序），
+        兩份快照以相同規則排序，即可逐筆合併比對；記憶體只與資料夾深度與單一資料夾大小有關。
+        """
+        if self.dir_count == 0 or not self.dir_walked[0]:
+            return
+
+        children = self._children()
+
+        def entries(index: int, parts: Tuple[str, ...]) -> Iterator[Tuple[str, int, int]]:
+            # (名稱, 0=檔案 / 1=資料夾, 索引)，依名稱排序
+            first = self.dir_first[index]
+            items = [
+                (self.name(self.file_name[i]), 0, i)
+                for i in range(first, first + self.dir_files[index])
+            ]
+            items.extend(
+                (self.name(self.dir_name[c]), 1, c)
+                for c in children[index]
+                if self.dir_walked[c]
+            )
+            items.sort()
+            return iter(items)
+
+        stack = [((), entries(0, ()))]
+        while stack:
+            parts, it = stack[-1]
+            item = next(it, None)
+            if item is None:
+                stack.pop()
+                continue
+            name, is_dir, index = item
+            if is_dir:
+                child_parts = parts + (name,)
+                stack.append((child_parts, entries(index, child_parts)))
+            else:
+                yield parts + (name,), index
+
+    def walk(self, base_dir: str, topdown: bool = True) -> Iterator[Folder]:
+        """
+        與 walker.walk 相同的產出格式與順序；路徑以 base_dir 為根。
+        """
+        if self.dir_count == 0 or not self.dir_walked[0]:
+            return
+
+        children = self._children()
+
+        if topdown:
+            stack = [(0, base_dir)]
+            while stack:
+                index, path = stack.pop()
+                yield self._folder(index, path, children[index])
+                stack.extend(
+                    (c, os.path.join(path, self.name(self.dir_name[c])))
+                    for c in reversed(children[index])
+                    if self.dir_walked[c]
+                )
+            return
+
+        def frame(index: int, path: str) -> list:
+            return [index, path, [c for c in children[index] if self.dir_walked[c]], 0]
+
+        frames: List[list] = [frame(0, base_dir)]
+        while frames:
+            top = frames[-1]
+            index, path, descend, pos = top
+            if pos < len(descend):
+                top[3] = pos + 1
+                child = descend[pos]
+                frames.append(frame(child, os.path.join(path, self.name(self.dir_name[child]))))
+                continue
+            frames.pop()
+            yield self._folder(index, path, children[index])
+
+
+def add_snapshot_arguments(parser) -> None:
+    parser.add_argument("--save-snapshot", help="also save the raw scan result to this snapshot file")
+    parser.add_argument("--from-snapshot", help="render from a saved snapshot, no scan")
+
+
+def snapshot_from_args(args, log, base_dir: str) -> Optional[Snapshot]:
+    """
+    開啟 --from-snapshot 指定的快照；錯誤時輸出 [ERROR] 並結束。
+    快照必須是 base_dir 的快照（與 compare 相同，比對絕對路徑）。
+    """
+    if args.save_snapshot and args.from_snapshot:
+        print("[ERROR] --save-snapshot and --from-snapshot cannot be used together.")
+        sys.exit(1)
+
+    if not args.from_snapshot:
+        return None
+
+    if not os.path.isfile(args.from_snapshot):
+        print("[ERROR] Snapshot file not found.")
+        sys.exit(1)
+
+    try:
+        snapshot = Snapshot(args.from_snapshot)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    folder = os.path.abspath(base_dir)
+    if os.path.normcase(snapshot.folder) != os.path.normcase(folder):
+        print(f"[ERROR] Snapshot is of a different folder: {snapshot.folder} (expected {folder})")
+        snapshot.close()
+        sys.exit(1)
+
+    log(
+        f"Reading snapshot {args.from_snapshot} "
+        f"(folder={snapshot.folder}, generated={snapshot.generated.isoformat()}, "
+        f"files={snapshot.file_count})"
+    )
+    return snapshot
+
+
+def writer_from_args(args, base_dir: str) -> Optional[SnapshotWriter]:
+    return SnapshotWriter(args.save_snapshot, base_dir) if args.save_snapshot else None
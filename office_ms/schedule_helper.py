@@ -1,7 +1,10 @@
 import subprocess
 import os
+import sys
 from datetime import datetime
 
+from . import common
+
 # =========================================================
 # 一次性排程器（One-Time Task Scheduler）
 #
@@ -16,9 +19,9 @@ from datetime import datetime
 # - 防止自己亂排程、忘記排過什麼
 # =========================================================
 
-# 取得目前這個檔案所在的資料夾
-# 所有 log 都固定寫在這裡，避免 working directory 問題
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 所有 log 都固定寫在執行時的工作資料夾（與其他工具的 log 相同位置）
+# 安裝為套件或打包成 zipapp 後，程式所在位置不再是可寫入的資料夾
+BASE_DIR = os.getcwd()
 
 # 排程建立行為的永久紀錄（append-only）
 LOG_PATH = os.path.join(BASE_DIR, "scheduler_log.txt")
@@ -29,8 +32,7 @@ def log(msg: str):
     將排程建立相關事件寫入 log。
     不覆寫、不清空，確保歷史行為可追溯。
     """
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(f"[{datetime.now()}] {msg}\n")
+    common.append_log(LOG_PATH, msg)
 
 
 def create_task(task_name: str, script_path: str, run_time: str):
@@ -45,7 +47,7 @@ def create_task(task_name: str, script_path: str, run_time: str):
 
     # 使用目前執行這個 scheduler 的 Python 解譯器
     # 確保 virtualenv / 版本一致
-    python_exe = os.sys.executable
+    python_exe = sys.executable
 
     # 驗證時間格式（錯就直接 fail）
     # schtasks 本身對錯誤時間的回饋不可靠
@@ -80,14 +82,14 @@ def create_task(task_name: str, script_path: str, run_time: str):
     print(f"[OK] Task '{task_name}' scheduled at {run_time}")
 
 
-if __name__ == "__main__":
+def main():
     print("=== One-Time Task Scheduler ===")
 
     # 讓使用者（自己）明確指定要被排程的 Python 腳本
     script = input("Python script path: ").strip().strip('"')
     if not os.path.isfile(script):
         print("[ERROR] Script not found")
-        exit(1)
+        sys.exit(1)
 
     # 排程任務名稱（會顯示在 Windows 排程器）
     task_name = input("Task name: ").strip()
@@ -100,7 +102,7 @@ if __name__ == "__main__":
     confirm = input("Create ONE-TIME task? (yes/no): ").strip().lower()
     if confirm != "yes":
         print("Aborted.")
-        exit(0)
+        sys.exit(0)
 
     try:
         create_task(task_name, script, run_time)
@@ -108,3 +110,7 @@ if __name__ == "__main__":
         # 若建立失敗，也要留下紀錄
         log(f"[ERROR] Failed to create task: {e}")
         print("[ERROR] Failed to create scheduled task")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Snapshot Diff
+==================================================
+
+- 比較同一資料夾的兩份掃描快照（見 scan_snapshot.py），列出其間新增、刪除、修改的檔案
+- 「刪除」與「新增」之間，先以 (裝置, inode)、其次以 (大小, mtime) 配對，
+  辨識搬移 / 改名，不再顯示成一刪一增
+- 兩份快照各自依相對路徑排序後合併比對（sorted merge-join），時間與檔案數成正比；
+  記憶體只與「有變動的檔案數」有關，與資料夾總檔案數無關
+
+注意事項：
+- 本工具為唯讀，只讀取快照，不碰觸資料夾
+- 大小或 mtime 不同即視為修改（不比對內容）
+- 任一份快照中逾時略過的資料夾，其下的檔案無法判斷，不列入新增 / 刪除
+- inode 會被重複使用（刪除舊檔後新建的檔案可能拿到同一個 inode），
+  因此 inode 相同時仍須大小與 mtime 不變；搬移後又修改的檔案列為一刪一增
+- 以 (大小, mtime) 配對時，只接受兩邊各恰好一筆的組合；空檔案不以此方式配對
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from . import common, report_renderer, walker
+from .scan_snapshot import Snapshot
+
+LOG_FILE = "snapshot_diff.log"
+
+MATCH_INODE = "inode"
+MATCH_SIZE_MTIME = "size+mtime"
+
+# 相對路徑的各層名稱
+Parts = Tuple[str, ...]
+
+
+class FileInfo(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+    dev: int
+    ino: int
+
+
+class Move(NamedTuple):
+    old: FileInfo
+    new: FileInfo
+    match: str
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def format_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def sorted_files(snapshot: Snapshot) -> Iterator[Tuple[Parts, FileInfo]]:
+    """
+    依相對路徑排序逐筆產出；第 1 版快照沒有 inode，dev / ino 為 0（未知）。
+    """
+    has_inode = snapshot.file_ino is not None
+    for parts, i in snapshot.files_by_path():
+        yield parts, FileInfo(
+            os.path.join(*parts),
+            snapshot.file_size[i],
+            snapshot.file_mtime[i],
+            snapshot.file_dev[i] if has_inode else 0,
+            snapshot.file_ino[i] if has_inode else 0,
+        )
+
+
+def skipped_parts(snapshot: Snapshot) -> Set[Parts]:
+    result: Set[Parts] = set()
+    for path, _ in snapshot.skipped(""):
+        rel_path = os.path.normpath(path)
+        result.add(() if rel_path == os.curdir else tuple(rel_path.split(os.sep)))
+    return result
+
+
+def under_skipped(parts: Parts, skipped: Set[Parts]) -> bool:
+    return any(parts[:n] in skipped for n in range(len(parts)))
+
+
+def merge_join(
+    old: Iterator[Tuple[Parts, FileInfo]],
+    new: Iterator[Tuple[Parts, FileInfo]],
+) -> Iterator[Tuple[str, Parts, Optional[FileInfo], Optional[FileInfo]]]:
+    """
+    兩個已排序串流的合併比對，線性時間。
+    產出 (kind, 路徑, 舊, 新)，kind 為 deleted / added / modified / unchanged。
+    """
+    sentinel = object()
+    a = next(old, sentinel)
+    b = next(new, sentinel)
+
+    while a is not sentinel or b is not sentinel:
+        if b is sentinel or (a is not sentinel and a[0] < b[0]):
+            yield "deleted", a[0], a[1], None
+            a = next(old, sentinel)
+        elif a is sentinel or b[0] < a[0]:
+            yield "added", b[0], None, b[1]
+            b = next(new, sentinel)
+        else:
+            before, after = a[1], b[1]
+            if before.size != after.size or before.mtime != after.mtime:
+                yield "modified", a[0], before, after
+            else:
+                yield "unchanged", a[0], before, after
+            a = next(old, sentinel)
+            b = next(new, sentinel)
+
+
+def match_moves(
+    deleted: List[FileInfo],
+    added: List[FileInfo],
+) -> Tuple[List[Move], List[FileInfo], List[FileInfo]]:
+    """
+    在刪除與新增之間配對搬移 / 改名，回傳 (搬移, 剩餘的刪除, 剩餘的新增)，皆維持路徑順序。
+    1. (裝置, inode, 大小, mtime) 相同：同一個檔案（改名、同一磁碟內搬移），
+       同名同大小的檔案很多時也能正確配對
+    2. (大小, mtime) 相同且兩邊各只有一筆：跨磁碟搬移或保留時間的複製後刪除
+    """
+    pairs: Dict[int, Tuple[int, str]] = {}
+
+    by_inode: Dict[Tuple[int, int, int, float], List[int]] = {}
+    for i in reversed(range(len(deleted))):
+        f = deleted[i]
+        if f.ino:
+            by_inode.setdefault((f.dev, f.ino, f.size, f.mtime), []).append(i)
+
+    for j, f in enumerate(added):
+        candidates = by_inode.get((f.dev, f.ino, f.size, f.mtime)) if f.ino else None
+        if candidates:
+            pairs[j] = (candidates.pop(), MATCH_INODE)
+
+    taken = {i for i, _ in pairs.values()}
+    old_keys: Dict[Tuple[int, float], List[int]] = {}
+    for i, f in enumerate(deleted):
+        if i not in taken and f.size:
+            old_keys.setdefault((f.size, f.mtime), []).append(i)
+    new_keys: Dict[Tuple[int, float], List[int]] = {}
+    for j, f in enumerate(added):
+        if j not in pairs and f.size:
+            new_keys.setdefault((f.size, f.mtime), []).append(j)
+
+    for key, new_indexes in new_keys.items():
+        old_indexes = old_keys.get(key)
+        if old_indexes and len(old_indexes) == 1 and len(new_indexes) == 1:
+            pairs[new_indexes[0]] = (old_indexes[0], MATCH_SIZE_MTIME)
+            taken.add(old_indexes[0])
+
+    moves = [Move(deleted[i], added[j], how) for j, (i, how) in sorted(pairs.items())]
+    remaining_deleted = [f for i, f in enumerate(deleted) if i not in taken]
+    remaining_added = [f for j, f in enumerate(added) if j not in pairs]
+    return moves, remaining_deleted, remaining_added
+
+
+def compare(old: Snapshot, new: Snapshot) -> dict:
+    """
+    合併比對兩份快照；只保留有變動的檔案，未變動的只計數。
+    """
+    skipped = skipped_parts(old) | skipped_parts(new)
+
+    deleted: List[FileInfo] = []
+    added: List[FileInfo] = []
+    modified: List[Tuple[FileInfo, FileInfo]] = []
+    unchanged = 0
+    unknown = 0
+
+    for kind, parts, before, after in merge_join(sorted_files(old), sorted_files(new)):
+        if kind == "unchanged":
+            unchanged += 1
+        elif kind == "modified":
+            modified.append((before, after))
+        elif skipped and under_skipped(parts, skipped):
+            unknown += 1
+        elif kind == "deleted":
+            deleted.append(before)
+        else:
+            added.append(after)
+
+    moves, deleted, added = match_moves(deleted, added)
+
+    return {
+        "added": added,
+        "deleted": deleted,
+        "modified": modified,
+        "moves": moves,
+        "unchanged": unchanged,
+        "unknown": unknown,
+    }
+
+
+def describe_modified(before: FileInfo, after: FileInfo) -> str:
+    notes = []
+    if before.size != after.size:
+        notes.append(f"size: {before.size} -> {after.size} bytes")
+    if before.mtime != after.mtime:
+        notes.append(f"last modified: {format_time(after.mtime)}")
+    return ", ".join(notes)
+
+
+def move_kind(move: Move) -> str:
+    same_folder = os.path.dirname(move.old.path) == os.path.dirname(move.new.path)
+    return "renamed" if same_folder else "moved"
+
+
+def print_report(old: Snapshot, new: Snapshot, result: dict, fmt: str = "text") -> None:
+    columns = ("path", "old_path", "size_bytes", "old_size_bytes", "last_modified", "match")
+
+    with report_renderer.open_renderer(fmt, "snapshot_diff", columns) as out:
+        out.text("=" * 40)
+        out.text("Snapshot Diff")
+        out.field(f"Folder   : {new.folder}", "folder", new.folder)
+        out.field(
+            f"Previous : {os.path.basename(old.path)} ({old.generated.strftime('%Y-%m-%d %H:%M:%S')})",
+            "previous", os.path.basename(old.path),
+        )
+        out.field(
+            f"Current  : {os.path.basename(new.path)} ({new.generated.strftime('%Y-%m-%d %H:%M:%S')})",
+            "current", os.path.basename(new.path),
+        )
+        out.text("=" * 40)
+        out.text()
+
+        out.text("[Summary]")
+        out.field(f"- Added files     : {len(result['added'])}", "added", len(result["added"]))
+        out.field(f"- Deleted files   : {len(result['deleted'])}", "deleted", len(result["deleted"]))
+        out.field(f"- Modified files  : {len(result['modified'])}", "modified", len(result["modified"]))
+        out.field(f"- Moved / renamed : {len(result['moves'])}", "moved", len(result["moves"]))
+        out.field(f"- Unchanged files : {result['unchanged']}", "unchanged", result["unchanged"])
+        if result["unknown"]:
+            out.field(f"- Not compared    : {result['unknown']}", "not_compared", result["unknown"])
+        out.text()
+
+        out.text("[Added Files]")
+        if result["added"]:
+            for f in result["added"]:
+                mdate = format_time(f.mtime)
+                out.record(f"- {f.path}", "added", path=f.path, size_bytes=f.size, last_modified=mdate)
+        else:
+            out.text("No added files.")
+        out.text()
+
+        out.text("[Deleted Files]")
+        if result["deleted"]:
+            for f in result["deleted"]:
+                mdate = format_time(f.mtime)
+                out.record(f"- {f.path}", "deleted", path=f.path, size_bytes=f.size, last_modified=mdate)
+        else:
+            out.text("No deleted files.")
+        out.text()
+
+        out.text("[Modified Files]")
+        if result["modified"]:
+            for before, after in result["modified"]:
+                out.record(
+                    f"- {after.path} ({describe_modified(before, after)})",
+                    "modified",
+                    path=after.path,
+                    size_bytes=after.size,
+                    old_size_bytes=before.size,
+                    last_modified=format_time(after.mtime),
+                )
+        else:
+            out.text("No modified files.")
+        out.text()
+
+        out.text("[Moved / Renamed]")
+        if result["moves"]:
+            for move in result["moves"]:
+                kind = move_kind(move)
+                out.record(
+                    f"- {move.old.path} -> {move.new.path} ({kind}, matched by {move.match})",
+                    kind,
+                    path=move.new.path,
+                    old_path=move.old.path,
+                    size_bytes=move.new.size,
+                    old_size_bytes=move.old.size,
+                    last_modified=format_time(move.new.mtime),
+                    match=move.match,
+                )
+        else:
+            out.text("No moved or renamed files.")
+        out.text()
+
+        skipped = old.skipped(new.folder)
+        skipped += [item for item in new.skipped(new.folder) if item not in skipped]
+        walker.print_skipped(out, new.folder, skipped)
+
+        out.text("[Note]")
+        out.text("- Modified means size or last modified time changed; contents are not compared.")
+        out.text("- Files under skipped folders are not compared.")
+        out.text("- This report is read-only.")
+        out.text()
+
+    log(
+        f"Folder={new.folder}, Previous={old.path}, Current={new.path}, "
+        f"Added={len(result['added'])}, Deleted={len(result['deleted'])}, "
+        f"Modified={len(result['modified'])}, Moved={len(result['moves'])}, "
+        f"Unchanged={result['unchanged']}, NotCompared={result['unknown']}"
+    )
+
+
+def open_snapshot(path: str) -> Snapshot:
+    if not os.path.isfile(path):
+        print(f"[ERROR] Snapshot file not found: {path}")
+        sys.exit(1)
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage="office-ms compare <previous_snapshot> <current_snapshot> [--format text|jsonl|csv]"
+    )
+    parser.add_argument("previous")
+    parser.add_argument("current")
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    args = parser.parse_args()
+
+    with open_snapshot(args.previous) as old, open_snapshot(args.current) as new:
+        if os.path.normcase(old.folder) != os.path.normcase(new.folder):
+            print(f"[ERROR] Snapshots are of different folders: {old.folder} / {new.folder}")
+            sys.exit(1)
+
+        result = compare(old, new)
+        print_report(old, new, result, args.format)
+
+
+if __name__ == "__main__":
+    main()
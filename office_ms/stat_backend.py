@@ -0,0 +1,215 @@
+"""
+==================================================
+Stat Backend
+==================================================
+
+- 掃描工具取得檔案屬性（大小、修改時間、建立時間）的共用介面，由 walker 呼叫
+- Linux：以 ctypes 呼叫 statx，只要求報告用得到的欄位，並取得真正的建立時間（btime）；
+  位於網路磁碟（NFS / CIFS / SMB）的資料夾加上 AT_STATX_DONT_SYNC，
+  直接使用核心快取的屬性，不再逐檔向伺服器確認
+- 其他平台，或系統不支援 statx 時：使用 os.stat
+
+建立時間（各報告的 "New files" 依據，結果中的 st_ctime 欄位）：
+- Windows：os.stat 的 st_ctime（Python 3.12 起為 st_birthtime）
+- macOS：st_birthtime
+- Linux：statx 的 btime；檔案系統不提供時（例如部分 NFS）退回 inode 變更時間，與過去相同
+
+注意事項：
+- AT_STATX_DONT_SYNC 時，屬性可能是數十秒前的快取（依掛載參數 actimeo），對日 / 週 / 月報的影響可忽略
+- 可用 --stat-backend os 改回 os.stat，比對結果或排除問題
+"""
+
+import os
+import sys
+import struct
+from typing import Dict, List, NamedTuple, Tuple
+
+BACKEND_NAMES = ("auto", "statx", "os")
+
+# 使用 AT_STATX_DONT_SYNC 的檔案系統（/proc/self/mountinfo 中的類型）
+NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smb3", "smbfs"}
+
+# <linux/stat.h> / <fcntl.h>
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x0001
+STATX_MTIME = 0x0040
+STATX_CTIME = 0x0080
+STATX_INO = 0x0100
+STATX_SIZE = 0x0200
+STATX_BTIME = 0x0800
+
+# 大小、修改時間、建立時間；ctime 僅在沒有 btime 時使用，ino 供快照與重複檔案判斷
+STATX_MASK = STATX_TYPE | STATX_SIZE | STATX_MTIME | STATX_BTIME | STATX_CTIME | STATX_INO
+
+
+class FileStat(NamedTuple):
+    st_size: int
+    st_mtime: float
+    st_ctime: float        # 建立時間（見模組說明）
+    st_mtime_ns: int
+    st_dev: int
+    st_ino: int
+
+
+def from_stat_result(st: os.stat_result) -> FileStat:
+    created = getattr(st, "st_birthtime", None)
+    return FileStat(
+        st.st_size,
+        st.st_mtime,
+        st.st_ctime if created is None else created,
+        st.st_mtime_ns,
+        st.st_dev,
+        st.st_ino,
+    )
+
+
+class OsStat:
+    name = "os"
+
+    def stat(self, path: str) -> FileStat:
+        return from_stat_result(os.stat(path))
+
+    def stat_entry(self, entry: os.DirEntry) -> FileStat:
+        # Windows 上 scandir 已取得屬性，不需再次系統呼叫
+        return from_stat_result(entry.stat())
+
+
+def read_mounts() -> List[Tuple[str, str]]:
+    """
+    (掛載點, 檔案系統類型)，掛載點較長（較深）者在前。
+    """
+    mounts = []
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields = line.split()
+                try:
+                    sep = fields.index("-")
+                except ValueError:
+                    continue
+                mount_point = fields[4].replace("\\040", " ").replace("\\011", "\t")
+                mounts.append((mount_point, fields[sep + 1]))
+    except OSError:
+        return []
+    mounts.sort(key=lambda m: len(m[0]), reverse=True)
+    return mounts
+
+
+# struct statx（<linux/stat.h>，共 256 bytes）中用得到的欄位：
+# stx_mask, stx_ino, stx_size, stx_btime, stx_ctime, stx_mtime（秒, 奈秒）, stx_dev_major, stx_dev_minor
+STATX_LAYOUT = struct.Struct("=I28xQQ32xqI4xqI4xqI4x8xII")
+STATX_SIZEOF = 256
+
+
+class StatxStat:
+    """
+    以 ctypes 呼叫 glibc 的 statx（glibc 2.28 / Linux 4.11 起）。
+    系統不支援時，建立時拋出 OSError。
+    """
+
+    name = "statx"
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("statx is only available on Linux")
+
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            self._statx = libc.statx
+        except AttributeError:
+            raise OSError("statx is not available in this C library")
+        self._statx.restype = ctypes.c_int
+        self._ctypes = ctypes
+        self._new_buffer = ctypes.create_string_buffer
+        self._mounts = read_mounts()
+        self._dir_flags: Dict[str, int] = {}
+
+        # 核心太舊（ENOSYS）或被 seccomp 擋下時，在這裡就失敗，改用 os.stat
+        self.stat(os.curdir)
+
+    def _flags(self, path: str) -> int:
+        folder = path.rpartition("/")[0]
+        flags = self._dir_flags.get(folder)
+        if flags is None:
+            flags = 0
+            absolute = os.path.abspath(folder)
+            for mount_point, fs_type in self._mounts:
+                if absolute == mount_point or absolute.startswith(mount_point.rstrip("/") + "/"):
+                    if fs_type in NETWORK_FS_TYPES:
+                        flags = AT_STATX_DONT_SYNC
+                    break
+            self._dir_flags[folder] = flags
+        return flags
+
+    def stat(self, path: str) -> FileStat:
+        # 每次呼叫各自配置緩衝區：卡住而被放棄的走訪執行緒可能仍在使用舊的
+        buf = self._new_buffer(STATX_SIZEOF)
+        if self._statx(AT_FDCWD, os.fsencode(path), self._flags(path), STATX_MASK, buf) != 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+
+        (mask, ino, size, b_sec, b_nsec, c_sec, c_nsec,
+         m_sec, m_nsec, dev_major, dev_minor) = STATX_LAYOUT.unpack_from(buf)
+        if mask & STATX_BTIME:
+            created = b_sec + b_nsec / 1e9
+        else:
+            created = c_sec + c_nsec / 1e9
+        return FileStat(
+            size,
+            m_sec + m_nsec / 1e9,
+            created,
+            m_sec * 1_000_000_000 + m_nsec,
+            os.makedev(dev_major, dev_minor),
+            ino,
+        )
+
+    def stat_entry(self, entry: os.DirEntry) -> FileStat:
+        return self.stat(entry.path)
+
+
+_backend = None
+
+
+def create(name: str):
+    """
+    auto：Linux 且支援 statx 時使用 statx，否則 os.stat。
+    """
+    if name == "os":
+        return OsStat()
+    if name == "statx":
+        return StatxStat()
+    try:
+        return StatxStat()
+    except OSError:
+        return OsStat()
+
+
+def use(name: str):
+    global _backend
+    _backend = create(name)
+    return _backend
+
+
+def current():
+    global _backend
+    if _backend is None:
+        _backend = create("auto")
+    return _backend
+
+
+def add_stat_arguments(parser) -> None:
+    parser.add_argument(
+        "--stat-backend", choices=BACKEND_NAMES, default="auto",
+        help="how file attributes are read (default: statx on Linux when available, else os.stat)",
+    )
+
+
+def backend_from_args(args):
+    try:
+        return use(args.stat_backend)
+    except OSError as e:
+        print(f"[ERROR] --stat-backend {args.stat_backend}: {e}")
+        sys.exit(1)
@@ -0,0 +1,339 @@
+"""
+==================================================
+Walker
+==================================================
+
+- 各掃描工具共用的資料夾走訪，取代直接呼叫 os.walk / os.stat
+- 每個資料夾的列目錄與 stat 交給背景執行緒，在時間預算內完成
+- 網路磁碟（SMB / NFS）卡住時，該子樹略過並記錄原因，掃描繼續處理其他部分，
+  報告中以 [Skipped / Timed out] 區段列出
+
+時間預算：
+- 單一資料夾：列目錄加上該資料夾內所有檔案的 stat（預設 30 秒）
+- 整次掃描：超過後，尚未處理的子樹全部略過（預設不限制）
+
+注意事項：
+- 卡住的系統呼叫無法中斷；該執行緒會被放棄（daemon），改用新的執行緒繼續
+- 權限不足等一般錯誤與 os.walk 相同，直接略過，不列入 [Skipped / Timed out]
+- 不跟隨資料夾捷徑（symlink），與 os.walk 預設相同
+- 檔案屬性由 stat_backend 取得（Linux 為 statx，其他平台為 os.stat）
+- 啟用 io_throttle 時，每次列目錄與 stat 先取得額度；等待額度的時間不計入單一資料夾的時間預算
+- 走訪進度（尚未走訪的資料夾）可取出並在之後傳回，供中斷後續跑（見 checkpoint.py）
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from . import io_throttle, stat_backend
+from .stat_backend import FileStat
+
+DIR_TIMEOUT_SECONDS = 30.0
+TOTAL_TIMEOUT_SECONDS: Optional[float] = None
+
+# (name, stat)；不需要 stat 或 stat 失敗時為 None
+FileEntry = Tuple[str, Optional[FileStat]]
+
+# (path, reason)
+SkippedDir = Tuple[str, str]
+
+# 走訪進度（可 JSON 序列化）：
+# - 由上而下：尚未走訪的資料夾路徑
+# - 由下而上：[資料夾路徑, 已往下走訪的子資料夾數]，由根目錄往下排列
+Frontier = list
+
+
+class Stalled(Exception):
+    pass
+
+
+class _Job:
+    def __init__(self, fn: Callable, args: tuple) -> None:
+        self.fn = fn
+        self.args = args
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self.result = self.fn(*self.args)
+        except BaseException as e:
+            self.error = e
+        self.done.set()
+
+
+class _Worker(threading.Thread):
+    def __init__(self) -> None:
+        super().__init__(name="walker", daemon=True)
+        self.jobs: "queue.SimpleQueue[_Job]" = queue.SimpleQueue()
+        self.start()
+
+    def run(self) -> None:
+        while True:
+            self.jobs.get().run()
+
+
+class Watchdog:
+    """
+    在時間預算內執行檔案系統呼叫；逾時即拋出 Stalled，並記錄於 skipped。
+    """
+
+    def __init__(
+        self,
+        dir_timeout: float = DIR_TIMEOUT_SECONDS,
+        total_timeout: Optional[float] = TOTAL_TIMEOUT_SECONDS,
+    ) -> None:
+        self.dir_timeout = dir_timeout
+        self.total_timeout = total_timeout
+        self.deadline = time.monotonic() + total_timeout if total_timeout else None
+        self.skipped: List[SkippedDir] = []
+        self._worker: Optional[_Worker] = None
+
+    def run(self, fn: Callable, *args):
+        timeout = self.dir_timeout
+        reason = f"no response after {self.dir_timeout:g}s"
+
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                raise Stalled(f"total time budget ({self.total_timeout:g}s) exhausted")
+            if remaining < timeout:
+                timeout = remaining
+                reason = f"total time budget ({self.total_timeout:g}s) exhausted"
+
+        if self._worker is None:
+            self._worker = _Worker()
+
+        worker = self._worker
+        throttle = io_throttle.current()
+        waited = throttle.waited(worker.ident) if throttle is not None else 0.0
+
+        job = _Job(fn, args)
+        worker.jobs.put(job)
+
+        while not job.done.wait(timeout):
+            # 期間等待節流額度的時間不算逾時，順延；整次掃描的預算照實計算
+            extension = 0.0
+            if throttle is not None:
+                total = throttle.waited(worker.ident)
+                extension, waited = total - waited, total
+            if extension > 0 and self.deadline is not None:
+                remaining = self.deadline - time.monotonic()
+                if remaining < extension:
+                    extension = remaining
+                    reason = f"total time budget ({self.total_timeout:g}s) exhausted"
+            if extension <= 0:
+                # 執行緒仍卡在系統呼叫中，放棄它，下次改用新的執行緒
+                self._worker = None
+                raise Stalled(reason)
+            timeout = extension
+
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def skip(self, path: str, reason: str) -> None:
+        self.skipped.append((path, reason))
+
+
+def list_dir(
+    path: str,
+    want_stat: Optional[Callable[[str], bool]] = None,
+) -> Tuple[List[str], List[str], List[FileEntry]]:
+    """
+    列出 path 的內容：(子資料夾名稱, 可往下走訪的子資料夾, 檔案與其 stat)。
+    want_stat 回傳 False 的檔案不做 stat（stat 欄位為 None）。
+    分類方式與 os.walk 相同：指向資料夾的捷徑列在子資料夾中，但不往下走訪。
+    """
+    dirs: List[str] = []
+    descend: List[str] = []
+    files: List[FileEntry] = []
+    backend = stat_backend.current()
+    throttle = io_throttle.current()
+
+    if throttle is not None:
+        throttle.op()
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                dirs.append(entry.name)
+                try:
+                    if not entry.is_symlink():
+                        descend.append(entry.name)
+                except OSError:
+                    pass
+                continue
+
+            stat = None
+            if want_stat is None or want_stat(entry.name):
+                if throttle is not None:
+                    throttle.op()
+                try:
+                    stat = backend.stat_entry(entry)
+                except OSError:
+                    pass
+            files.append((entry.name, stat))
+
+    return dirs, descend, files
+
+
+def stat_paths(
+    paths: Sequence[str],
+    want_stat: Optional[Callable[[str], bool]] = None,
+) -> List[Optional[FileStat]]:
+    result: List[Optional[FileStat]] = []
+    backend = stat_backend.current()
+    throttle = io_throttle.current()
+    for path in paths:
+        if want_stat is not None and not want_stat(path):
+            result.append(None)
+            continue
+        if throttle is not None:
+            throttle.op()
+        try:
+            result.append(backend.stat(path))
+        except OSError:
+            result.append(None)
+    return result
+
+
+def _list(
+    watchdog: Watchdog,
+    path: str,
+    want_stat: Optional[Callable[[str], bool]],
+) -> Optional[Tuple[List[str], List[str], List[FileEntry]]]:
+    try:
+        return watchdog.run(list_dir, path, want_stat)
+    except Stalled as e:
+        watchdog.skip(path, str(e))
+    except OSError:
+        pass
+    return None
+
+
+def walk(
+    base_dir: str,
+    watchdog: Watchdog,
+    topdown: bool = True,
+    want_stat: Optional[Callable[[str], bool]] = None,
+    frontier: Optional[Frontier] = None,
+    on_checkpoint: Optional[Callable[[Frontier], None]] = None,
+) -> Iterator[Tuple[str, List[str], List[FileEntry]]]:
+    """
+    與 os.walk 相同的走訪順序，逐一產出 (root, 子資料夾名稱, [(檔名, stat), ...])。
+    逾時的資料夾不產出，記錄於 watchdog.skipped。
+
+    on_checkpoint 在每個產出的資料夾處理完畢（呼叫端要求下一個）時呼叫，
+    傳入當下的走訪進度；之後以 frontier 傳回，即從該處繼續走訪。
+    """
+    if topdown:
+        stack = list(frontier) if frontier is not None else [base_dir]
+        while stack:
+            root = stack.pop()
+            listing = _list(watchdog, root, want_stat)
+            if listing is None:
+                continue
+            dirs, descend, files = listing
+            stack.extend(os.path.join(root, name) for name in reversed(descend))
+            yield root, dirs, files
+            if on_checkpoint is not None:
+                on_checkpoint(list(stack))
+        return
+
+    # 由下而上：子資料夾全部產出後才產出父資料夾
+    # 續跑時各層資料夾重新列目錄，依已走訪的子資料夾數接續
+    if frontier is not None:
+        frames: List[list] = [[root, None, index] for root, index in frontier]
+    else:
+        frames = [[base_dir, None, 0]]
+    while frames:
+        frame = frames[-1]
+        root, listing, index = frame
+
+        if listing is None:
+            listing = _list(watchdog, root, want_stat)
+            if listing is None:
+                frames.pop()
+                continue
+            frame[1] = listing
+
+        descend = listing[1]
+        if index < len(descend):
+            frame[2] = index + 1
+            frames.append([os.path.join(root, descend[index]), None, 0])
+            continue
+
+        frames.pop()
+        yield root, listing[0], listing[2]
+        if on_checkpoint is not None:
+            on_checkpoint([[f[0], f[2]] for f in frames])
+
+
+def stat_many(
+    paths: Sequence[str],
+    watchdog: Watchdog,
+    want_stat: Optional[Callable[[str], bool]] = None,
+) -> Iterator[Tuple[str, Optional[FileStat]]]:
+    """
+    對一批已知路徑（例如變更日誌的候選清單）做 stat，依所在資料夾分批交給 watchdog。
+    逾時的資料夾略過，其中的檔案不產出。
+    """
+    start = 0
+    while start < len(paths):
+        folder = os.path.dirname(paths[start])
+        end = start + 1
+        while end < len(paths) and os.path.dirname(paths[end]) == folder:
+            end += 1
+
+        batch = paths[start:end]
+        try:
+            stats = watchdog.run(stat_paths, batch, want_stat)
+        except Stalled as e:
+            watchdog.skip(folder, str(e))
+        else:
+            yield from zip(batch, stats)
+        start = end
+
+
+def print_skipped(out, base_dir: str, skipped: Sequence[SkippedDir]) -> None:
+    """
+    報告共用的 [Skipped / Timed out] 區段；沒有略過任何資料夾時不輸出。
+    """
+    if not skipped:
+        return
+
+    out.text("[Skipped / Timed out]")
+    for path, reason in skipped:
+        rel_path = os.path.relpath(path, base_dir)
+        out.record(f"- {rel_path} ({reason})", "skipped", path=rel_path, reason=reason)
+    out.text()
+
+
+def add_timeout_arguments(parser) -> None:
+    parser.add_argument(
+        "--dir-timeout", type=float, default=DIR_TIMEOUT_SECONDS,
+        help=f"seconds allowed per folder before it is skipped (default {DIR_TIMEOUT_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--total-timeout", type=float, default=TOTAL_TIMEOUT_SECONDS,
+        help="seconds allowed for the whole scan; remaining folders are skipped (default: no limit)",
+    )
+
+
+def watchdog_from_args(args) -> Watchdog:
+    if args.dir_timeout <= 0:
+        print("[ERROR] --dir-timeout must be greater than 0.")
+        sys.exit(1)
+    if args.total_timeout is not None and args.total_timeout <= 0:
+        print("[ERROR] --total-timeout must be greater than 0.")
+        sys.exit(1)
+    return Watchdog(args.dir_timeout, args.total_timeout)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+==================================================
+Weekly Activity Report
+==================================================
+
+- 掃描最近 7 天的檔案活動
+- 列出每日新增 / 修改的檔案
+- 輸出為一般上班族可閱讀的文字報告
+- 可由每日快照保存的當日活動合併產生（--compose），只補掃缺少的日子（見 activity_partial.py）
+
+注意事項：
+- 本工具為唯讀，不會修改或刪除任何檔案
+- 請自行確保重要資料已有備份
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, date, time, timedelta
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+from . import activity_partial, common, io_throttle, report_renderer, scan_snapshot, stat_backend, walker
+
+LOG_FILE = "weekly_activity_report.log"
+
+DAYS = 7  # 固定 7 天，刻意不做成參數，避免複雜化
+
+
+def log(msg: str) -> None:
+    common.append_log(LOG_FILE, msg)
+
+
+def scan_weekly_activity(
+    base_dir: str,
+    journal: Optional[str] = None,
+    watchdog: Optional[walker.Watchdog] = None,
+    snapshot: Optional[scan_snapshot.Snapshot] = None,
+    save_snapshot: Optional[scan_snapshot.SnapshotWriter] = None,
+    today: Optional[date] = None,
+) -> Dict[date, Dict[str, List[str]]]:
+    today = today or date.today()
+    start_day = today - timedelta(days=DAYS - 1)
+    since = datetime.combine(start_day, time.min)
+
+    activity: Dict[date, Dict[str, List[str]]] = defaultdict(
+        lambda: {"new": [], "modified": []}
+    )
+
+    allowed_ext, ignored_ext, ignored_names = common.load_config(log)
+
+    scanned = 0
+    ignored = 0
+
+    def relevant(name: str) -> bool:
+        return common.is_relevant_file(name, allowed_ext, ignored_ext, ignored_names)
+
+    for path, stat in common.iter_files(
+        base_dir, log, journal, since, watchdog, relevant,
+        snapshot=snapshot, save_snapshot=save_snapshot,
+    ):
+        scanned += 1
+
+        if not relevant(path):
+            ignored += 1
+            continue
+
+        if stat is None:
+            continue
+
+        created = datetime.fromtimestamp(stat.st_ctime).date()
+        modified = datetime.fromtimestamp(stat.st_mtime).date()
+
+        rel_path = os.path.relpath(path, base_dir)
+
+        if start_day <= created <= today:
+            activity[created]["new"].append(rel_path)
+        elif start_day <= modified <= today:
+            activity[modified]["modified"].append(rel_path)
+
+    log(
+        f"Scanned={scanned}, Ignored={ignored}, "
+        f"Days={DAYS}"
+    )
+
+    return activity
+
+
+def print_report(
+    base_dir: str,
+    activity: Dict[date, Dict[str, List[str]]],
+    fmt: str = "text",
+    skipped: Sequence[walker.SkippedDir] = (),
+    throttle: Optional[io_throttle.Throttle] = None,
+    composed: Optional[activity_partial.Composed] = None,
+    today: Optional[date] = None,
+) -> None:
+    today = today or date.today()
+    start_day = today - timedelta(days=DAYS - 1)
+
+    with report_renderer.open_renderer(fmt, "weekly_activity", ("date", "path")) as out:
+        out.text("=" * 40)
+        out.text("Weekly Activity Report")
+        out.field(f"Period : {start_day} ~ {today}", "period", f"{start_day}~{today}")
+        out.field(f"Folder : {base_dir}", "folder", base_dir)
+        out.text("=" * 40)
+        out.text()
+
+        total_new = sum(len(v["new"]) for v in activity.values())
+        total_modified = sum(len(v["modified"]) for v in activity.values())
+        total = total_new + total_modified
+
+        out.text("[Summary]")
+        out.field(f"- Days scanned        : {DAYS}", "days_scanned", DAYS)
+        out.field(f"- New files created   : {total_new}", "new_files", total_new)
+        out.field(f"- Files modified      : {total_modified}", "modified_files", total_modified)
+        out.field(f"- Total activity      : {total} files", "total_activity", total)
+        out.text()
+
+        out.text("[Daily Breakdown]")
+        out.text()
+
+        for day in sorted(activity.keys()):
+            day_data = activity[day]
+            if not day_data["new"] and not day_data["modified"]:
+                continue
+
+            out.text(f"{day}")
+            if day_data["new"]:
+                out.text("- New:")
+                for f in sorted(day_data["new"]):
+                    out.record(f"  - {f}", "new", date=day, path=f)
+            if day_data["modified"]:
+                out.text("- Modified:")
+                for f in sorted(day_data["modified"]):
+                    out.record(f"  - {f}", "modified", date=day, path=f)
+            out.text()
+
+        activity_partial.print_sources(out, composed)
+        io_throttle.print_throttling(out, throttle)
+        walker.print_skipped(out, base_dir, skipped)
+
+        out.text("[Note]")
+        out.text("- Temporary and system files are ignored.")
+        out.text("- Only common office document formats are listed.")
+        out.text("- This report is read-only.")
+        out.text()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        usage=(
+            "office-ms weekly <folder_path> "
+            "[--journal <change_journal_file>] "
+            "[--dir-timeout <seconds>] [--total-timeout <seconds>] "
+            "[--stat-backend auto|statx|os] "
+            "[--max-ops <per_second>] [--low-priority] "
+            "[--save-snapshot <file> | --from-snapshot <file> | --compose <report_name>] "
+            "[--format text|jsonl|csv]"
+        )
+    )
+    parser.add_argument("folder_path")
+    parser.add_argument("--journal", help="build the report from a change journal")
+    parser.add_argument(
+        "--compose",
+        help="merge the daily partials archived under this report name; scan only days without one",
+    )
+    parser.add_argument("--format", choices=report_renderer.FORMATS, default="text")
+    walker.add_timeout_arguments(parser)
+    stat_backend.add_stat_arguments(parser)
+    io_throttle.add_throttle_arguments(parser)
+    scan_snapshot.add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    base_dir = args.folder_path
+    compose_name = activity_partial.report_name_from_args(args.compose)
+
+    if compose_name and (args.journal or args.save_snapshot or args.from_snapshot):
+        print("[ERROR] --compose cannot be combined with --journal, --save-snapshot or --from-snapshot.")
+        sys.exit(1)
+
+    if args.journal and (args.save_snapshot or args.from_snapshot):
+        print("[ERROR] --journal cannot be combined with --save-snapshot or --from-snapshot.")
+        sys.exit(1)
+
+    if not args.from_snapshot and not os.path.isdir(base_dir):
+        print("[ERROR] Folder not found.")
+        sys.exit(1)
+
+    watchdog = walker.watchdog_from_args(args)
+    stat_backend.backend_from_args(args)
+    throttle = io_throttle.throttle_from_args(args)
+    snapshot = scan_snapshot.snapshot_from_args(args, log, base_dir)
+    # 由快照產生時，「最近 7 天」以快照建立的日期為準
+    today = snapshot.generated.date() if snapshot is not None else date.today()
+
+    composed = None
+    if compose_name:
+        days = [today - timedelta(days=offset) for offset in range(DAYS - 1, -1, -1)]
+        activity, composed = activity_partial.compose_activity(compose_name, base_dir, days, watchdog)
+    else:
+        activity = scan_weekly_activity(
+            base_dir, args.journal, watchdog,
+            snapshot, scan_snapshot.writer_from_args(args, base_dir), today,
+        )
+    print_report(base_dir, activity, args.format, watchdog.skipped, throttle, composed, today)
+
+
+if __name__ == "__main__":
+    main()